@@ -1,9 +1,21 @@
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
+import math
+from contextlib import contextmanager
 from datetime import datetime
 import streamlit as st
+import nucleo_calculo as nucleo
+import inversao_impostos
+from grafo_calculo import criar_grafo_dashboard
+from cache_resultados import cache_dashboard, cache_secoes
+from cenario import Cenario
+from tabelas_impostos import registro_tabelas, TabelaInvalidaError
+from instrumentacao import instrumentacao
+from armazem_cenarios import armazem_padrao
+
+import graficos
+import relatorios
+
+# pandas, numpy e matplotlib são importados sob demanda: só as abas de
+# gráficos e o cálculo em lote precisam deles, e eles dominam o cold start.
 
 class CalculadoraPropostaCompleta:
     def __init__(self):
@@ -15,20 +27,11 @@ class CalculadoraPropostaCompleta:
         if 'beneficios_detalhados' not in st.session_state:
             st.session_state.beneficios_detalhados = {}
         if 'valores_pessoais' not in st.session_state:  # NOVO: Valores pessoais
-            st.session_state.valores_pessoais = {
-                'estabilidade_financeira': 5,
-                'flexibilidade_tempo': 5,
-                'crescimento_carreira': 5,
-                'equilibrio_vida_pessoal': 5,
-                'impacto_social': 3,
-                'inovacao_tecnologia': 5,
-                'cultura_empresa': 5,
-                'aprendizado_continuo': 5,
-                'reconhecimento': 5,
-                'autonomia': 5,
-                'seguranca_juridica': 5,
-                'beneficios_nao_monetarios': 5
-            }
+            st.session_state.valores_pessoais = dict(nucleo.VALORES_PESSOAIS_PADRAO)
+        if 'grafo_calculo' not in st.session_state:  # Resultados derivados reaproveitados entre reruns
+            st.session_state.grafo_calculo = criar_grafo_dashboard()
+        if 'ofertas' not in st.session_state:  # Ofertas cadastradas para comparação lado a lado
+            st.session_state.ofertas = []
         
     @property
     def fatores(self):
@@ -54,9 +57,86 @@ class CalculadoraPropostaCompleta:
     def valores_pessoais(self, value):
         st.session_state.valores_pessoais = value
     
+    @property
+    def ofertas(self):
+        return st.session_state.ofertas
+    
+    @ofertas.setter
+    def ofertas(self, value):
+        st.session_state.ofertas = value
+    
+    def coletar_ofertas(self):
+        """Coleta as ofertas recebidas numa tabela editável (uma linha por oferta)"""
+        from comparacao_ofertas import OFERTA_PADRAO, linhas_editor, ofertas_de_linhas
+        st.header("📋 Minhas Ofertas")
+        st.write("Cadastre cada oferta com suas condições. A situação atual e os valores pessoais são os das outras abas.")
+        
+        # Custo de vida é editado em % e guardado como fração, como no restante do app.
+        # A entrada do editor é montada uma vez só: com num_rows="dynamic" o ID do widget
+        # depende dos dados, e devolver a saída como entrada recriaria o editor (perdendo
+        # a edição pendente) a cada rerun. As edições vêm só do valor retornado.
+        linhas = st.session_state.setdefault(
+            'ofertas_linhas', linhas_editor(self.ofertas) or [dict(OFERTA_PADRAO, nome='Oferta 1')]
+        )
+        
+        editadas = st.data_editor(
+            linhas,
+            num_rows="dynamic",
+            use_container_width=True,
+            column_order=list(OFERTA_PADRAO),
+            column_config={
+                'nome': st.column_config.TextColumn("Oferta", required=True),
+                'modalidade': st.column_config.SelectboxColumn("Modalidade", options=["CLT", "PJ"], required=True),
+                'valor_proposto': st.column_config.NumberColumn("Valor proposto (R$)", min_value=0.0, step=500.0, format="%.2f"),
+                'dias_presencial_novo': st.column_config.NumberColumn("Dias presenciais", min_value=0, max_value=5, step=1),
+                'tempo_viagem_novo': st.column_config.NumberColumn("Deslocamento (h)", min_value=0.0, max_value=4.0, step=0.5),
+                'custo_vida_nova': st.column_config.NumberColumn("Custo de vida (%)", min_value=-50.0, max_value=100.0, step=5.0),
+                'crescimento_carreira': st.column_config.NumberColumn("Crescimento", min_value=1, max_value=10, step=1),
+                'estabilidade': st.column_config.NumberColumn("Estabilidade", min_value=1, max_value=10, step=1),
+                'beneficios_qualidade': st.column_config.NumberColumn("Benefícios", min_value=1, max_value=10, step=1),
+                'cultura_empresa_nova': st.column_config.NumberColumn("Cultura", min_value=1, max_value=10, step=1),
+                'inovacao_tecnologia_nova': st.column_config.NumberColumn("Inovação", min_value=1, max_value=10, step=1)
+            },
+            key="ofertas_editor"
+        )
+        
+        self.ofertas = ofertas_de_linhas(editadas)
+    
+    def mostrar_comparacao_ofertas(self):
+        """Avalia todas as ofertas de uma vez e mostra o ranking"""
+        from comparacao_ofertas import avaliar_ofertas
+        if not self.ofertas:
+            st.info("Cadastre ao menos uma oferta na aba 📋 Minhas Ofertas.")
+            return
+        
+        ranking = avaliar_ofertas(self.fatores, self.valores_pessoais, self.ofertas)
+        st.subheader("🏁 Ranking das Ofertas")
+        st.dataframe(
+            [
+                {
+                    'Posição': posicao,
+                    'Oferta': resultado['nome'],
+                    'Modalidade': resultado['modalidade'],
+                    'Valor proposto': f"R$ {resultado['valor_proposto']:,.2f}",
+                    'Equivalente CLT': f"R$ {resultado['equivalente_clt']:,.2f}",
+                    'Líquido anual': f"R$ {resultado['liquido_anual']:,.2f}",
+                    'Mínimo': f"R$ {resultado['minimo']:,.2f}",
+                    'Ideal': f"R$ {resultado['ideal']:,.2f}",
+                    'Cobre o mínimo': "✅" if resultado['atende_minimo'] else "❌",
+                    'Compatibilidade': f"{resultado['compatibilidade']:.1f}%",
+                    'Pontuação': round(resultado['pontuacao'], 1)
+                }
+                for posicao, resultado in enumerate(ranking, start=1)
+            ],
+            use_container_width=True,
+            hide_index=True
+        )
+        self._exibir_grafico('ranking_ofertas', graficos.dados_ranking_ofertas(ranking))
+        st.caption("Pontuação: 60% cobertura do valor ideal (equivalente CLT) + 40% compatibilidade com seus valores.")
+    
     # NOVO: Método para coletar valores pessoais
     def coletar_valores_pessoais(self):
-        """Coleta os valores e prioridades pessoais do funcionário"""
+        """Coleta a importância (1-10) de cada valor pessoal do funcionário"""
         st.header("🎯 Seus Valores e Prioridades")
         st.markdown("""
         <div style='background-color: #f0f8ff; padding: 15px; border-radius: 10px; margin-bottom: 20px;'>
@@ -154,6 +234,8 @@ class CalculadoraPropostaCompleta:
                 key="beneficios_nao_monetarios_slider"
             )
         
+    def coletar_prioridades(self):
+        """Três prioridades distintas (fora do formulário: as opções de cada uma dependem das anteriores)"""
         # NOVO: Prioridades principais (escolher top 3)
         st.markdown("---")
         st.subheader("🏆 Suas 3 Prioridades Principais")
@@ -175,11 +257,16 @@ class CalculadoraPropostaCompleta:
         
         col_pri1, col_pri2, col_pri3 = st.columns(3)
         
+        def indice(opcoes, chave, padrao):
+            # A escolha salva (ex.: cenário reaberto) volta selecionada; sem ela, a posição padrão
+            escolhida = self.valores_pessoais.get(chave)
+            return opcoes.index(escolhida) if escolhida in opcoes else min(padrao, len(opcoes) - 1)
+        
         with col_pri1:
             self.valores_pessoais['prioridade_1'] = st.selectbox(
                 "1ª Prioridade",
                 opcoes_prioridades,
-                index=0,
+                index=indice(opcoes_prioridades, 'prioridade_1', 0),
                 key="prioridade_1_select"
             )
         
@@ -189,7 +276,7 @@ class CalculadoraPropostaCompleta:
             self.valores_pessoais['prioridade_2'] = st.selectbox(
                 "2ª Prioridade",
                 opcoes_restantes,
-                index=min(1, len(opcoes_restantes)-1),
+                index=indice(opcoes_restantes, 'prioridade_2', 1),
                 key="prioridade_2_select"
             )
         
@@ -201,11 +288,13 @@ class CalculadoraPropostaCompleta:
             self.valores_pessoais['prioridade_3'] = st.selectbox(
                 "3ª Prioridade",
                 opcoes_restantes,
-                index=min(2, len(opcoes_restantes)-1),
+                index=indice(opcoes_restantes, 'prioridade_3', 2),
                 key="prioridade_3_select"
             )
         
-        # NOVO: Visualizar perfil de valores
+    
+    # NOVO: Visualizar perfil de valores (fora do formulário: st.button não é permitido dentro de st.form)
+    def mostrar_botao_perfil_valores(self):
         st.markdown("---")
         if st.button("📊 Visualizar Meu Perfil de Valores", key="visualizar_perfil_btn"):
             self._mostrar_perfil_valores()
@@ -214,32 +303,17 @@ class CalculadoraPropostaCompleta:
     def _mostrar_perfil_valores(self):
         """Mostra visualização do perfil de valores"""
         st.subheader("📊 Seu Perfil de Valores")
+        import pandas as pd
         
         # Criar DataFrame para visualização
-        valores_df = pd.DataFrame({
-            'Valor': list(self.valores_pessoais.keys())[:12],  # Exclui prioridades
-            'Importância': list(self.valores_pessoais.values())[:12]
-        })
+        valores_df = pd.DataFrame(self.cenario().importancias(), columns=['Valor', 'Importância'])
         
         # Ordenar por importância
         valores_df = valores_df.sort_values('Importância', ascending=False)
         
-        # Gráfico de barras
-        fig, ax = plt.subplots(figsize=(12, 8))
-        bars = ax.barh(valores_df['Valor'], valores_df['Importância'], 
-                      color=plt.cm.viridis(valores_df['Importância']/10))
-        
-        ax.set_xlabel('Importância (1-10)')
-        ax.set_title('Seu Perfil de Valores Pessoais')
-        ax.set_xlim(0, 10)
-        
-        # Adicionar valores nas barras
-        for bar in bars:
-            width = bar.get_width()
-            ax.text(width + 0.1, bar.get_y() + bar.get_height()/2, 
-                   f'{width:.1f}', va='center')
-        
-        st.pyplot(fig)
+        # Gráfico de barras (renderizado só quando os valores mudam)
+        dados = graficos.dados_perfil_valores(zip(valores_df['Valor'], valores_df['Importância']))
+        self._exibir_grafico('perfil_valores', dados)
         
         # Análise do perfil
         st.markdown("#### 📝 Análise do Seu Perfil")
@@ -262,6 +336,13 @@ class CalculadoraPropostaCompleta:
         elif perfil_tipo == "Inovação":
             st.write("Você busca desafios e novidades. Startups e empresas de tecnologia podem ser ideais.")
     
+    def _exibir_grafico(self, nome, dados):
+        """Exibe um gráfico renderizado no navegador (Vega-Lite) ou como PNG em cache"""
+        if st.session_state.get('graficos_no_navegador', False):
+            st.vega_lite_chart(spec=graficos.especificacao_vega(nome, dados), use_container_width=True)
+        else:
+            st.image(graficos.obter_png(nome, dados))
+    
     # NOVO: Método auxiliar para traduzir nomes dos valores
     def _traduzir_valor(self, valor_key):
         traducoes = {
@@ -296,7 +377,7 @@ class CalculadoraPropostaCompleta:
         for categoria, chaves in categorias.items():
             # Filtrar valores que existem no DataFrame
             valores_categoria = valores_df[valores_df['Valor'].isin(chaves)]['Importância'].mean()
-            medias[categoria] = valores_categoria if not np.isnan(valores_categoria) else 0
+            medias[categoria] = valores_categoria if not math.isnan(valores_categoria) else 0
         
         return max(medias.items(), key=lambda x: x[1])[0]
     
@@ -340,16 +421,18 @@ class CalculadoraPropostaCompleta:
                 key="plano_saude_check"
             )
             
-            if self.beneficios_detalhados['plano_saude']:
-                self.beneficios_detalhados['coparticipacao'] = st.number_input(
+            # No modo formulário o campo não reage ao checkbox antes do envio: fica sempre visível
+            # e só entra no total com o plano marcado
+            if self.beneficios_detalhados['plano_saude'] or st.session_state.get('modo_formulario', False):
+                coparticipacao = st.number_input(
                     "Coparticipação mensal (R$)", 
                     min_value=0.0, 
                     value=float(self.beneficios_detalhados.get('coparticipacao', 200.0)), 
                     step=50.0,
-                    key="coparticipacao_input"
+                    key="coparticipacao_input",
+                    help="Considerada só com Plano de Saúde marcado"
                 )
-            else:
-                self.beneficios_detalhados['coparticipacao'] = 0
+            self.beneficios_detalhados['coparticipacao'] = coparticipacao if self.beneficios_detalhados['plano_saude'] else 0
             
             self.beneficios_detalhados['outros_beneficios'] = st.number_input(
                 "Outros benefícios (R$)", 
@@ -366,7 +449,6 @@ class CalculadoraPropostaCompleta:
                               self.beneficios_detalhados['outros_beneficios'])
             
             self.fatores['beneficios_atual'] = total_beneficios
-            st.info(f"**Total benefícios:** R$ {total_beneficios:,.2f}")
             
         with col2:
             self.fatores['bonus_atual'] = st.number_input(
@@ -400,7 +482,13 @@ class CalculadoraPropostaCompleta:
                 step=0.5,
                 key="tempo_viagem_atual_input"
             )
-            
+    
+    def mostrar_resumo_atual(self):
+        """Totais da situação atual (fora do formulário: refletem os valores aplicados)"""
+        col1, col2 = st.columns(2)
+        with col1:
+            st.info(f"**Total benefícios:** R$ {self.fatores['beneficios_atual']:,.2f}")
+        with col2:
             # Resumo da situação atual
             st.subheader("📋 Resumo Atual")
             salario_total = self.fatores['salario_atual'] + self.fatores['beneficios_atual']
@@ -496,136 +584,12 @@ class CalculadoraPropostaCompleta:
     # NOVO: Método para calcular compatibilidade com valores pessoais
     def calcular_compatibilidade_valores(self):
         """Calcula compatibilidade entre valores pessoais e nova oportunidade"""
-        compatibilidade = {
-            'estabilidade_financeira': min(
-                self.valores_pessoais['estabilidade_financeira'],
-                self.fatores.get('estabilidade', 5)
-            ) / 10 * 100,
-            'crescimento_carreira': min(
-                self.valores_pessoais['crescimento_carreira'],
-                self.fatores.get('crescimento_carreira', 5)
-            ) / 10 * 100,
-            'flexibilidade_tempo': self._calcular_compatibilidade_flexibilidade(),
-            'equilibrio_vida_pessoal': self._calcular_compatibilidade_equilibrio(),
-            'inovacao_tecnologia': min(
-                self.valores_pessoais['inovacao_tecnologia'],
-                self.fatores.get('inovacao_tecnologia_nova', 5)
-            ) / 10 * 100,
-            'cultura_empresa': min(
-                self.valores_pessoais['cultura_empresa'],
-                self.fatores.get('cultura_empresa_nova', 5)
-            ) / 10 * 100
-        }
-        
-        # Média ponderada pelas prioridades
-        pesos = {
-            'estabilidade_financeira': 1.5 if 'Estabilidade Financeira' in [
-                self.valores_pessoais.get('prioridade_1', ''),
-                self.valores_pessoais.get('prioridade_2', ''),
-                self.valores_pessoais.get('prioridade_3', '')
-            ] else 1.0,
-            'crescimento_carreira': 1.5 if 'Crescimento na Carreira' in [
-                self.valores_pessoais.get('prioridade_1', ''),
-                self.valores_pessoais.get('prioridade_2', ''),
-                self.valores_pessoais.get('prioridade_3', '')
-            ] else 1.0
-        }
-        
-        total_compatibilidade = 0
-        total_pesos = 0
-        
-        for chave, valor in compatibilidade.items():
-            peso = pesos.get(chave, 1.0)
-            total_compatibilidade += valor * peso
-            total_pesos += peso
-        
-        return {
-            'compatibilidade_geral': total_compatibilidade / total_pesos if total_pesos > 0 else 0,
-            'detalhado': compatibilidade
-        }
-    
-    # NOVO: Métodos auxiliares para cálculo de compatibilidade
-    def _calcular_compatibilidade_flexibilidade(self):
-        """Calcula compatibilidade para flexibilidade de tempo"""
-        dias_presencial = self.fatores.get('dias_presencial_novo', 3)
-        valor_pessoal = self.valores_pessoais['flexibilidade_tempo']
-        
-        # Quanto mais presencial, menor a compatibilidade para quem valoriza flexibilidade
-        if dias_presencial <= 1:
-            compatibilidade = 100
-        elif dias_presencial == 2:
-            compatibilidade = 80
-        elif dias_presencial == 3:
-            compatibilidade = 60
-        elif dias_presencial == 4:
-            compatibilidade = 40
-        else:
-            compatibilidade = 20
-        
-        # Ajustar pelo valor pessoal
-        return min(valor_pessoal * 10, compatibilidade)
-    
-    def _calcular_compatibilidade_equilibrio(self):
-        """Calcula compatibilidade para equilíbrio vida-trabalho"""
-        tempo_deslocamento = self.fatores.get('tempo_viagem_novo', 0.5)
-        valor_pessoal = self.valores_pessoais['equilibrio_vida_pessoal']
-        
-        if tempo_deslocamento <= 0.5:
-            compatibilidade = 100
-        elif tempo_deslocamento <= 1.0:
-            compatibilidade = 80
-        elif tempo_deslocamento <= 1.5:
-            compatibilidade = 60
-        elif tempo_deslocamento <= 2.0:
-            compatibilidade = 40
-        else:
-            compatibilidade = 20
-        
-        return min(valor_pessoal * 10, compatibilidade)
+        return nucleo.calcular_compatibilidade_valores(self.fatores, self.valores_pessoais)
     
     def calcular_impostos_clt(self, salario_bruto):
-        """Calcula impostos CLT conforme legislação 2024 - CORRIGIDO"""
+        """Calcula impostos CLT conforme a tabela vigente - CORRIGIDO"""
         try:
-            # INSS 2024 - Faixas atualizadas e cálculo correto
-            if salario_bruto <= 1412.00:
-                inss = salario_bruto * 0.075
-            elif salario_bruto <= 2666.68:
-                inss = 105.90 + ((salario_bruto - 1412.00) * 0.09)
-            elif salario_bruto <= 4000.03:
-                inss = 105.90 + 113.09 + ((salario_bruto - 2666.68) * 0.12)
-            elif salario_bruto <= 7786.02:
-                inss = 105.90 + 113.09 + 160.00 + ((salario_bruto - 4000.03) * 0.14)
-            else:
-                inss = 908.85  # Teto do INSS
-            
-            # IRRF 2024 - Cálculo correto
-            base_irrf = salario_bruto - inss
-            
-            # Tabela IRRF 2024
-            if base_irrf <= 2259.20:
-                irrf = 0
-            elif base_irrf <= 2826.65:
-                irrf = (base_irrf * 0.075) - 169.44
-            elif base_irrf <= 3751.05:
-                irrf = (base_irrf * 0.15) - 381.44
-            elif base_irrf <= 4664.68:
-                irrf = (base_irrf * 0.225) - 662.77
-            else:
-                irrf = (base_irrf * 0.275) - 896.00
-            
-            # Garantir que IRRF não seja negativo
-            irrf = max(0, irrf)
-            
-            salario_liquido = salario_bruto - inss - irrf
-            
-            return {
-                'salario_bruto': salario_bruto,
-                'inss': inss,
-                'irrf': irrf,
-                'salario_liquido': salario_liquido,
-                'descontos_totais': inss + irrf,
-                'aliquota_efetiva': ((inss + irrf) / salario_bruto) * 100 if salario_bruto > 0 else 0
-            }
+            return nucleo.calcular_impostos_clt(salario_bruto)
         except Exception as e:
             st.error(f"Erro cálculo CLT: {e}")
             return {
@@ -636,59 +600,24 @@ class CalculadoraPropostaCompleta:
                 'descontos_totais': 0,
                 'aliquota_efetiva': 0
             }
-    
+
+    def calcular_impostos_clt_lote(self, salarios_brutos):
+        """Calcula impostos CLT para um array de salários (mesmo resultado de calcular_impostos_clt)"""
+        from motor_vetorizado import calcular_impostos_clt_vetorizado
+        return calcular_impostos_clt_vetorizado(salarios_brutos)
+
+    def calcular_bruto_para_liquido_clt(self, liquido_desejado):
+        """Salário bruto CLT que resulta no líquido desejado"""
+        return inversao_impostos.calcular_bruto_para_liquido_clt(liquido_desejado)
+
+    def calcular_valor_pj_para_liquido(self, liquido_desejado):
+        """Valor PJ mensal que resulta na renda líquida desejada"""
+        return inversao_impostos.calcular_valor_pj_para_liquido(liquido_desejado)
+
     def calcular_impostos_pj(self, valor_pj_total):
         """Calcula impostos para PJ (Simples Nacional) - CORRIGIDO"""
         try:
-            # Para PJ, consideramos que 40% é pro-labore e 60% é lucro/empresa
-            pro_labore = valor_pj_total * 0.4
-            faturamento_empresa = valor_pj_total * 0.6
-            
-            # Impostos sobre pro-labore (como CLT)
-            impostos_pro_labore = self.calcular_impostos_clt(pro_labore)
-            
-            # Simples Nacional sobre faturamento da empresa
-            # Anexo III - Serviços (aproximação)
-            faturamento_anual = faturamento_empresa * 12
-            
-            if faturamento_anual <= 180000:
-                aliquota_simples = 0.06  # 6% para serviços
-            elif faturamento_anual <= 360000:
-                aliquota_simples = 0.112
-            elif faturamento_anual <= 720000:
-                aliquota_simples = 0.135
-            elif faturamento_anual <= 1800000:
-                aliquota_simples = 0.16
-            else:
-                aliquota_simples = 0.21
-            
-            imposto_simples = faturamento_empresa * aliquota_simples
-            
-            # Custo contábil mensal
-            custo_contabilidade = 200.0
-            
-            # Outros custos PJ
-            custo_administrativo = 100.0
-            
-            total_impostos_pj = (impostos_pro_labore['descontos_totais'] + 
-                               imposto_simples + 
-                               custo_contabilidade + 
-                               custo_administrativo)
-            
-            renda_liquida_pj = valor_pj_total - total_impostos_pj
-            
-            return {
-                'valor_total': valor_pj_total,
-                'pro_labore': pro_labore,
-                'faturamento_empresa': faturamento_empresa,
-                'imposto_pro_labore': impostos_pro_labore['descontos_totais'],
-                'imposto_simples': imposto_simples,
-                'custo_contabilidade': custo_contabilidade,
-                'custo_administrativo': custo_administrativo,
-                'total_impostos': total_impostos_pj,
-                'renda_liquida': renda_liquida_pj,
-                'aliquota_efetiva': (total_impostos_pj / valor_pj_total) * 100 if valor_pj_total > 0 else 0
-            }
+            return nucleo.calcular_impostos_pj(valor_pj_total)
         except Exception as e:
             st.error(f"Erro cálculo PJ: {e}")
             return {
@@ -707,24 +636,7 @@ class CalculadoraPropostaCompleta:
     def comparar_clt_pj(self, valor_clt_bruto, valor_pj_total):
         """Compara CLT vs PJ considerando todos os fatores - CORRIGIDO"""
         try:
-            # CLT
-            clt = self.calcular_impostos_clt(valor_clt_bruto)
-            
-            # Benefícios CLT (13º, férias, FGTS)
-            decimo_terceiro = valor_clt_bruto
-            ferias = valor_clt_bruto + (valor_clt_bruto / 3)  # Férias + 1/3
-            fgts_anual = valor_clt_bruto * 0.08 * 12
-            
-            clt['total_anual'] = (clt['salario_liquido'] * 13) + ferias + fgts_anual
-            clt['decimo_terceiro'] = decimo_terceiro
-            clt['ferias'] = ferias
-            clt['fgts_anual'] = fgts_anual
-            
-            # PJ
-            pj = self.calcular_impostos_pj(valor_pj_total)
-            pj['total_anual'] = pj['renda_liquida'] * 12
-            
-            return {'CLT': clt, 'PJ': pj}
+            return nucleo.comparar_clt_pj(valor_clt_bruto, valor_pj_total)
         except Exception as e:
             st.error(f"Erro comparação CLT/PJ: {e}")
             return {'CLT': {}, 'PJ': {}}
@@ -732,115 +644,35 @@ class CalculadoraPropostaCompleta:
     def calcular_valor_hora_atual(self):
         """Calcula o valor real por hora considerando tempo de deslocamento"""
         try:
-            salario_mensal = self.fatores.get('salario_atual', 0)
-            beneficios = self.fatores.get('beneficios_atual', 0)
-            tempo_viagem = self.fatores.get('tempo_viagem_atual', 0)
-            
-            # 44 horas semanais = 220 horas mensais (44 * 5)
-            horas_trabalho = 220
-            horas_deslocamento = tempo_viagem * 2 * 22  # Ida e volta, 22 dias úteis
-            
-            horas_totais = horas_trabalho + horas_deslocamento
-            
-            if horas_totais > 0:
-                return (salario_mensal + beneficios) / horas_totais
-            else:
-                return 0
+            return nucleo.calcular_valor_hora_atual(self.fatores)
         except:
             return 0
     
     def calcular_compensacao_minima(self):
         """Calcula a compensação mínima aceitável - CORRIGIDO"""
+        fatores = self.fatores
         try:
-            # Salário atual total MENSAL (não anual)
-            salario_atual = self.fatores.get('salario_atual', 0)
-            beneficios_atual = self.fatores.get('beneficios_atual', 0)
-            bonus_atual = self.fatores.get('bonus_atual', 0)
-            custo_vida = self.fatores.get('custo_vida_nova', 0)
-            tempo_viagem_atual = self.fatores.get('tempo_viagem_atual', 0)
-            tempo_viagem_novo = self.fatores.get('tempo_viagem_novo', 0)
-            dias_presencial = self.fatores.get('dias_presencial_novo', 0)
-            
-            # Remuneração total atual mensal
-            remuneracao_atual_mensal = salario_atual + beneficios_atual
-            
-            # Ajuste pelo custo de vida (sobre a remuneração atual)
-            remuneracao_ajustada = remuneracao_atual_mensal * (1 + custo_vida)
-            
-            # Ajuste por qualidade de vida (tempo de deslocamento)
-            # Considerando valor de R$ 30/hora para tempo livre
-            horas_economizadas_mes = (tempo_viagem_atual - tempo_viagem_novo) * 2 * dias_presencial * 4.33
-            valor_tempo_economizado = horas_economizadas_mes * 30
-            
-            # Bônus convertido para mensal
-            bonus_mensal = bonus_atual / 12
-            
-            compensacao_minima_mensal = remuneracao_ajustada + valor_tempo_economizado + bonus_mensal
-            
-            return max(compensacao_minima_mensal, remuneracao_atual_mensal)
-            
+            return nucleo.calcular_compensacao_minima(fatores)
         except Exception as e:
             st.error(f"Erro cálculo compensação mínima: {e}")
-            return self.fatores.get('salario_atual', 5000) + self.fatores.get('beneficios_atual', 1000)
+            return fatores.get('salario_atual', 5000) + fatores.get('beneficios_atual', 1000)
     
     def calcular_valor_ideal(self):
         """Calcula o valor ideal a ser pedido - CORRIGIDO"""
         try:
-            compensacao_minima = self.calcular_compensacao_minima()
-            
-            crescimento = self.fatores.get('crescimento_carreira', 5)
-            estabilidade = self.fatores.get('estabilidade', 5)
-            beneficios_qualidade = self.fatores.get('beneficios_qualidade', 5)
-            
-            # Fator base de crescimento (20-40% acima do mínimo)
-            fator_base = 1.3
-            
-            # Ajustes por fatores qualitativos
-            ajuste_crescimento = crescimento * 0.02  # 2% por ponto
-            ajuste_estabilidade = estabilidade * 0.015  # 1.5% por ponto
-            ajuste_beneficios = beneficios_qualidade * 0.015  # 1.5% por ponto
-            
-            fator_total = (fator_base + 
-                         ajuste_crescimento + 
-                         ajuste_estabilidade + 
-                         ajuste_beneficios)
-            
-            valor_ideal_mensal = compensacao_minima * fator_total
-            
-            # NOVO: Ajuste por compatibilidade de valores pessoais
-            compatibilidade = self.calcular_compatibilidade_valores()
-            fator_valores_pessoais = compatibilidade['compatibilidade_geral'] / 100
-            
-            # Se compatibilidade alta (>80%), pode aceitar um pouco menos
-            if fator_valores_pessoais > 0.8:
-                valor_ideal_mensal = valor_ideal_mensal * 0.95  # 5% menos
-            # Se compatibilidade baixa (<50%), exige mais compensação
-            elif fator_valores_pessoais < 0.5:
-                valor_ideal_mensal = valor_ideal_mensal * 1.10  # 10% mais
-            
-            return valor_ideal_mensal
-            
+            return nucleo.calcular_valor_ideal(self.fatores, self.valores_pessoais)
         except Exception as e:
             st.error(f"Erro cálculo valor ideal: {e}")
             return self.calcular_compensacao_minima() * 1.3
     
     def calcular_faixa_recomendada(self):
         """Calcula uma faixa de valores recomendados"""
+        fatores = self.fatores
         try:
-            minimo = self.calcular_compensacao_minima()
-            ideal = self.calcular_valor_ideal()
-            
-            # Faixa: mínimo até 25% acima do ideal para negociação
-            maximo = ideal * 1.25
-            
-            return {
-                'minimo': minimo,
-                'ideal': ideal,
-                'maximo_negociacao': maximo
-            }
+            return nucleo.calcular_faixa_recomendada(fatores, self.valores_pessoais)
         except Exception as e:
             st.error(f"Erro cálculo faixa: {e}")
-            salario_base = self.fatores.get('salario_atual', 5000) + self.fatores.get('beneficios_atual', 1000)
+            salario_base = fatores.get('salario_atual', 5000) + fatores.get('beneficios_atual', 1000)
             return {
                 'minimo': salario_base,
                 'ideal': salario_base * 1.3,
@@ -848,26 +680,56 @@ class CalculadoraPropostaCompleta:
             }
     
     def calcular_equivalencia_pj_clt(self, valor_clt):
-        """Calcula valor PJ equivalente ao CLT considerando benefícios"""
-        # CLT tem 13º, férias, FGTS, etc. PJ precisa ser ~40-50% maior
-        fator_equivalencia = 1.45
-        return valor_clt * fator_equivalencia
+        """Calcula valor PJ com o mesmo total anual líquido do CLT (13º, férias, FGTS)"""
+        return nucleo.calcular_equivalencia_pj_clt(valor_clt)
+    
+    def _calcular_payload_dashboard(self, tabela):
+        """Calcula todos os valores exibidos no dashboard"""
+        # Só os nós cujas entradas mudaram desde o último rerun são recalculados
+        grafo = st.session_state.grafo_calculo
+        grafo.iniciar_execucao(self.fatores, self.valores_pessoais, tabela)
+        
+        return {
+            'faixa': grafo.obter('faixa'),
+            'salario_total_atual': grafo.obter('salario_total_atual'),
+            'valor_hora_atual': grafo.obter('valor_hora_atual'),
+            'comparacao_clt_pj': grafo.obter('comparacao_clt_pj'),  # Baseada na modalidade selecionada
+            'compatibilidade': grafo.obter('compatibilidade'),
+            'horas_economizadas': grafo.obter('horas_economizadas'),
+            'versao_tabela': tabela.versao
+        }
+    
+    def cenario(self):
+        """Retrato imutável das entradas atuais; sua chave identifica os resultados nos caches"""
+        return Cenario.de_dicionarios(self.fatores, self.valores_pessoais)
+    
+    def completar_entradas(self):
+        """Preenche os campos ausentes com os padrões de `Cenario` e retorna o cenário
+
+        O motor usa outros padrões (`.get(..., 0)`): sem isso `{}` e `{'salario_atual': 5000}`
+        teriam a mesma chave nos caches e resultados diferentes.
+        """
+        cenario = self.cenario()
+        self.fatores.update(cenario.fatores())
+        self.valores_pessoais.update(cenario.valores_pessoais())
+        return cenario
+    
+    def obter_payload_dashboard(self):
+        """Retorna o payload do dashboard, reaproveitando resultados de outras sessões"""
+        # O identificador inclui o hash do arquivo: corrigir uma tabela invalida o cache
+        tabela = registro_tabelas.obter()
+        chave = self.completar_entradas().chave(tabela.identificador)
+        return cache_dashboard.obter_ou_calcular(chave, lambda: self._calcular_payload_dashboard(tabela))
     
     def gerar_dashboard(self):
         """Gera dashboard completo com Streamlit"""
         try:
-            faixa = self.calcular_faixa_recomendada()
-            salario_total_atual = self.fatores.get('salario_atual', 0) + self.fatores.get('beneficios_atual', 0)
-            valor_hora_atual = self.calcular_valor_hora_atual()
-            
-            # Comparação CLT vs PJ baseada na modalidade selecionada
-            if self.fatores.get('modalidade', 'CLT') == 'CLT':
-                comparacao_clt_pj = self.comparar_clt_pj(faixa['ideal'], self.calcular_equivalencia_pj_clt(faixa['ideal']))
-            else:
-                comparacao_clt_pj = self.comparar_clt_pj(faixa['ideal'] / 1.45, faixa['ideal'])
-            
-            # NOVO: Calcular compatibilidade de valores
-            compatibilidade = self.calcular_compatibilidade_valores()
+            payload = self.obter_payload_dashboard()
+            faixa = payload['faixa']
+            salario_total_atual = payload['salario_total_atual']
+            valor_hora_atual = payload['valor_hora_atual']
+            comparacao_clt_pj = payload['comparacao_clt_pj']
+            compatibilidade = payload['compatibilidade']
             
             # Layout do dashboard
             st.markdown("---")
@@ -884,7 +746,7 @@ class CalculadoraPropostaCompleta:
                 st.metric("Valor/Hora Atual", f"R$ {valor_hora_atual:.2f}")
             
             with col3:
-                tempo_economizado = (self.fatores.get('tempo_viagem_atual', 0) - self.fatores.get('tempo_viagem_novo', 0)) * 2 * self.fatores.get('dias_presencial_novo', 0) * 4.33
+                tempo_economizado = payload['horas_economizadas']
                 st.metric("Horas Economizadas/mês", f"{tempo_economizado:.1f}h")
             
             with col4:
@@ -899,28 +761,46 @@ class CalculadoraPropostaCompleta:
                 compatibilidade_geral = compatibilidade['compatibilidade_geral']
                 st.metric("Compatibilidade Valores", f"{compatibilidade_geral:.1f}%")
             
-            # Abas para diferentes análises
-            tab1, tab2, tab3, tab4, tab5 = st.tabs(["💰 Valores", "⚖️ CLT vs PJ", "🎯 Valores Pessoais", "📊 Gráficos", "✅ Checklist"])  # NOVO: Adicionada aba Valores Pessoais
-            
-            with tab1:
-                self._mostrar_aba_valores(faixa, salario_total_atual, comparacao_clt_pj)
-            
-            with tab2:
-                self._mostrar_aba_clt_pj(comparacao_clt_pj, faixa)
-            
-            with tab3:  # NOVO: Aba de valores pessoais
-                self._mostrar_aba_valores_pessoais(compatibilidade)
-            
-            with tab4:
-                self._mostrar_aba_graficos(faixa, salario_total_atual, comparacao_clt_pj, compatibilidade)  # NOVO: Passar compatibilidade
+            # Seções do dashboard: cada uma só é calculada quando é desenhada
+            secoes = {
+                "💰 Valores": lambda: self._mostrar_aba_valores(faixa, salario_total_atual, comparacao_clt_pj),
+                "⚖️ CLT vs PJ": lambda: self._mostrar_aba_clt_pj(comparacao_clt_pj, faixa),
+                "🎯 Valores Pessoais": lambda: self._mostrar_aba_valores_pessoais(compatibilidade),  # NOVO: Aba de valores pessoais
+                "📊 Gráficos": lambda: self._mostrar_aba_graficos(faixa, salario_total_atual, comparacao_clt_pj, compatibilidade),
+                "✅ Checklist": lambda: self._mostrar_aba_checklist(compatibilidade),
+                "🗺️ Sensibilidade": lambda: self._mostrar_aba_sensibilidade(faixa),
+                "🔮 Cenários": lambda: self._mostrar_aba_cenarios(comparacao_clt_pj)
+            }
             
-            with tab5:
-                self._mostrar_aba_checklist(compatibilidade)  # NOVO: Passar compatibilidade
+            if st.session_state.get('navegacao_por_secao', False):
+                self._mostrar_secao_escolhida(secoes)
+            else:
+                # st.tabs desenha todas as abas a cada rerun (só uma fica visível)
+                for aba, mostrar in zip(st.tabs(list(secoes)), secoes.values()):
+                    with aba:
+                        mostrar()
                 
         except Exception as e:
             st.error(f"Erro ao gerar dashboard: {e}")
             st.info("Verifique se todos os campos foram preenchidos corretamente.")
     
+    @st.fragment
+    def _mostrar_secao_escolhida(self, secoes):
+        """Navegação por seção: só a seção escolhida é calculada e desenhada
+
+        Trocar de seção reexecuta só este fragmento (o resto do script não roda,
+        então o dashboard continua na tela); os dados pesados de cada seção
+        ficam em cache depois da primeira visita.
+        """
+        escolhida = st.radio("Seção", list(secoes), horizontal=True, key="secao_dashboard", label_visibility="collapsed")
+        secoes[escolhida]()
+    
+    def _memorizar(self, secao, entradas, calcular):
+        """Resultado pesado de uma seção, calculado só na primeira vez que é pedido com estas entradas"""
+        tabela = registro_tabelas.obter()
+        chave = self.cenario().chave(tabela.identificador, secao, entradas)
+        return cache_secoes.obter_ou_calcular(chave, calcular)
+    
     def _mostrar_aba_valores(self, faixa, salario_total_atual, comparacao_clt_pj):
         """Mostra aba de valores recomendados"""
         st.subheader("💵 Valores Recomendados")
@@ -951,45 +831,51 @@ class CalculadoraPropostaCompleta:
             st.metric("Líquido CLT Ideal", f"R$ {liquido_clt:,.2f}")
             st.metric("Líquido PJ Ideal", f"R$ {liquido_pj:,.2f}")
             
-            # Simulador de negociação
-            st.subheader("💼 Simulador de Negociação")
-            
-            if 'proposta_empresa' not in st.session_state:
-                modalidade = self.fatores.get('modalidade', 'CLT')
-                if modalidade == 'CLT':
-                    st.session_state.proposta_empresa = float(faixa['minimo'])
-                else:
-                    st.session_state.proposta_empresa = float(self.calcular_equivalencia_pj_clt(faixa['minimo']))
-            
-            proposta_empresa = st.number_input(
-                "Proposta recebida (R$)", 
-                value=st.session_state.proposta_empresa,
-                step=500.0,
-                key="proposta_empresa_input"
-            )
-            
-            st.session_state.proposta_empresa = proposta_empresa
-            
-            if proposta_empresa:
-                modalidade = self.fatores.get('modalidade', 'CLT')
-                if modalidade == 'CLT':
-                    minimo = faixa['minimo']
-                    ideal = faixa['ideal']
-                else:
-                    minimo = self.calcular_equivalencia_pj_clt(faixa['minimo'])
-                    ideal = self.calcular_equivalencia_pj_clt(faixa['ideal'])
-                
-                if proposta_empresa < minimo:
-                    st.error("❌ Abaixo do mínimo aceitável")
-                    st.info(f"**Contraproposta mínima:** R$ {minimo:,.2f}")
-                elif proposta_empresa < ideal:
-                    st.warning("⚠️ Dentro da faixa, mas abaixo do ideal")
-                    contraproposta = max(proposta_empresa * 1.10, ideal)
-                    st.success(f"**Sugestão de contraproposta:** R$ {contraproposta:,.2f}")
-                else:
-                    st.success("✅ Ótima proposta!")
-                    st.balloons()
+            # Simulador de negociação (fragmento: mudar a proposta não refaz o resto do dashboard)
+            self._mostrar_simulador_negociacao(faixa)
     
+    @st.fragment
+    def _mostrar_simulador_negociacao(self, faixa):
+        """Simulador de negociação: compara a proposta recebida com a faixa recomendada"""
+        st.subheader("💼 Simulador de Negociação")
+        
+        if 'proposta_empresa' not in st.session_state:
+            modalidade = self.fatores.get('modalidade', 'CLT')
+            if modalidade == 'CLT':
+                st.session_state.proposta_empresa = float(faixa['minimo'])
+            else:
+                st.session_state.proposta_empresa = float(self.calcular_equivalencia_pj_clt(faixa['minimo']))
+        
+        proposta_empresa = st.number_input(
+            "Proposta recebida (R$)", 
+            value=st.session_state.proposta_empresa,
+            step=500.0,
+            key="proposta_empresa_input"
+        )
+        
+        st.session_state.proposta_empresa = proposta_empresa
+        
+        if proposta_empresa:
+            modalidade = self.fatores.get('modalidade', 'CLT')
+            if modalidade == 'CLT':
+                minimo = faixa['minimo']
+                ideal = faixa['ideal']
+            else:
+                minimo = self.calcular_equivalencia_pj_clt(faixa['minimo'])
+                ideal = self.calcular_equivalencia_pj_clt(faixa['ideal'])
+            
+            if proposta_empresa < minimo:
+                st.error("❌ Abaixo do mínimo aceitável")
+                st.info(f"**Contraproposta mínima:** R$ {minimo:,.2f}")
+            elif proposta_empresa < ideal:
+                st.warning("⚠️ Dentro da faixa, mas abaixo do ideal")
+                contraproposta = max(proposta_empresa * 1.10, ideal)
+                st.success(f"**Sugestão de contraproposta:** R$ {contraproposta:,.2f}")
+            else:
+                st.success("✅ Ótima proposta!")
+                st.balloons()
+    
+    @st.fragment
     def _mostrar_aba_clt_pj(self, comparacao, faixa):
         """Mostra comparação detalhada CLT vs PJ"""
         st.subheader("⚖️ Comparação CLT vs PJ")
@@ -1037,8 +923,180 @@ class CalculadoraPropostaCompleta:
                 st.info(f"**🎯 Recomendação:** CLT é {abs(diferenca):,.0f} mais vantajoso mensalmente")
             else:
                 st.info("**🎯 Recomendação:** Ambas as modalidades são equivalentes financeiramente")
+        
+        # Curva de equilíbrio pré-calculada por tabela: leitura instantânea a cada rerun
+        st.markdown("---")
+        st.markdown("#### 📈 Equilíbrio CLT ↔ PJ por Faixa Salarial")
+        curva = inversao_impostos.curva_equivalencia()
+        st.line_chart(
+            {'Salário CLT': curva['salario_clt'], 'Fator PJ/CLT': curva['fator']},
+            x='Salário CLT', y='Fator PJ/CLT'
+        )
+        if clt:
+            salario = clt.get('salario_bruto', 0)
+            if salario > 0:
+                fator = self.calcular_equivalencia_pj_clt(salario) / salario
+                st.caption(f"No seu salário, o PJ precisa ser {fator:.2f}x o CLT para empatar no total anual")
+        
+        # Meta de líquido: quanto pedir de bruto (CLT) ou de nota (PJ) para receber um valor
+        st.markdown("---")
+        st.markdown("#### 🎯 Meta de Líquido")
+        liquido_desejado = st.number_input(
+            "Líquido mensal desejado (R$)",
+            min_value=0.0,
+            value=float(round(clt.get('salario_liquido', 0) if clt else 0, 2)),
+            step=500.0,
+            key="liquido_desejado_input"
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("Bruto CLT necessário", f"R$ {self.calcular_bruto_para_liquido_clt(liquido_desejado):,.2f}")
+        with col2:
+            st.metric("Valor PJ necessário", f"R$ {self.calcular_valor_pj_para_liquido(liquido_desejado):,.2f}")
+    
+    def _eixos_sensibilidade(self, faixa):
+        """Eixos disponíveis no mapa de calor: rótulo e valores percorridos"""
+        import numpy as np
+        return {
+            'salario_oferecido': ("Salário oferecido (R$)", np.linspace(faixa['minimo'] * 0.6, faixa['maximo_negociacao'] * 1.2, 200)),
+            'dias_presencial_novo': ("Dias presenciais", np.arange(0, 6)),
+            'tempo_viagem_novo': ("Deslocamento (h/trajeto)", np.linspace(0.0, 4.0, 200)),
+            'custo_vida_nova': ("Variação custo de vida", np.linspace(-0.5, 1.0, 200))
+        }
+    
+    @st.fragment
+    def _mostrar_aba_sensibilidade(self, faixa):
+        """Mapa de calor da faixa recomendada variando duas entradas ao mesmo tempo"""
+        from motor_vetorizado import calcular_grade_sensibilidade
+        st.subheader("🗺️ Sensibilidade da Proposta")
+        st.write("Veja como o mínimo e o ideal mudam quando duas condições da vaga variam juntas; as demais ficam nos valores informados.")
+        
+        eixos = self._eixos_sensibilidade(faixa)
+        nomes = list(eixos)
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            eixo_x = st.selectbox("Eixo horizontal", nomes, index=0, format_func=lambda nome: eixos[nome][0], key="sensibilidade_eixo_x")
+        with col2:
+            opcoes_y = [nome for nome in nomes if nome != eixo_x]
+            eixo_y = st.selectbox("Eixo vertical", opcoes_y, index=0, format_func=lambda nome: eixos[nome][0], key="sensibilidade_eixo_y")
+        metricas = {'minimo': "Mínimo (R$)", 'ideal': "Ideal (R$)"}
+        if 'salario_oferecido' in (eixo_x, eixo_y):
+            metricas = dict({'cobertura': "Oferta / mínimo (%)"}, **metricas)
+        with col3:
+            metrica = st.selectbox("Métrica", list(metricas), format_func=metricas.get, key="sensibilidade_metrica")
+        
+        # Uma avaliação vetorizada da grade inteira (não um loop sobre os métodos escalares)
+        # Os eixos derivam da faixa: nomes + faixa identificam a grade
+        dados = self._memorizar(
+            'sensibilidade', [eixo_x, eixo_y, metrica, faixa['minimo'], faixa['maximo_negociacao']],
+            lambda: graficos.dados_mapa_calor(
+                calcular_grade_sensibilidade(
+                    self.fatores, self.valores_pessoais, {eixo_x: eixos[eixo_x][1], eixo_y: eixos[eixo_y][1]}
+                ),
+                metrica, eixos[eixo_x][0], eixos[eixo_y][0], metricas[metrica]
+            )
+        )
+        # Sempre no navegador: o mapa é interativo (tooltip por célula)
+        st.vega_lite_chart(spec=graficos.especificacao_vega('mapa_calor', dados), use_container_width=True)
+    
+    @st.fragment
+    def _mostrar_aba_cenarios(self, comparacao):
+        """Simulação Monte Carlo de aumento, bônus e PLR sobre a oferta ideal"""
+        from simulacao_remuneracao import simular_remuneracao
+        st.subheader("🔮 Cenários de Remuneração Variável")
+        st.write("Sorteia milhares de cenários de aumento, bônus e PLR e mostra a faixa provável do líquido anual.")
+        
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.markdown("**📈 Aumento anual (%)**")
+            aumento_medio = st.number_input("Média", value=5.0, step=1.0, key="cenarios_aumento_medio")
+            aumento_desvio = st.number_input("Desvio padrão", min_value=0.0, value=3.0, step=1.0, key="cenarios_aumento_desvio")
+        with col2:
+            st.markdown("**🎯 Bônus**")
+            bonus_alvo = st.number_input(
+                "Bônus anual na meta (R$)", min_value=0.0,
+                value=float(self.fatores.get('bonus_atual', 0.0)), step=1000.0, key="cenarios_bonus_alvo"
+            )
+            atingimento = st.slider("Atingimento mínimo e máximo (%)", 0, 200, (0, 150), key="cenarios_atingimento")
+            atingimento_provavel = st.slider("Atingimento provável (%)", 0, 200, 100, key="cenarios_atingimento_provavel")
+        with col3:
+            st.markdown("**💵 PLR anual (R$)**")
+            plr_minimo = st.number_input("Mínima", min_value=0.0, value=0.0, step=1000.0, key="cenarios_plr_minimo")
+            plr_provavel = st.number_input("Provável", min_value=0.0, value=0.0, step=1000.0, key="cenarios_plr_provavel")
+            plr_maximo = st.number_input("Máxima", min_value=0.0, value=0.0, step=1000.0, key="cenarios_plr_maximo")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            cenarios = st.select_slider("Cenários", options=[10_000, 100_000, 200_000, 500_000, 1_000_000], value=200_000, key="cenarios_quantidade")
+        with col2:
+            semente = st.number_input("Semente (mesma semente = mesmo resultado)", min_value=0, value=42, step=1, key="cenarios_semente")
+        
+        plr_valores = sorted([plr_minimo, plr_provavel, plr_maximo])
+        distribuicoes = {
+            'aumento': {'tipo': 'normal', 'media': aumento_medio / 100, 'desvio': aumento_desvio / 100, 'minimo': 0.0},
+            'atingimento_bonus': {
+                'tipo': 'triangular', 'minimo': atingimento[0] / 100,
+                'moda': min(max(atingimento_provavel, atingimento[0]), atingimento[1]) / 100, 'maximo': atingimento[1] / 100
+            },
+            'plr': {'tipo': 'triangular', 'minimo': plr_valores[0], 'moda': plr_valores[1], 'maximo': plr_valores[2]}
+        }
+        
+        salario_clt = comparacao['CLT'].get('salario_bruto', 0)
+        valor_pj = comparacao['PJ'].get('valor_total', 0)
+        # Mesma semente e mesmos parâmetros = mesmo resultado: seguro reaproveitar
+        resultado = self._memorizar(
+            'cenarios', [salario_clt, valor_pj, bonus_alvo, distribuicoes, int(cenarios), int(semente)],
+            lambda: simular_remuneracao(
+                salario_clt, valor_pj, bonus_alvo, distribuicoes, cenarios=int(cenarios), semente=int(semente)
+            )
+        )
+        
+        rotulos = {'p5': "Pessimista (P5)", 'p25': "P25", 'p50': "Mediana (P50)", 'p75': "P75", 'p95': "Otimista (P95)", 'media': "Média"}
+        st.table({
+            'Cenário': list(rotulos.values()),
+            'CLT (R$/ano)': [f"R$ {resultado['CLT'][chave]:,.0f}" for chave in rotulos],
+            'PJ (R$/ano)': [f"R$ {resultado['PJ'][chave]:,.0f}" for chave in rotulos]
+        })
+        st.metric("Chance de o PJ render mais no ano", f"{resultado['probabilidade_pj_melhor'] * 100:.1f}%")
+        
+        # Projeção plurianual: líquido em reais de hoje e valor presente de cada caminho
+        from projecao_carreira import projetar_carreira, ipca_projetado, TAXA_DESCONTO_REAL_PADRAO
+        st.markdown("---")
+        st.markdown("#### 📅 Projeção de Carreira (valores reais)")
+        col1, col2 = st.columns(2)
+        with col1:
+            anos = st.slider("Anos de projeção", 5, 15, 10, key="projecao_anos")
+        with col2:
+            taxa_desconto = st.number_input(
+                "Taxa de desconto real (% a.a.)", min_value=0.0, max_value=20.0,
+                value=TAXA_DESCONTO_REAL_PADRAO * 100, step=0.5, key="projecao_taxa_desconto"
+            )
+        projecao = self._memorizar(
+            'projecao', [salario_clt, valor_pj, anos, taxa_desconto],
+            lambda: projetar_carreira(
+                salario_clt, valor_pj, self.fatores.get('crescimento_carreira', 5),
+                anos=anos, taxa_desconto_real=taxa_desconto / 100
+            )
+        )
+        st.caption(f"IPCA projetado: {ipca_projetado() * 100:.2f}% a.a. (média dos últimos anos da série); faixas de impostos congeladas no valor nominal atual")
+        st.line_chart(
+            {
+                'Ano': projecao['anos'].tolist(),
+                'CLT acumulado': projecao['CLT']['acumulado'][0].round(2).tolist(),
+                'PJ acumulado': projecao['PJ']['acumulado'][0].round(2).tolist()
+            },
+            x='Ano', y=['CLT acumulado', 'PJ acumulado']
+        )
+        col1, col2, col3 = st.columns(3)
+        with col1:
+            st.metric("VPL CLT", f"R$ {projecao['CLT']['vpl'][0]:,.0f}")
+        with col2:
+            st.metric("VPL PJ", f"R$ {projecao['PJ']['vpl'][0]:,.0f}")
+        with col3:
+            st.metric("Vantagem PJ (VPL)", f"R$ {projecao['diferenca_vpl'][0]:,.0f}")
     
     # NOVO: Aba para mostrar análise de valores pessoais
+    @st.fragment
     def _mostrar_aba_valores_pessoais(self, compatibilidade):
         """Mostra análise de compatibilidade com valores pessoais"""
         st.subheader("🎯 Compatibilidade com Seus Valores")
@@ -1048,30 +1106,7 @@ class CalculadoraPropostaCompleta:
         
         # Gráfico de compatibilidade por fator
         st.subheader("📊 Compatibilidade por Fator")
-        
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        fatores = list(compatibilidade['detalhado'].keys())
-        valores = list(compatibilidade['detalhado'].values())
-        
-        # Ordenar por valor
-        sorted_indices = np.argsort(valores)
-        fatores = [fatores[i] for i in sorted_indices]
-        valores = [valores[i] for i in sorted_indices]
-        
-        bars = ax.barh(fatores, valores, 
-                      color=['red' if v < 50 else 'orange' if v < 70 else 'green' for v in valores])
-        
-        ax.set_xlabel('Compatibilidade (%)')
-        ax.set_title('Compatibilidade com Seus Valores Pessoais')
-        ax.set_xlim(0, 100)
-        
-        # Adicionar valores
-        for bar, valor in zip(bars, valores):
-            ax.text(valor + 1, bar.get_y() + bar.get_height()/2, 
-                   f'{valor:.1f}%', va='center')
-        
-        st.pyplot(fig)
+        self._exibir_grafico('compatibilidade', graficos.dados_compatibilidade(compatibilidade))
         
         # Análise detalhada
         st.subheader("📝 Análise Detalhada")
@@ -1148,76 +1183,21 @@ class CalculadoraPropostaCompleta:
             - Não houver outras opções no momento
             """)
     
+    @st.fragment
     def _mostrar_aba_graficos(self, faixa, salario_total_atual, comparacao_clt_pj, compatibilidade):
         """Mostra gráficos comparativos"""
         st.subheader("📊 Análise Visual")
         
         try:
-            fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
-            
-            # Gráfico 1: Comparação de valores
-            categorias = ['Atual', 'Mínimo', 'Ideal', 'Máximo']
-            valores = [salario_total_atual, faixa['minimo'], faixa['ideal'], faixa['maximo_negociacao']]
-            cores = ['lightgray', 'orange', 'green', 'lightblue']
-            
-            bars1 = ax1.bar(categorias, valores, color=cores)
-            ax1.set_ylabel('Valor Mensal (R$)')
-            ax1.set_title('Comparação de Propostas (Bruto)')
-            for bar, valor in zip(bars1, valores):
-                ax1.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 500, 
-                        f'R$ {valor:,.0f}', ha='center', va='bottom')
-            
-            # Gráfico 2: Fatores qualitativos
-            fatores = ['Crescimento', 'Estabilidade', 'Benefícios', 'Cultura', 'Inovação']
-            valores_fatores = [
-                self.fatores.get('crescimento_carreira', 5), 
-                self.fatores.get('estabilidade', 5), 
-                self.fatores.get('beneficios_qualidade', 5),
-                self.fatores.get('cultura_empresa_nova', 5),
-                self.fatores.get('inovacao_tecnologia_nova', 5)
-            ]
-            
-            bars2 = ax2.bar(fatores, valores_fatores, color=['purple', 'red', 'blue', 'green', 'orange'])
-            ax2.set_ylim(0, 10)
-            ax2.set_ylabel('Avaliação (1-10)')
-            ax2.set_title('Fatores Qualitativos da Empresa')
-            
-            # Gráfico 3: CLT vs PJ
-            modalidades = ['CLT Líquido', 'PJ Líquido']
-            valores_liq = [
-                comparacao_clt_pj['CLT'].get('salario_liquido', 0), 
-                comparacao_clt_pj['PJ'].get('renda_liquida', 0)
-            ]
-            
-            bars3 = ax3.bar(modalidades, valores_liq, color=['#1f77b4', '#ff7f0e'])
-            ax3.set_ylabel('Valor Mensal (R$)')
-            ax3.set_title('Comparação CLT vs PJ (Líquido)')
-            for bar, valor in zip(bars3, valores_liq):
-                ax3.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 300, 
-                        f'R$ {valor:,.0f}', ha='center', va='bottom')
-            
-            # Gráfico 4: Compatibilidade com valores pessoais
-            fatores_compat = ['Estabilidade', 'Crescimento', 'Flexibilidade', 'Equilíbrio', 'Cultura']
-            valores_compat = [
-                compatibilidade['detalhado'].get('estabilidade_financeira', 0),
-                compatibilidade['detalhado'].get('crescimento_carreira', 0),
-                compatibilidade['detalhado'].get('flexibilidade_tempo', 0),
-                compatibilidade['detalhado'].get('equilibrio_vida_pessoal', 0),
-                compatibilidade['detalhado'].get('cultura_empresa', 0)
-            ]
-            
-            ax4.bar(fatores_compat, valores_compat, 
-                   color=['blue', 'green', 'orange', 'purple', 'red'])
-            ax4.set_ylim(0, 100)
-            ax4.set_ylabel('Compatibilidade (%)')
-            ax4.set_title('Compatibilidade com Valores Pessoais')
-            
-            plt.tight_layout()
-            st.pyplot(fig)
+            # Imagem reaproveitada enquanto os dados plotados não mudarem
+            dados = graficos.dados_graficos_dashboard(faixa, salario_total_atual, self.fatores,
+                                                      comparacao_clt_pj, compatibilidade)
+            self._exibir_grafico('dashboard', dados)
             
         except Exception as e:
             st.error(f"Erro ao gerar gráficos: {e}")
     
+    @st.fragment
     def _mostrar_aba_checklist(self, compatibilidade):
         """Mostra checklist de decisão"""
         st.subheader("✅ Checklist de Decisão")
@@ -1281,94 +1261,121 @@ class CalculadoraPropostaCompleta:
     # NOVO: Método para verificar alinhamento com prioridades
     def _verificar_prioridades(self):
         """Verifica se a oportunidade atende às prioridades pessoais"""
-        prioridades = [
-            self.valores_pessoais.get('prioridade_1', ''),
-            self.valores_pessoais.get('prioridade_2', ''),
-            self.valores_pessoais.get('prioridade_3', '')
-        ]
-        
-        # Verificar cada prioridade
-        atendidas = 0
-        
-        for prioridade in prioridades:
-            if prioridade == 'Estabilidade Financeira':
-                if self.fatores.get('estabilidade', 0) >= 7:
-                    atendidas += 1
-            elif prioridade == 'Flexibilidade de Tempo':
-                if self.fatores.get('dias_presencial_novo', 0) <= 2:
-                    atendidas += 1
-            elif prioridade == 'Crescimento na Carreira':
-                if self.fatores.get('crescimento_carreira', 0) >= 7:
-                    atendidas += 1
-            elif prioridade == 'Equilíbrio Vida Pessoal':
-                if self.fatores.get('tempo_viagem_novo', 0) <= 1.0:
-                    atendidas += 1
-            # Adicionar outras condições conforme necessário
-            
-        return atendidas >= 2  # Atende pelo menos 2 das 3 prioridades
+        return nucleo.verificar_prioridades(self.fatores, self.valores_pessoais)
     
     def _gerar_relatorio_texto(self, compatibilidade):
         """Gera relatório completo em texto"""
         try:
             faixa = self.calcular_faixa_recomendada()
-            comparacao = self.comparar_clt_pj(faixa['ideal'], self.calcular_equivalencia_pj_clt(faixa['ideal']))
-            modalidade = self.fatores.get('modalidade', 'CLT')
-            
-            relatorio = f"""
-RELATÓRIO DE PROPOSTA SALARIAL - {datetime.now().strftime('%d/%m/%Y %H:%M')}
-
-SITUAÇÃO ATUAL:
-- Salário bruto: R$ {self.fatores.get('salario_atual', 0):,.2f}
-- Benefícios totais: R$ {self.fatores.get('beneficios_atual', 0):,.2f}
-- VA/VR: R$ {self.beneficios_detalhados.get('va_vr', 0):,.2f}
-- VT: R$ {self.beneficios_detalhados.get('vt', 0):,.2f}
-- Plano saúde: {'Sim' if self.beneficios_detalhados.get('plano_saude', False) else 'Não'}
-- Coparticipação: R$ {self.beneficios_detalhados.get('coparticipacao', 0):,.2f}
-- Outros: R$ {self.beneficios_detalhados.get('outros_beneficios', 0):,.2f}
-- Total atual: R$ {self.fatores.get('salario_atual', 0) + self.fatores.get('beneficios_atual', 0):,.2f}
-- Tempo deslocamento: {self.fatores.get('tempo_viagem_atual', 0)}h/dia
-
-SEU PERFIL DE VALORES:
-- Prioridade 1: {self.valores_pessoais.get('prioridade_1', 'Não definida')}
-- Prioridade 2: {self.valores_pessoais.get('prioridade_2', 'Não definida')}
-- Prioridade 3: {self.valores_pessoais.get('prioridade_3', 'Não definida')}
-- Compatibilidade geral: {compatibilidade['compatibilidade_geral']:.1f}%
-
-NOVA OPORTUNIDADE:
-- Modalidade: {modalidade}
-- Custo de vida: {self.fatores.get('custo_vida_nova', 0)*100:.1f}%
-- Dias presenciais: {self.fatores.get('dias_presencial_novo', 0)}/semana
-- Novo deslocamento: {self.fatores.get('tempo_viagem_novo', 0)}h/dia
-- Avaliação crescimento: {self.fatores.get('crescimento_carreira', 0)}/10
-- Avaliação estabilidade: {self.fatores.get('estabilidade', 0)}/10
-- Avaliação cultura: {self.fatores.get('cultura_empresa_nova', 0)}/10
+            registro = dict(self.fatores, **self.beneficios_detalhados)
+            # Dos valores pessoais só as prioridades (alguns nomes coincidem com os fatores)
+            for chave in ('prioridade_1', 'prioridade_2', 'prioridade_3'):
+                registro[chave] = self.valores_pessoais.get(chave, 'Não definida')
+            registro.update(faixa)
+            # Cada valor calculado uma vez; o modelo só formata
+            for chave in ('minimo', 'ideal', 'maximo_negociacao'):
+                registro[f'pj_{chave}'] = self.calcular_equivalencia_pj_clt(faixa[chave])
+            comparacao = self.comparar_clt_pj(faixa['ideal'], registro['pj_ideal'])
+            registro['liquido_clt'] = comparacao['CLT'].get('salario_liquido', 0)
+            registro['liquido_pj'] = comparacao['PJ'].get('renda_liquida', 0)
+            registro['compatibilidade_geral'] = compatibilidade['compatibilidade_geral']
+            for detalhe, valor in compatibilidade['detalhado'].items():
+                registro[f'compatibilidade_{detalhe}'] = valor
+            registro['data'] = datetime.now().strftime('%d/%m/%Y %H:%M')
+            return relatorios.renderizar_relatorio(registro)
+        except Exception as e:
+            return f"Erro ao gerar relatório: {e}"
 
-VALORES RECOMENDADOS - {modalidade}:
-- Mínimo aceitável: R$ {faixa['minimo'] if modalidade == 'CLT' else self.calcular_equivalencia_pj_clt(faixa['minimo']):,.2f}
-- Valor ideal: R$ {faixa['ideal'] if modalidade == 'CLT' else self.calcular_equivalencia_pj_clt(faixa['ideal']):,.2f}
-- Máximo negociação: R$ {faixa['maximo_negociacao'] if modalidade == 'CLT' else self.calcular_equivalencia_pj_clt(faixa['maximo_negociacao']):,.2f}
+    def salvar_cenario(self, candidato_id=None, nome=None):
+        """Grava entradas e resultados da sessão no armazém de cenários"""
+        tabela = registro_tabelas.obter()
+        return armazem_padrao().salvar(
+            self.fatores, self.valores_pessoais, self.obter_payload_dashboard(),
+            candidato_id=candidato_id or None, nome=nome or None, tabela_identificador=tabela.identificador,
+            extras={
+                'beneficios_detalhados': self.beneficios_detalhados,
+                'proposta_empresa': st.session_state.get('proposta_empresa')
+            }
+        )
+    
+    def abrir_cenario(self, id_cenario):
+        """Restaura um cenário salvo; os resultados guardados voltam direto para o cache do dashboard"""
+        cenario = armazem_padrao().carregar(id_cenario)
+        if cenario is None:
+            return False
+        entradas = cenario['entradas']
+        # Widgets com key ignoram `value` se já estão na sessão: removidos para mostrarem o cenário
+        for chave in [k for k in st.session_state.keys() if k.endswith(('_input', '_slider', '_select', '_check'))]:
+            del st.session_state[chave]
+        self.fatores = entradas['fatores']
+        self.valores_pessoais = entradas['valores_pessoais']
+        self.beneficios_detalhados = entradas.get('beneficios_detalhados') or {}
+        if entradas.get('proposta_empresa') is not None:
+            st.session_state.proposta_empresa = entradas['proposta_empresa']
+        else:
+            st.session_state.pop('proposta_empresa', None)
+        
+        # Resultados calculados com outra tabela de impostos, ou com campos ausentes (padrões do
+        # motor, não os de `Cenario`), são recalculados
+        tabela = registro_tabelas.obter()
+        campos = len(self.fatores) + len(self.valores_pessoais)
+        chave = self.completar_entradas().chave(tabela.identificador)
+        completas = len(self.fatores) + len(self.valores_pessoais) == campos
+        if completas and cenario['tabela_identificador'] == tabela.identificador:
+            cache_dashboard.guardar(chave, cenario['resultados'])
+        return True
+    
+    def mostrar_cenarios_salvos(self):
+        """Barra lateral: salvar o cenário atual e reabrir cenários salvos"""
+        with st.sidebar.expander("💾 Cenários Salvos"):
+            candidato_id = st.text_input("ID do candidato", key="cenario_candidato_id")
+            nome = st.text_input("Nome do cenário", key="cenario_nome")
+            if st.button("💾 Salvar cenário atual", key="salvar_cenario"):
+                id_cenario = self.salvar_cenario(candidato_id, nome)
+                st.success(f"Cenário #{id_cenario} salvo")
+            
+            st.markdown("---")
+            modalidade = st.selectbox("Modalidade", ["Todas", "CLT", "PJ"], key="cenarios_filtro_modalidade")
+            salario_minimo, salario_maximo = st.slider(
+                "Salário atual (R$)", 0, 100000, (0, 100000), step=1000, key="cenarios_filtro_salario"
+            )
+            cenarios = armazem_padrao().buscar(
+                candidato_id=candidato_id or None,
+                modalidade=None if modalidade == "Todas" else modalidade,
+                salario_minimo=salario_minimo or None,
+                salario_maximo=salario_maximo if salario_maximo < 100000 else None,
+                limite=50
+            )
+            if not cenarios:
+                st.caption("Nenhum cenário encontrado")
+                return
+            
+            rotulos = {
+                c['id']: (f"#{c['id']} {c['nome'] or c['candidato_id'] or 'sem nome'} · {c['modalidade']} · "
+                          f"R$ {c['salario_atual']:,.0f} · {datetime.fromtimestamp(c['criado_em']).strftime('%d/%m %H:%M')}")
+                for c in cenarios
+            }
+            id_escolhido = st.selectbox("Cenários", list(rotulos), format_func=rotulos.get, key="cenario_escolhido")
+            if st.button("📂 Abrir cenário", key="abrir_cenario"):
+                if self.abrir_cenario(id_escolhido):
+                    st.rerun()
+                st.warning("Cenário não encontrado")
 
-COMPARAÇÃO CLT vs PJ:
-- CLT Líquido: R$ {comparacao['CLT'].get('salario_liquido', 0):,.2f}
-- PJ Líquido: R$ {comparacao['PJ'].get('renda_liquida', 0):,.2f}
-- Diferença: R$ {comparacao['PJ'].get('renda_liquida', 0) - comparacao['CLT'].get('salario_liquido', 0):,.2f}
+@contextmanager
+def grupo_de_entradas(chave):
+    """Agrupa os campos de uma aba de entrada num formulário quando o modo formulário está ligado
 
-ANÁLISE DE COMPATIBILIDADE:
-- Compatibilidade geral: {compatibilidade['compatibilidade_geral']:.1f}%
-- Estabilidade financeira: {compatibilidade['detalhado'].get('estabilidade_financeira', 0):.1f}%
-- Crescimento carreira: {compatibilidade['detalhado'].get('crescimento_carreira', 0):.1f}%
-- Flexibilidade tempo: {compatibilidade['detalhado'].get('flexibilidade_tempo', 0):.1f}%
-- Equilíbrio vida: {compatibilidade['detalhado'].get('equilibrio_vida_pessoal', 0):.1f}%
+    Dentro do formulário os campos não disparam rerun; o envio aplica todos de
+    uma vez e o motor roda uma única vez com os valores novos. Campos que
+    dependem de outros (prioridades) e totais ficam fora do formulário.
+    """
+    if not st.session_state.get('modo_formulario', False):
+        yield
+        return
+    with st.form(chave, border=False):
+        yield
+        st.form_submit_button("✅ Aplicar alterações", type="primary", use_container_width=True)
 
-RECOMENDAÇÕES:
-- Estratégia de negociação: Buscar R$ {faixa['ideal'] if modalidade == 'CLT' else self.calcular_equivalencia_pj_clt(faixa['ideal']):,.2f}
-- Contraproposta mínima: R$ {faixa['minimo'] if modalidade == 'CLT' else self.calcular_equivalencia_pj_clt(faixa['minimo']):,.2f}
-- {'Considerar CLT se oferecerem benefícios equivalentes' if modalidade == 'PJ' else 'Considerar PJ se oferecerem valor equivalente'}
-- {'Aceitar com menor salário se compatibilidade for alta' if compatibilidade['compatibilidade_geral'] > 80 else 'Exigir compensação maior se compatibilidade for baixa'}
-            """
-            return relatorio
-        except Exception as e:
-            return f"Erro ao gerar relatório: {e}"
 
 # Interface Streamlit
 def main():
@@ -1415,20 +1422,67 @@ def main():
     </div>
     """, unsafe_allow_html=True)
     
+    # Tabelas de impostos: novos arquivos em tabelas/ entram em vigor sem reiniciar o app
+    try:
+        registro_tabelas.recarregar_se_alterado()
+    except TabelaInvalidaError as e:
+        st.sidebar.warning(f"⚠️ Tabela de impostos inválida, mantendo a anterior: {e}")
+    
+    # Métricas de tempo: vale para o processo inteiro, então é configuração do servidor
+    # (CALCULADORA_METRICAS ou o arquivo interruptor), não uma opção de cada sessão; relida a
+    # cada rerun para ligar e desligar sem reiniciar. Desligada, os spans não existem
+    if instrumentacao.sincronizar():
+        instrumentacao.instrumentar_app(CalculadoraPropostaCompleta, st, graficos)
+    
     # Inicializar calculadora
     calculadora = CalculadoraPropostaCompleta()
     
+    # Modo de gráficos: o navegador desenha a partir das séries (sem PNGs no servidor)
+    st.sidebar.toggle(
+        "🌐 Renderizar gráficos no navegador",
+        key="graficos_no_navegador",
+        help="Envia só os dados dos gráficos; o navegador desenha com Vega-Lite"
+    )
+    
+    # Navegação por seção: só a aba escolhida do dashboard é calculada
+    st.sidebar.toggle(
+        "🧭 Dashboard por seção",
+        key="navegacao_por_secao",
+        help="Mostra uma seção por vez e calcula só a escolhida, em vez de todas as abas a cada rerun"
+    )
+    
+    # Modo formulário: cada aba de entrada vira um st.form com um único envio
+    st.sidebar.toggle(
+        "📝 Preencher em formulários",
+        key="modo_formulario",
+        help="As alterações de cada aba são aplicadas juntas ao clicar em 'Aplicar', em vez de um rerun por campo"
+    )
+    
     # Coletar dados em abas
-    tab1, tab2, tab3 = st.tabs(["📊 Situação Atual", "🚀 Nova Oportunidade", "🎯 Meus Valores"])
+    tab1, tab2, tab3, tab4 = st.tabs(["📊 Situação Atual", "🚀 Nova Oportunidade", "🎯 Meus Valores", "📋 Minhas Ofertas"])
     
     with tab1:
-        calculadora.coletar_dados_atual()
+        with grupo_de_entradas("form_situacao_atual"):
+            calculadora.coletar_dados_atual()
+        calculadora.mostrar_resumo_atual()
     
     with tab2:
-        calculadora.coletar_expectativas()
+        with grupo_de_entradas("form_nova_oportunidade"):
+            calculadora.coletar_expectativas()
     
     with tab3:
-        calculadora.coletar_valores_pessoais()
+        with grupo_de_entradas("form_valores_pessoais"):
+            calculadora.coletar_valores_pessoais()
+        calculadora.coletar_prioridades()
+        calculadora.mostrar_botao_perfil_valores()
+    
+    with tab4:
+        calculadora.coletar_ofertas()
+        if st.button("🏁 Comparar Ofertas", key="comparar_ofertas"):
+            calculadora.mostrar_comparacao_ofertas()
+    
+    # Depois das abas de entrada: o cenário salvo leva os valores deste rerun
+    calculadora.mostrar_cenarios_salvos()
     
     # Botão para calcular
     st.markdown("---")
@@ -1440,6 +1494,21 @@ def main():
     if any(calculadora.fatores.values()) or any(calculadora.valores_pessoais.values()):
         if st.button("📈 Ver Dashboard Existente", key="ver_dashboard_existente"):
             calculadora.gerar_dashboard()
+    
+    # Estatísticas do cache de resultados compartilhado entre sessões
+    estatisticas = cache_dashboard.estatisticas()
+    st.sidebar.caption(
+        f"♻️ Cache de resultados: {estatisticas['acertos']} acertos / "
+        f"{estatisticas['falhas']} falhas ({estatisticas['itens']}/{estatisticas['tamanho_maximo']} itens)"
+    )
+    st.sidebar.caption(f"🧾 Tabelas de impostos: {registro_tabelas.obter().versao}")
+    estatisticas_graficos = graficos.cache_graficos.estatisticas()
+    st.sidebar.caption(
+        f"🖼️ Cache de gráficos: {estatisticas_graficos['acertos']} acertos / "
+        f"{estatisticas_graficos['falhas']} falhas ({estatisticas_graficos['bytes'] / 1024 / 1024:.1f} MB)"
+    )
+    if instrumentacao.ativa:
+        instrumentacao.publicar()
 
 if __name__ == "__main__":
     main()
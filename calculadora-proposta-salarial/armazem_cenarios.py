@@ -0,0 +1,193 @@
+"""Armazém local de cenários (SQLite): entradas e resultados calculados.
+
+Cada cenário guarda as entradas da sessão (fatores, valores pessoais,
+benefícios detalhados, proposta da empresa) e o payload do dashboard já
+calculado, em JSON, mais colunas indexadas para consulta: id do candidato,
+modalidade, salário atual e data de criação. Reabrir um cenário devolve os
+resultados prontos; o motor só roda de novo se a tabela de impostos mudou.
+
+Os índices cobrem os filtros e a ordenação por data: a listagem escolhe os ids
+só pelos índices e lê apenas as linhas que vai devolver, sem decodificar
+JSON, então continua em milissegundos com milhões de cenários.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+VARIAVEL_ARQUIVO = 'CALCULADORA_CENARIOS_DB'
+ARQUIVO_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dados', 'cenarios.sqlite3')
+
+ESQUEMA = """
+CREATE TABLE IF NOT EXISTS cenarios (
+    id INTEGER PRIMARY KEY,
+    candidato_id TEXT,
+    nome TEXT,
+    modalidade TEXT NOT NULL,
+    salario_atual REAL NOT NULL,
+    ideal REAL,
+    criado_em REAL NOT NULL,
+    tabela_identificador TEXT,
+    entradas TEXT NOT NULL,
+    resultados TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cenarios_candidato ON cenarios (candidato_id, criado_em);
+CREATE INDEX IF NOT EXISTS idx_cenarios_modalidade_salario ON cenarios (modalidade, salario_atual, criado_em);
+CREATE INDEX IF NOT EXISTS idx_cenarios_salario ON cenarios (salario_atual, criado_em);
+CREATE INDEX IF NOT EXISTS idx_cenarios_criado_em ON cenarios (criado_em, modalidade, salario_atual);
+"""
+
+# Acima disso uma faixa de salário é "larga": percorrer o índice por data e
+# filtrar é mais rápido que ordenar todos os cenários da faixa
+LIMITE_FAIXA_ESTREITA = 10_000
+
+COLUNAS_RESUMO = ('id', 'candidato_id', 'nome', 'modalidade', 'salario_atual', 'ideal', 'criado_em')
+
+
+def _json(valor):
+    # numpy.float64 e afins viram float; o resto que não for JSON vira texto
+    return json.dumps(valor, ensure_ascii=False, separators=(',', ':'),
+                      default=lambda v: float(v) if hasattr(v, '__float__') else str(v))
+
+
+class ArmazemCenarios:
+    """Cenários salvos num arquivo SQLite, com uma conexão compartilhada entre threads"""
+
+    def __init__(self, caminho=None):
+        self.caminho = caminho or os.environ.get(VARIAVEL_ARQUIVO) or ARQUIVO_PADRAO
+        if self.caminho != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(self.caminho)), exist_ok=True)
+        self._conexao = sqlite3.connect(self.caminho, check_same_thread=False)
+        self._trava = threading.Lock()
+        with self._trava:
+            self._conexao.execute('PRAGMA journal_mode=WAL')
+            self._conexao.executescript(ESQUEMA)
+
+    @staticmethod
+    def _linha(fatores, valores_pessoais, resultados, candidato_id, nome, tabela_identificador, extras, criado_em):
+        entradas = {'fatores': fatores, 'valores_pessoais': valores_pessoais}
+        entradas.update(extras or {})
+        return (
+            candidato_id, nome, fatores.get('modalidade') or 'CLT', float(fatores.get('salario_atual', 0)),
+            float(resultados.get('faixa', {}).get('ideal', 0)) if resultados else None,
+            time.time() if criado_em is None else criado_em,
+            tabela_identificador, _json(entradas), _json(resultados)
+        )
+
+    def salvar(self, fatores, valores_pessoais, resultados, candidato_id=None, nome=None,
+               tabela_identificador=None, extras=None, criado_em=None):
+        """Grava um cenário e retorna seu id
+
+        `extras` são outras entradas da sessão guardadas junto (ex.:
+        benefícios detalhados, proposta da empresa).
+        """
+        linha = self._linha(fatores, valores_pessoais, resultados, candidato_id, nome,
+                            tabela_identificador, extras, criado_em)
+        with self._trava, self._conexao:
+            cursor = self._conexao.execute(
+                'INSERT INTO cenarios (candidato_id, nome, modalidade, salario_atual, ideal, criado_em, '
+                'tabela_identificador, entradas, resultados) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', linha
+            )
+            return cursor.lastrowid
+
+    def salvar_varios(self, cenarios):
+        """Grava muitos cenários numa única transação
+
+        `cenarios` é um iterável de dicionários com as chaves de `salvar`.
+        """
+        linhas = (
+            self._linha(c['fatores'], c['valores_pessoais'], c['resultados'], c.get('candidato_id'), c.get('nome'),
+                        c.get('tabela_identificador'), c.get('extras'), c.get('criado_em'))
+            for c in cenarios
+        )
+        with self._trava, self._conexao:
+            self._conexao.executemany(
+                'INSERT INTO cenarios (candidato_id, nome, modalidade, salario_atual, ideal, criado_em, '
+                'tabela_identificador, entradas, resultados) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)', linhas
+            )
+            # Atualiza as estatísticas que o planejador usa para escolher os índices
+            self._conexao.execute('PRAGMA optimize')
+
+    def carregar(self, id_cenario):
+        """Cenário completo (entradas e resultados decodificados) ou None"""
+        with self._trava:
+            linha = self._conexao.execute(
+                'SELECT id, candidato_id, nome, criado_em, tabela_identificador, entradas, resultados '
+                'FROM cenarios WHERE id = ?', (id_cenario,)
+            ).fetchone()
+        if linha is None:
+            return None
+        id_cenario, candidato_id, nome, criado_em, tabela_identificador, entradas, resultados = linha
+        return {
+            'id': id_cenario, 'candidato_id': candidato_id, 'nome': nome, 'criado_em': criado_em,
+            'tabela_identificador': tabela_identificador,
+            'entradas': json.loads(entradas), 'resultados': json.loads(resultados)
+        }
+
+    def buscar(self, candidato_id=None, modalidade=None, salario_minimo=None, salario_maximo=None,
+               desde=None, ate=None, limite=100):
+        """Resumo dos cenários que atendem aos filtros, mais recentes primeiro
+
+        Todos os filtros são opcionais e combinados com E; `desde`/`ate` são
+        timestamps (segundos desde a época).
+        """
+        condicoes = []
+        parametros = []
+        for coluna, operador, valor in (
+            ('candidato_id', '=', candidato_id), ('modalidade', '=', modalidade),
+            ('salario_atual', '>=', salario_minimo), ('salario_atual', '<=', salario_maximo),
+            ('criado_em', '>=', desde), ('criado_em', '<=', ate)
+        ):
+            if valor is not None:
+                condicoes.append(f'{coluna} {operador} ?')
+                parametros.append(valor)
+        filtro = (' WHERE ' + ' AND '.join(condicoes)) if condicoes else ''
+
+        with self._trava:
+            indice = ''
+            if candidato_id is None and (salario_minimo is not None or salario_maximo is not None):
+                # O planejador não sabe a largura da faixa (vem por parâmetro): conta até o limite para decidir
+                amostra = self._conexao.execute(
+                    f'SELECT COUNT(*) FROM (SELECT 1 FROM cenarios{filtro} LIMIT ?)',
+                    parametros + [LIMITE_FAIXA_ESTREITA]
+                ).fetchone()[0]
+                if amostra >= LIMITE_FAIXA_ESTREITA:
+                    indice = ' INDEXED BY idx_cenarios_criado_em'
+                elif modalidade is not None:
+                    indice = ' INDEXED BY idx_cenarios_modalidade_salario'
+                else:
+                    indice = ' INDEXED BY idx_cenarios_salario'
+            # Ids escolhidos só pelos índices; as linhas são lidas apenas para os `limite` resultados
+            linhas = self._conexao.execute(
+                f'SELECT {", ".join(COLUNAS_RESUMO)} FROM cenarios WHERE id IN ('
+                f'SELECT id FROM cenarios{indice}{filtro} ORDER BY criado_em DESC LIMIT ?'
+                f') ORDER BY criado_em DESC',
+                parametros + [int(limite)]
+            ).fetchall()
+        return [dict(zip(COLUNAS_RESUMO, linha)) for linha in linhas]
+
+    def contar(self):
+        with self._trava:
+            return self._conexao.execute('SELECT COUNT(*) FROM cenarios').fetchone()[0]
+
+    def excluir(self, id_cenario):
+        with self._trava, self._conexao:
+            return self._conexao.execute('DELETE FROM cenarios WHERE id = ?', (id_cenario,)).rowcount > 0
+
+    def fechar(self):
+        with self._trava:
+            self._conexao.close()
+
+
+_armazem = None
+_trava_armazem = threading.Lock()
+
+
+def armazem_padrao():
+    """Armazém do processo (criado no primeiro uso, no arquivo padrão ou em CALCULADORA_CENARIOS_DB)"""
+    global _armazem
+    with _trava_armazem:
+        if _armazem is None:
+            _armazem = ArmazemCenarios()
+        return _armazem
@@ -0,0 +1,253 @@
+"""Benchmarks do motor de cálculo e do dashboard, com histórico e limite de regressão.
+
+Mede:
+- escalar: calcular_impostos_clt, comparar_clt_pj e calcular_faixa_recomendada (1 linha e 1k linhas em loop);
+- lote: as versões vetorizadas com 1, 1k e 1M linhas;
+- gráficos: render do painel do dashboard sem cache;
+- ponta a ponta: um script run do app com o dashboard (streamlit.testing), se o streamlit estiver instalado.
+
+Cada execução é gravada como uma linha JSON no histórico. Com uma baseline
+salva, qualquer métrica mais lenta que baseline x (1 + limite) faz o
+comando sair com erro.
+
+Uso:
+    python benchmarks.py                      # mede, grava no histórico e compara com a baseline
+    python benchmarks.py --salvar-baseline    # mede e grava a medição como nova baseline
+    python benchmarks.py --rapido             # sem 1M linhas e sem o script run do app
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+DIRETORIO_RESULTADOS = os.path.join(DIRETORIO, 'resultados_benchmark')
+HISTORICO_PADRAO = os.path.join(DIRETORIO_RESULTADOS, 'historico.jsonl')
+BASELINE_PADRAO = os.path.join(DIRETORIO_RESULTADOS, 'baseline.json')
+
+LIMITE_PADRAO = 0.20  # 20% mais lento que a baseline = regressão
+# Métricas mais ruidosas toleram mais variação: multiplicam o limite (0.20 → 0.35)
+FATORES_LIMITE_POR_METRICA = {
+    'graficos.render_dashboard': 1.75,
+    'app.script_run_dashboard': 1.75,
+}
+TEMPO_MINIMO_S = 0.2  # Repete cada medição até somar pelo menos isso
+REPETICOES = 5
+
+FATORES_EXEMPLO = {
+    'salario_atual': 8000.0, 'beneficios_atual': 900.0, 'bonus_atual': 12000.0, 'custo_vida_nova': 0.05,
+    'tempo_viagem_atual': 1.5, 'tempo_viagem_novo': 0.5, 'dias_presencial_novo': 3, 'crescimento_carreira': 7,
+    'estabilidade': 6, 'beneficios_qualidade': 8, 'cultura_empresa_nova': 7, 'inovacao_tecnologia_nova': 8,
+    'modalidade': 'CLT'
+}
+
+
+def medir(funcao):
+    """Segundos por chamada: melhor de REPETICOES rodadas de N chamadas (N ajustado ao TEMPO_MINIMO_S)"""
+    chamadas = 1
+    while True:
+        inicio = time.perf_counter()
+        for _ in range(chamadas):
+            funcao()
+        duracao = time.perf_counter() - inicio
+        if duracao >= TEMPO_MINIMO_S or chamadas >= 1_000_000:
+            break
+        chamadas *= 10 if duracao < TEMPO_MINIMO_S / 10 else 2
+
+    melhores = [duracao]
+    for _ in range(REPETICOES - 1):
+        inicio = time.perf_counter()
+        for _ in range(chamadas):
+            funcao()
+        melhores.append(time.perf_counter() - inicio)
+    return min(melhores) / chamadas
+
+
+def _colunas_exemplo(n):
+    import numpy as np
+    gerador = np.random.default_rng(0)
+    fatores = {chave: np.full(n, float(valor)) for chave, valor in FATORES_EXEMPLO.items() if chave != 'modalidade'}
+    fatores['salario_atual'] = gerador.uniform(2000, 30000, n)
+    fatores['dias_presencial_novo'] = gerador.integers(0, 6, n).astype(float)
+    fatores['modalidade'] = np.where(gerador.random(n) < 0.5, 'CLT', 'PJ').astype(object)
+
+    import nucleo_calculo as nucleo
+    valores_pessoais = {chave: np.full(n, float(valor)) for chave, valor in nucleo.VALORES_PESSOAIS_PADRAO.items()}
+    valores_pessoais['prioridade_1'] = np.full(n, 'Estabilidade Financeira', dtype=object)
+    return fatores, valores_pessoais
+
+
+def benchmarks_escalares():
+    import nucleo_calculo as nucleo
+    valores_pessoais = dict(nucleo.VALORES_PESSOAIS_PADRAO, prioridade_1='Estabilidade Financeira')
+    salarios = [2000 + 28 * i for i in range(1000)]
+
+    def loop_faixa():
+        for salario in salarios:
+            nucleo.calcular_faixa_recomendada(dict(FATORES_EXEMPLO, salario_atual=salario), valores_pessoais)
+
+    return {
+        'escalar.calcular_impostos_clt': lambda: nucleo.calcular_impostos_clt(8500.0),
+        'escalar.comparar_clt_pj': lambda: nucleo.comparar_clt_pj(8500.0, 11000.0),
+        'escalar.calcular_faixa_recomendada': lambda: nucleo.calcular_faixa_recomendada(FATORES_EXEMPLO, valores_pessoais),
+        'escalar.calcular_impostos_clt_1k': lambda: [nucleo.calcular_impostos_clt(s) for s in salarios],
+        'escalar.calcular_faixa_recomendada_1k': loop_faixa,
+    }
+
+
+def benchmarks_lote(tamanhos):
+    import motor_vetorizado as motor
+    casos = {}
+    for n in tamanhos:
+        rotulo = {1: '1', 1_000: '1k', 1_000_000: '1M'}.get(n, str(n))
+        fatores, valores_pessoais = _colunas_exemplo(n)
+        salarios = fatores['salario_atual']
+        casos[f'lote.calcular_impostos_clt_{rotulo}'] = (lambda s=salarios: motor.calcular_impostos_clt_vetorizado(s))
+        casos[f'lote.comparar_clt_pj_{rotulo}'] = (lambda s=salarios: motor.comparar_clt_pj_vetorizado(s, s * 1.3))
+        casos[f'lote.calcular_faixa_recomendada_{rotulo}'] = (
+            lambda f=fatores, v=valores_pessoais: motor.calcular_faixa_recomendada_vetorizado(f, v)
+        )
+    return casos
+
+
+def benchmarks_graficos():
+    import graficos
+    import nucleo_calculo as nucleo
+    valores_pessoais = dict(nucleo.VALORES_PESSOAIS_PADRAO)
+    faixa = nucleo.calcular_faixa_recomendada(FATORES_EXEMPLO, valores_pessoais)
+    dados = graficos.dados_graficos_dashboard(
+        faixa, FATORES_EXEMPLO['salario_atual'] + FATORES_EXEMPLO['beneficios_atual'], FATORES_EXEMPLO,
+        nucleo.calcular_comparacao_modalidade(FATORES_EXEMPLO, faixa),
+        nucleo.calcular_compatibilidade_valores(FATORES_EXEMPLO, valores_pessoais)
+    )
+    # Render direto, sem passar pelo cache de PNGs
+    return {'graficos.render_dashboard': lambda: graficos.renderizar_graficos_dashboard(dados)}
+
+
+def benchmarks_app():
+    """Script run completo do app: entradas preenchidas + clique em 'Calcular Análise Completa'"""
+    try:
+        from streamlit.testing.v1 import AppTest
+    except ImportError:
+        print("  ℹ️ streamlit não instalado: script run do app ignorado")
+        return {}
+    import graficos
+    from cache_resultados import cache_dashboard
+
+    def script_run():
+        # Caches frios: mede cálculo e render dos gráficos, não só acertos de cache
+        cache_dashboard.limpar()
+        graficos.cache_graficos.limpar()
+        app = AppTest.from_file(os.path.join(DIRETORIO, 'app_completo.py'), default_timeout=60)
+        app.session_state['fatores'] = dict(FATORES_EXEMPLO)
+        app.run()
+        next(botao for botao in app.button if 'Calcular Análise Completa' in botao.label).click().run()
+        if app.exception:
+            raise RuntimeError(app.exception[0].value)
+
+    return {'app.script_run_dashboard': script_run}
+
+
+def executar(rapido=False, filtro=None):
+    casos = {}
+    casos.update(benchmarks_escalares())
+    casos.update(benchmarks_lote((1, 1_000) if rapido else (1, 1_000, 1_000_000)))
+    casos.update(benchmarks_graficos())
+    if not rapido:
+        casos.update(benchmarks_app())
+
+    metricas = {}
+    for nome, funcao in casos.items():
+        if filtro and filtro not in nome:
+            continue
+        metricas[nome] = medir(funcao)
+        print(f"  {nome:<45} {_formatar(metricas[nome])}")
+    return metricas
+
+
+def _formatar(segundos):
+    for unidade, fator in (('s', 1), ('ms', 1e-3), ('µs', 1e-6)):
+        if segundos >= fator:
+            return f"{segundos / fator:8.2f} {unidade}"
+    return f"{segundos / 1e-9:8.2f} ns"
+
+
+def _commit_atual():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, cwd=DIRETORIO, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar_com_baseline(metricas, baseline, limite=LIMITE_PADRAO):
+    """Lista de (métrica, atual, baseline, variação) que passaram do limite
+
+    O limite das métricas ruidosas é proporcional a `limite`, então `--limite`
+    aperta ou afrouxa todas juntas.
+    """
+    regressoes = []
+    for nome, atual in metricas.items():
+        referencia = baseline.get(nome)
+        if not referencia:
+            continue
+        variacao = atual / referencia - 1
+        if variacao > limite * FATORES_LIMITE_POR_METRICA.get(nome, 1.0):
+            regressoes.append((nome, atual, referencia, variacao))
+    return regressoes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks do motor de cálculo e do dashboard")
+    parser.add_argument('--historico', default=HISTORICO_PADRAO)
+    parser.add_argument('--baseline', default=BASELINE_PADRAO)
+    parser.add_argument('--salvar-baseline', action='store_true', help="Grava esta medição como baseline")
+    parser.add_argument('--limite', type=float, default=LIMITE_PADRAO,
+                        help=f"Regressão tolerada (fração; padrão {LIMITE_PADRAO})")
+    parser.add_argument('--rapido', action='store_true', help="Pula 1M linhas e o script run do app")
+    parser.add_argument('--filtro', help="Só métricas cujo nome contém este texto")
+    args = parser.parse_args(argv)
+
+    sys.path.insert(0, DIRETORIO)
+    print("⏱️ Executando benchmarks...")
+    metricas = executar(args.rapido, args.filtro)
+
+    registro = {
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'commit': _commit_atual(),
+        'python': platform.python_version(),
+        'maquina': platform.machine(),
+        'metricas': metricas
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.historico)), exist_ok=True)
+    with open(args.historico, 'a', encoding='utf-8') as arquivo:
+        arquivo.write(json.dumps(registro, ensure_ascii=False) + '\n')
+
+    if args.salvar_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as arquivo:
+            json.dump(registro, arquivo, indent=2, ensure_ascii=False)
+        print(f"💾 Baseline salva em {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("ℹ️ Sem baseline para comparar (use --salvar-baseline)")
+        return 0
+
+    with open(args.baseline, encoding='utf-8') as arquivo:
+        baseline = json.load(arquivo)['metricas']
+    regressoes = comparar_com_baseline(metricas, baseline, args.limite)
+    if regressoes:
+        for nome, atual, referencia, variacao in regressoes:
+            print(f"❌ {nome}: {_formatar(atual)} vs {_formatar(referencia)} na baseline (+{variacao * 100:.0f}%)")
+        return 1
+    print("✅ Nenhuma regressão acima do limite")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,97 @@
+"""Cache de resultados compartilhado entre sessões do app.
+
+A chave é `cenario.Cenario.chave()`: um hash canônico das entradas (`fatores` +
+`valores_pessoais`) e da versão das tabelas de impostos; o valor é o payload
+completo do dashboard. Sessões diferentes com as mesmas entradas (o caso
+comum: valores padrão) reaproveitam o mesmo cálculo.
+"""
+import copy
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+
+TAMANHO_MAXIMO_PADRAO = 1024
+
+
+def congelar(valor):
+    """Versão somente leitura de `valor`: dicionários viram mappingproxy, listas viram tuplas
+    e arrays numpy perdem a permissão de escrita (sem cópia dos dados)"""
+    if isinstance(valor, (dict, MappingProxyType)):
+        return MappingProxyType({chave: congelar(v) for chave, v in valor.items()})
+    if isinstance(valor, (list, tuple)):
+        return tuple(congelar(v) for v in valor)
+    if hasattr(valor, 'setflags'):
+        valor.setflags(write=False)
+    return valor
+
+
+class CacheLRU:
+    """Cache LRU limitado por número de entradas, seguro para várias threads
+
+    Com `copiar=True` cada leitura e gravação faz um deepcopy; com `copiar=False` os
+    valores são congelados (`congelar`) ao serem guardados e compartilhados sem cópia.
+    """
+
+    def __init__(self, tamanho_maximo=TAMANHO_MAXIMO_PADRAO, copiar=True):
+        self.tamanho_maximo = tamanho_maximo
+        self.copiar = copiar
+        self._itens = OrderedDict()
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    def obter(self, chave):
+        """Retorna o valor guardado (uma cópia, se `copiar`) ou None"""
+        with self._trava:
+            if chave not in self._itens:
+                self.falhas += 1
+                return None
+            self._itens.move_to_end(chave)
+            self.acertos += 1
+            valor = self._itens[chave]
+        # Cópia para que uma sessão não altere o resultado visto pelas outras
+        return copy.deepcopy(valor) if self.copiar else valor
+
+    def guardar(self, chave, valor):
+        """Guarda o valor; retorna o que ficou no cache (a cópia ou a versão congelada)"""
+        valor = copy.deepcopy(valor) if self.copiar else congelar(valor)
+        with self._trava:
+            self._itens[chave] = valor
+            self._itens.move_to_end(chave)
+            while len(self._itens) > self.tamanho_maximo:
+                self._itens.popitem(last=False)
+        return valor
+
+    def obter_ou_calcular(self, chave, calcular):
+        """Retorna o valor da chave, calculando e guardando em caso de falha"""
+        valor = self.obter(chave)
+        if valor is None:
+            valor = calcular()
+            guardado = self.guardar(chave, valor)
+            if not self.copiar:
+                valor = guardado
+        return valor
+
+    def estatisticas(self):
+        with self._trava:
+            consultas = self.acertos + self.falhas
+            return {
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'taxa_acerto': self.acertos / consultas if consultas else 0.0,
+                'itens': len(self._itens),
+                'tamanho_maximo': self.tamanho_maximo
+            }
+
+    def limpar(self):
+        with self._trava:
+            self._itens.clear()
+            self.acertos = 0
+            self.falhas = 0
+
+
+# Instância única por processo: o Streamlit reexecuta o script, mas módulos importados persistem
+cache_dashboard = CacheLRU()
+# Dados pesados de cada seção do dashboard (simulação, mapa de calor), calculados sob demanda;
+# congelados em vez de copiados, pois uma grade 200×200 custaria um deepcopy a cada leitura
+cache_secoes = CacheLRU(tamanho_maximo=256, copiar=False)
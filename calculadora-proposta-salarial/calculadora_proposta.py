@@ -1,9 +1,15 @@
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
 import streamlit as st
+from tabelas_impostos import registro_tabelas
+
+
+def _pyplot():
+    """Importa matplotlib (backend Agg) apenas quando um gráfico é renderizado"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
 
 class CalculadoraPropostaCompleta:
     def __init__(self):
@@ -68,7 +74,7 @@ class CalculadoraPropostaCompleta:
                 "Tempo de deslocamento diário (horas)", 
                 0.0, 4.0, 
                 value=float(self.fatores.get('tempo_viagem_atual', 1.5)), 
-                0.5,
+                step=0.5,
                 key="tempo_viagem_atual_input"
             )
     
@@ -83,7 +89,7 @@ class CalculadoraPropostaCompleta:
                 "Variação no custo de vida (%)", 
                 -50.0, 100.0, 
                 value=float(self.fatores.get('custo_vida_nova', 10.0) * 100), 
-                5.0,
+                step=5.0,
                 key="custo_vida_input"
             )
             self.fatores['custo_vida_nova'] = custo_vida_temp / 100
@@ -99,7 +105,7 @@ class CalculadoraPropostaCompleta:
                 "Tempo de deslocamento novo (horas/dia)", 
                 0.0, 4.0, 
                 value=float(self.fatores.get('tempo_viagem_novo', 0.5)), 
-                0.5,
+                step=0.5,
                 key="tempo_viagem_novo_input"
             )
             
@@ -133,20 +139,10 @@ class CalculadoraPropostaCompleta:
             )
     
     def calcular_impostos_clt(self, salario_bruto):
-        """Calcula impostos CLT conforme legislação 2024"""
-        # INSS 2024 - Faixas atualizadas
-        if salario_bruto <= 1412.00:
-            inss = salario_bruto * 0.075
-        elif salario_bruto <= 2666.68:
-            inss = (1412.00 * 0.075) + ((salario_bruto - 1412.00) * 0.09)
-        elif salario_bruto <= 4000.03:
-            inss = (1412.00 * 0.075) + ((2666.68 - 1412.00) * 0.09) + ((salario_bruto - 2666.68) * 0.12)
-        elif salario_bruto <= 7786.02:
-            inss = (1412.00 * 0.075) + ((2666.68 - 1412.00) * 0.09) + ((4000.03 - 2666.68) * 0.12) + ((salario_bruto - 4000.03) * 0.14)
-        else:
-            inss = 908.85  # Teto do INSS
+        """Calcula impostos CLT pela tabela vigente (tabelas/<ano>.json)"""
+        tabela = registro_tabelas.obter()
+        inss = tabela.calcular_inss(salario_bruto)
         
-        # IRRF 2024 - Faixas atualizadas
         base_irrf = salario_bruto - inss
         
         # Dedução por dependente (R$ 189,59 por dependente)
@@ -154,19 +150,7 @@ class CalculadoraPropostaCompleta:
         
         base_irrf_calculada = base_irrf - deducao_dependente
         
-        if base_irrf_calculada <= 2259.20:
-            irrf = 0
-        elif base_irrf_calculada <= 2826.65:
-            irrf = (base_irrf_calculada * 0.075) - 169.44
-        elif base_irrf_calculada <= 3751.05:
-            irrf = (base_irrf_calculada * 0.15) - 381.44
-        elif base_irrf_calculada <= 4664.68:
-            irrf = (base_irrf_calculada * 0.225) - 662.77
-        else:
-            irrf = (base_irrf_calculada * 0.275) - 896.00
-        
-        # Garantir que IRRF não seja negativo
-        irrf = max(0, irrf)
+        irrf = tabela.calcular_irrf(base_irrf_calculada)
         
         salario_liquido = salario_bruto - inss - irrf
         
@@ -189,18 +173,7 @@ class CalculadoraPropostaCompleta:
             # Anexo III - Serviços
             faturamento_anual = faturamento_restante * 12
             
-            if faturamento_anual <= 180000:
-                aliquota_simples = 0.06  # 6% aproximadamente para serviços
-            elif faturamento_anual <= 360000:
-                aliquota_simples = 0.112
-            elif faturamento_anual <= 720000:
-                aliquota_simples = 0.135
-            elif faturamento_anual <= 1800000:
-                aliquota_simples = 0.16
-            elif faturamento_anual <= 3600000:
-                aliquota_simples = 0.21
-            else:
-                aliquota_simples = 0.33
+            aliquota_simples = registro_tabelas.obter().aliquota_simples(faturamento_anual)
             
             imposto_simples = faturamento_restante * aliquota_simples
             
@@ -511,6 +484,7 @@ class CalculadoraPropostaCompleta:
         st.subheader("📊 Análise Visual")
         
         try:
+            plt = _pyplot()
             fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
             
             # Gráfico 1: Comparação de valores
@@ -0,0 +1,147 @@
+"""Gerador de carga local para o serviço HTTP (servico_http.py).
+
+Abre N conexões keep-alive simultâneas, cada uma enviando requisições em
+sequência pelo tempo pedido, e mede vazão e latência (p50/p95/p99).
+Sem `--url`, sobe o serviço no próprio processo numa porta livre.
+
+Meta do serviço (README): com 64 conexões em /faixa, pelo menos
+META_REQUISICOES_POR_SEGUNDO req/s com p95 abaixo de META_P95_MS ms.
+
+Uso:
+    python carga_servico.py --conexoes 64 --segundos 10 --endpoint /faixa
+"""
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+
+META_REQUISICOES_POR_SEGUNDO = 2000
+META_P95_MS = 50.0
+
+
+def _corpo(endpoint, gerador):
+    """Corpo aleatório e válido para o endpoint"""
+    if endpoint in ('/faixa', '/compatibilidade'):
+        return {
+            'fatores': {
+                'salario_atual': gerador.uniform(3000, 30000),
+                'beneficios_atual': gerador.uniform(0, 3000),
+                'bonus_atual': gerador.uniform(0, 50000),
+                'custo_vida_nova': gerador.uniform(-0.2, 0.5),
+                'tempo_viagem_atual': gerador.choice([0.5, 1.0, 1.5, 2.0]),
+                'tempo_viagem_novo': gerador.choice([0.0, 0.5, 1.0, 1.5]),
+                'dias_presencial_novo': gerador.randint(0, 5),
+                'crescimento_carreira': gerador.randint(1, 10),
+                'estabilidade': gerador.randint(1, 10),
+                'beneficios_qualidade': gerador.randint(1, 10),
+                'cultura_empresa_nova': gerador.randint(1, 10),
+                'inovacao_tecnologia_nova': gerador.randint(1, 10)
+            },
+            'valores_pessoais': {'flexibilidade_tempo': gerador.randint(1, 10)}
+        }
+    if endpoint == '/comparacao':
+        valor = gerador.uniform(2000, 40000)
+        return {'valor_clt': valor, 'valor_pj': valor * 1.2}
+    return {'liquido': gerador.uniform(1500, 30000), 'modalidade': gerador.choice(['CLT', 'PJ'])}
+
+
+async def _cliente(host, porta, endpoint, fim, latencias, erros, semente):
+    gerador = random.Random(semente)
+    leitor, escritor = await asyncio.open_connection(host, porta)
+    try:
+        while time.perf_counter() < fim:
+            corpo = json.dumps(_corpo(endpoint, gerador)).encode('utf-8')
+            inicio = time.perf_counter()
+            escritor.write(
+                f"POST {endpoint} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                f"Content-Length: {len(corpo)}\r\n\r\n".encode('latin-1') + corpo
+            )
+            await escritor.drain()
+
+            status = int((await leitor.readline()).split()[1])
+            tamanho = 0
+            while True:
+                linha = await leitor.readline()
+                if linha in (b'\r\n', b''):
+                    break
+                nome, _, valor = linha.decode('latin-1').partition(':')
+                if nome.lower() == 'content-length':
+                    tamanho = int(valor)
+            await leitor.readexactly(tamanho)
+
+            latencias.append(time.perf_counter() - inicio)
+            if status != 200:
+                erros.append(status)
+    finally:
+        escritor.close()
+
+
+def _percentil(valores, p):
+    ordenados = sorted(valores)
+    return ordenados[min(int(len(ordenados) * p / 100), len(ordenados) - 1)] if ordenados else 0.0
+
+
+async def executar_carga(host, porta, endpoint='/faixa', conexoes=64, segundos=10.0):
+    """Dispara a carga e retorna vazão, latências (ms) e contagem de erros"""
+    latencias = []
+    erros = []
+    inicio = time.perf_counter()
+    fim = inicio + segundos
+    await asyncio.gather(*(
+        _cliente(host, porta, endpoint, fim, latencias, erros, semente) for semente in range(conexoes)
+    ))
+    duracao = time.perf_counter() - inicio
+    return {
+        'endpoint': endpoint,
+        'conexoes': conexoes,
+        'requisicoes': len(latencias),
+        'erros': len(erros),
+        'requisicoes_por_segundo': len(latencias) / duracao,
+        'p50_ms': _percentil(latencias, 50) * 1000,
+        'p95_ms': _percentil(latencias, 95) * 1000,
+        'p99_ms': _percentil(latencias, 99) * 1000
+    }
+
+
+async def _executar(args):
+    if args.url:
+        host, _, porta = args.url.replace('http://', '').rstrip('/').partition(':')
+        return await executar_carga(host, int(porta or 80), args.endpoint, args.conexoes, args.segundos)
+
+    from servico_http import ServicoCalculadora
+    servico = ServicoCalculadora(args.janela_ms)
+    servidor = await servico.iniciar('127.0.0.1', 0)
+    porta = servidor.sockets[0].getsockname()[1]
+    async with servidor:
+        resultado = await executar_carga('127.0.0.1', porta, args.endpoint, args.conexoes, args.segundos)
+    loteador = servico.loteadores[args.endpoint]
+    resultado['tamanho_medio_lote'] = loteador.requisicoes / loteador.lotes if loteador.lotes else 0.0
+    return resultado
+
+
+def main(argv=None):
+    from servico_http import JANELA_LOTE_MS, ENDPOINTS
+    parser = argparse.ArgumentParser(description="Gerador de carga para o serviço HTTP da calculadora")
+    parser.add_argument('--url', help="Serviço já em execução (ex.: http://127.0.0.1:8765); padrão: sobe um local")
+    parser.add_argument('--endpoint', default='/faixa', choices=sorted(ENDPOINTS))
+    parser.add_argument('--conexoes', type=int, default=64)
+    parser.add_argument('--segundos', type=float, default=10.0)
+    parser.add_argument('--janela-ms', type=float, default=JANELA_LOTE_MS)
+    args = parser.parse_args(argv)
+
+    resultado = asyncio.run(_executar(args))
+    print(json.dumps(resultado, indent=2, ensure_ascii=False))
+
+    dentro_da_meta = (
+        resultado['erros'] == 0
+        and resultado['requisicoes_por_segundo'] >= META_REQUISICOES_POR_SEGUNDO
+        and resultado['p95_ms'] <= META_P95_MS
+    )
+    print(f"{'✅' if dentro_da_meta else '❌'} Meta: ≥ {META_REQUISICOES_POR_SEGUNDO} req/s com p95 ≤ {META_P95_MS:.0f} ms")
+    return 0 if dentro_da_meta else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
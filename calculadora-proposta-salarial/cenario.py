@@ -0,0 +1,233 @@
+"""Representação compacta e imutável de um cenário (fatores + valores pessoais).
+
+`Cenario` é uma dataclass congelada com `__slots__`: um objeto por sessão
+ocupa uma fração dos dois dicionários que o app mantém, pode ser usado como
+chave de dicionário e tem uma chave estável (`chave()`), igual entre
+processos, para os caches. Os valores pessoais usam o prefixo `valor_`, como
+nas colunas do processamento em lote, pois alguns nomes coincidem com as
+avaliações da empresa (ex.: `crescimento_carreira`).
+
+`LoteCenarios` é a versão em colunas para lotes grandes: um array numpy por
+campo numérico (int8 nas notas e dias) e códigos int8 para os textos. As
+chaves de uma linha do lote e do `Cenario` equivalente são iguais.
+"""
+import hashlib
+import json
+import struct
+from dataclasses import dataclass, fields
+
+from nucleo_calculo import VALORES_PESSOAIS_PADRAO
+
+PREFIXO_VALOR_PESSOAL = 'valor_'
+
+
+@dataclass(frozen=True, slots=True)
+class Cenario:
+    """Entradas de um cálculo; os padrões são os valores iniciais dos campos do app"""
+    # Situação atual
+    salario_atual: float = 5000.0
+    beneficios_atual: float = 1100.0
+    bonus_atual: float = 5000.0
+    ferias_atual: int = 30
+    home_office_atual: int = 2
+    tempo_viagem_atual: float = 1.5
+    # Nova oportunidade
+    custo_vida_nova: float = 0.10
+    dias_presencial_novo: int = 3
+    tempo_viagem_novo: float = 0.5
+    custo_transporte_novo: float = 200.0
+    crescimento_carreira: int = 7
+    estabilidade: int = 6
+    beneficios_qualidade: int = 7
+    cultura_empresa_nova: int = 7
+    inovacao_tecnologia_nova: int = 7
+    modalidade: str = 'CLT'
+    # Valores pessoais (1-10)
+    valor_estabilidade_financeira: int = 5
+    valor_flexibilidade_tempo: int = 5
+    valor_crescimento_carreira: int = 5
+    valor_equilibrio_vida_pessoal: int = 5
+    valor_impacto_social: int = 3
+    valor_inovacao_tecnologia: int = 5
+    valor_cultura_empresa: int = 5
+    valor_aprendizado_continuo: int = 5
+    valor_reconhecimento: int = 5
+    valor_autonomia: int = 5
+    valor_seguranca_juridica: int = 5
+    valor_beneficios_nao_monetarios: int = 5
+    prioridade_1: str = ''
+    prioridade_2: str = ''
+    prioridade_3: str = ''
+
+    @classmethod
+    def de_dicionarios(cls, fatores, valores_pessoais):
+        """Cria o cenário a partir dos dicionários do app; chaves ausentes ficam com o padrão
+
+        Campos inteiros (notas, dias) com parte decimal geram ValueError em vez de serem truncados.
+        """
+        argumentos = {}
+        for nome, tipo in TIPOS.items():
+            chave = nome[len(PREFIXO_VALOR_PESSOAL):] if nome.startswith(PREFIXO_VALOR_PESSOAL) else nome
+            origem = valores_pessoais if nome in CAMPOS_VALORES_PESSOAIS else fatores
+            valor = origem.get(chave)
+            if valor is not None:
+                argumentos[nome] = _inteiro(nome, valor) if tipo is int else tipo(valor)
+        return cls(**argumentos)
+
+    def fatores(self):
+        return {nome: getattr(self, nome) for nome in CAMPOS_FATORES}
+
+    def valores_pessoais(self):
+        return {nome[len(PREFIXO_VALOR_PESSOAL):] if nome.startswith(PREFIXO_VALOR_PESSOAL) else nome: getattr(self, nome)
+                for nome in CAMPOS_VALORES_PESSOAIS}
+
+    def importancias(self):
+        """Os 12 valores pessoais como (chave, nota), sem as prioridades"""
+        return [(nome[len(PREFIXO_VALOR_PESSOAL):], getattr(self, nome)) for nome in CAMPOS_IMPORTANCIAS]
+
+    def chave(self, *extras):
+        """Hash estável (igual entre processos e execuções) do cenário e de `extras` (ex.: versão das tabelas)
+
+        Os extras são normalizados como os campos: 5, 5.0 e numpy.float64(5) geram a mesma chave.
+        """
+        return _chave(
+            _EMPACOTADOR.pack(*[getattr(self, nome) for nome in CAMPOS_NUMERICOS]),
+            [getattr(self, nome) for nome in CAMPOS_TEXTO], extras
+        )
+
+
+TIPOS = {campo.name: campo.type for campo in fields(Cenario)}
+CAMPOS_IMPORTANCIAS = tuple(PREFIXO_VALOR_PESSOAL + chave for chave in VALORES_PESSOAIS_PADRAO)
+CAMPOS_VALORES_PESSOAIS = CAMPOS_IMPORTANCIAS + ('prioridade_1', 'prioridade_2', 'prioridade_3')
+CAMPOS_FATORES = tuple(nome for nome in TIPOS if nome not in CAMPOS_VALORES_PESSOAIS)
+CAMPOS_NUMERICOS = tuple(nome for nome, tipo in TIPOS.items() if tipo is not str)
+CAMPOS_TEXTO = tuple(nome for nome, tipo in TIPOS.items() if tipo is str)
+# Todos os números como float64 little-endian: 5 e 5.0 geram a mesma chave
+_EMPACOTADOR = struct.Struct('<' + 'd' * len(CAMPOS_NUMERICOS))
+
+
+def _inteiro(nome, valor):
+    """Converte para int sem truncar: 7.0 vira 7, 7.5 é recusado"""
+    numero = float(valor)
+    if not numero.is_integer():
+        raise ValueError(f"{nome} deve ser um número inteiro, recebido {valor!r}")
+    return int(numero)
+
+
+def _canonizar(valor):
+    """Normaliza valores para que 5, 5.0 e numpy.float64(5) gerem a mesma chave"""
+    if isinstance(valor, bool) or valor is None or isinstance(valor, str):
+        return valor
+    if isinstance(valor, dict):
+        return {str(chave): _canonizar(v) for chave, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_canonizar(v) for v in valor]
+    try:
+        return float(valor)
+    except (TypeError, ValueError):
+        return str(valor)
+
+
+def _chave(numeros, textos, extras):
+    resumo = hashlib.blake2b(numeros, digest_size=16)
+    # Extras passam pela mesma normalização dos campos: [5] e [5.0] dão a mesma chave
+    extras = json.dumps(_canonizar(extras), sort_keys=True, separators=(',', ':'), ensure_ascii=False)
+    resumo.update('\x1f'.join([*textos, extras]).encode('utf-8'))
+    return resumo.hexdigest()
+
+
+# Campos inteiros ficam em int8 no lote: valores fora da faixa seriam corrompidos no cast
+_LIMITES_INT8 = (-128, 127)
+
+
+class LoteCenarios:
+    """Muitos cenários em colunas: um array por campo numérico e códigos para os textos"""
+
+    __slots__ = ('colunas', 'categorias')
+
+    def __init__(self, colunas, categorias):
+        self.colunas = colunas
+        self.categorias = categorias
+
+    @classmethod
+    def de_colunas(cls, fatores, valores_pessoais):
+        """Cria o lote a partir de dicionários de colunas (formato do motor vetorizado)
+
+        Colunas ausentes são preenchidas com o padrão de `Cenario`; campos inteiros com
+        casas decimais ou fora da faixa do int8 geram ValueError.
+        """
+        import numpy as np
+
+        n = len(next(iter(fatores.values())))
+        padrao = Cenario()
+        colunas = {}
+        categorias = {}
+        for nome, tipo in TIPOS.items():
+            chave = nome[len(PREFIXO_VALOR_PESSOAL):] if nome.startswith(PREFIXO_VALOR_PESSOAL) else nome
+            origem = valores_pessoais if nome in CAMPOS_VALORES_PESSOAIS else fatores
+            valores = origem.get(chave)
+            if tipo is str:
+                textos = np.full(n, getattr(padrao, nome), dtype=object) if valores is None else np.asarray(valores)
+                nomes, codigos = np.unique(textos.astype(str), return_inverse=True)
+                categorias[nome] = nomes.tolist()
+                colunas[nome] = codigos.astype(np.int8 if len(nomes) <= 127 else np.int32)
+            else:
+                dtype = np.int8 if tipo is int else np.float64
+                if valores is None:
+                    colunas[nome] = np.full(n, getattr(padrao, nome), dtype=dtype)
+                    continue
+                valores = np.asarray(valores)
+                if tipo is int and not np.array_equal(valores, np.round(valores)):
+                    raise ValueError(f"{nome} deve conter só números inteiros")
+                minimo, maximo = _LIMITES_INT8
+                if tipo is int and valores.size and (valores.min() < minimo or valores.max() > maximo):
+                    raise ValueError(f"{nome} deve ficar entre {minimo} e {maximo}")
+                colunas[nome] = valores.astype(dtype)
+        return cls(colunas, categorias)
+
+    @classmethod
+    def de_cenarios(cls, cenarios):
+        fatores = {nome: [getattr(c, nome) for c in cenarios] for nome in CAMPOS_FATORES}
+        valores_pessoais = {
+            nome[len(PREFIXO_VALOR_PESSOAL):] if nome.startswith(PREFIXO_VALOR_PESSOAL) else nome:
+                [getattr(c, nome) for c in cenarios]
+            for nome in CAMPOS_VALORES_PESSOAIS
+        }
+        return cls.de_colunas(fatores, valores_pessoais)
+
+    def __len__(self):
+        return len(self.colunas['salario_atual'])
+
+    def _coluna(self, nome):
+        """Coluna no formato do motor: float64 para números, texto (object) para categorias"""
+        import numpy as np
+        if nome in self.categorias:
+            return np.asarray(self.categorias[nome], dtype=object)[self.colunas[nome]]
+        return self.colunas[nome].astype(np.float64)
+
+    def fatores(self):
+        return {nome: self._coluna(nome) for nome in CAMPOS_FATORES}
+
+    def valores_pessoais(self):
+        return {nome[len(PREFIXO_VALOR_PESSOAL):] if nome.startswith(PREFIXO_VALOR_PESSOAL) else nome: self._coluna(nome)
+                for nome in CAMPOS_VALORES_PESSOAIS}
+
+    def __getitem__(self, indice):
+        argumentos = {}
+        for nome, tipo in TIPOS.items():
+            valor = self.colunas[nome][indice]
+            argumentos[nome] = self.categorias[nome][valor] if nome in self.categorias else tipo(valor)
+        return Cenario(**argumentos)
+
+    def chaves(self, *extras):
+        """Chave estável de cada linha (a mesma de `Cenario.chave` com os mesmos extras)"""
+        import numpy as np
+        numeros = np.ascontiguousarray(
+            np.column_stack([self.colunas[nome] for nome in CAMPOS_NUMERICOS]), dtype='<f8'
+        )
+        textos = [self._coluna(nome) for nome in CAMPOS_TEXTO]
+        return [_chave(numeros[i].tobytes(), [coluna[i] for coluna in textos], extras) for i in range(len(self))]
+
+    @property
+    def nbytes(self):
+        return sum(coluna.nbytes for coluna in self.colunas.values())
@@ -0,0 +1,105 @@
+"""Comparação e ranking de várias ofertas na mesma sessão.
+
+Cada oferta tem suas próprias condições (dias presenciais, deslocamento,
+avaliações, modalidade e valor proposto); os dados da situação atual e os
+valores pessoais são os da sessão. Todas as ofertas são avaliadas juntas,
+numa única passada do motor vetorizado (faixa, líquido e compatibilidade).
+"""
+import numpy as np
+
+import motor_vetorizado as motor
+
+# Campos que variam por oferta (os demais fatores vêm da sessão)
+CAMPOS_OFERTA = (
+    'dias_presencial_novo', 'tempo_viagem_novo', 'custo_vida_nova', 'crescimento_carreira',
+    'estabilidade', 'beneficios_qualidade', 'cultura_empresa_nova', 'inovacao_tecnologia_nova'
+)
+
+OFERTA_PADRAO = {
+    'nome': 'Nova oferta',
+    'modalidade': 'CLT',
+    'valor_proposto': 0.0,
+    'dias_presencial_novo': 3,
+    'tempo_viagem_novo': 1.0,
+    'custo_vida_nova': 0.0,
+    'crescimento_carreira': 7,
+    'estabilidade': 7,
+    'beneficios_qualidade': 7,
+    'cultura_empresa_nova': 7,
+    'inovacao_tecnologia_nova': 7
+}
+
+def linhas_editor(ofertas):
+    """Ofertas como linhas do editor do app (custo de vida em %, não em fração)"""
+    return [dict(oferta, custo_vida_nova=oferta.get('custo_vida_nova', 0.0) * 100) for oferta in ofertas]
+
+
+def ofertas_de_linhas(linhas):
+    """Inverso de `linhas_editor`: células deixadas em branco assumem o valor padrão da oferta"""
+    ofertas = []
+    for linha in linhas:
+        oferta = dict(OFERTA_PADRAO, **{chave: valor for chave, valor in linha.items() if valor is not None})
+        oferta['custo_vida_nova'] = (linha.get('custo_vida_nova') or 0.0) / 100
+        ofertas.append(oferta)
+    return ofertas
+
+
+# Peso da parte financeira na pontuação final (o restante é a compatibilidade de valores)
+PESO_FINANCEIRO = 0.6
+# Cobertura do valor ideal a partir da qual a parte financeira vale 100 pontos
+COBERTURA_MAXIMA = 1.25
+
+
+def avaliar_ofertas(fatores, valores_pessoais, ofertas, tabela=None):
+    """Avalia e ordena as ofertas (melhor primeiro)
+
+    Retorna uma lista de dicionários com a faixa recomendada para as
+    condições da oferta, o líquido anual na modalidade da oferta, o
+    equivalente CLT do valor proposto, a compatibilidade e a pontuação.
+    """
+    if not ofertas:
+        return []
+    n = len(ofertas)
+
+    colunas_fatores = {
+        chave: np.full(n, float(valor)) for chave, valor in fatores.items()
+        if isinstance(valor, (int, float)) and not isinstance(valor, bool)
+    }
+    for campo in CAMPOS_OFERTA:
+        colunas_fatores[campo] = np.array([float(oferta.get(campo, OFERTA_PADRAO[campo])) for oferta in ofertas])
+    colunas_pessoais = {
+        chave: np.full(n, valor, dtype=object if isinstance(valor, str) else float)
+        for chave, valor in valores_pessoais.items()
+    }
+
+    compatibilidade = motor.calcular_compatibilidade_valores_vetorizado(colunas_fatores, colunas_pessoais)
+    faixa = motor.calcular_faixa_recomendada_vetorizado(colunas_fatores, colunas_pessoais, compatibilidade)
+
+    valores = np.array([float(oferta.get('valor_proposto', 0.0)) for oferta in ofertas])
+    eh_clt = np.array([oferta.get('modalidade', 'CLT') == 'CLT' for oferta in ofertas])
+    # A faixa é em termos CLT: ofertas PJ são comparadas pelo salário CLT equivalente
+    equivalente_clt = np.where(eh_clt, valores, motor.calcular_equivalencia_clt_pj_vetorizado(valores, tabela))
+    comparacao = motor.comparar_clt_pj_vetorizado(valores, valores, tabela)
+    liquido_anual = np.where(eh_clt, comparacao['CLT']['total_anual'], comparacao['PJ']['total_anual'])
+
+    cobertura = np.divide(equivalente_clt, faixa['ideal'], out=np.zeros(n), where=faixa['ideal'] > 0)
+    pontuacao_financeira = np.clip(cobertura, 0, COBERTURA_MAXIMA) / COBERTURA_MAXIMA * 100
+    pontuacao = PESO_FINANCEIRO * pontuacao_financeira + (1 - PESO_FINANCEIRO) * compatibilidade['compatibilidade_geral']
+
+    resultados = [
+        {
+            'nome': oferta.get('nome') or f'Oferta {i + 1}',
+            'modalidade': 'CLT' if eh_clt[i] else 'PJ',
+            'valor_proposto': float(valores[i]),
+            'equivalente_clt': float(equivalente_clt[i]),
+            'liquido_anual': float(liquido_anual[i]),
+            'minimo': float(faixa['minimo'][i]),
+            'ideal': float(faixa['ideal'][i]),
+            'atende_minimo': bool(equivalente_clt[i] >= faixa['minimo'][i]),
+            'compatibilidade': float(compatibilidade['compatibilidade_geral'][i]),
+            'pontuacao': float(pontuacao[i])
+        }
+        for i, oferta in enumerate(ofertas)
+    ]
+    # Ordem estável: empates mantêm a ordem em que as ofertas foram cadastradas
+    return sorted(resultados, key=lambda resultado: -resultado['pontuacao'])
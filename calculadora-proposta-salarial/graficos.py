@@ -0,0 +1,453 @@
+"""Gráficos do dashboard: dados plotados, renderização matplotlib e cache de imagens.
+
+Cada gráfico é descrito por um dicionário simples com exatamente os dados
+plotados (`dados_*`). A renderização (`renderizar_*`) transforma esses dados
+em PNG, e `obter_png` guarda as imagens num cache LRU limitado por bytes:
+um gráfico cujos dados não mudaram custa uma consulta ao dicionário em vez
+de um render completo do matplotlib. `especificacao_vega` descreve os mesmos
+dados em Vega-Lite para o modo em que o navegador desenha os gráficos.
+"""
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+
+LIMITE_BYTES_PADRAO = 64 * 1024 * 1024  # 64 MB de PNGs por processo
+
+# Mesmos parâmetros que o st.pyplot usa ao salvar a figura
+OPCOES_PNG = {'format': 'png', 'dpi': 200, 'bbox_inches': 'tight'}
+
+
+def _pyplot():
+    """Importa matplotlib (backend Agg) apenas quando um gráfico é renderizado"""
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+    return plt
+
+
+def _figura_para_png(fig):
+    plt = _pyplot()
+    buffer = io.BytesIO()
+    try:
+        fig.savefig(buffer, **OPCOES_PNG)
+    finally:
+        plt.close(fig)  # Libera a figura: sem isso o pyplot acumula figuras a cada rerun
+    return buffer.getvalue()
+
+
+# ----------------------------------------------------------------- dados
+
+def dados_perfil_valores(valores_ordenados):
+    """Dados do gráfico de perfil: lista de (valor, importância) já ordenada"""
+    return {
+        'valores': [str(valor) for valor, _ in valores_ordenados],
+        'importancias': [float(importancia) for _, importancia in valores_ordenados]
+    }
+
+
+def dados_compatibilidade(compatibilidade):
+    """Dados do gráfico de compatibilidade por fator, em ordem crescente"""
+    itens = sorted(compatibilidade['detalhado'].items(), key=lambda item: item[1])
+    return {
+        'fatores': [fator for fator, _ in itens],
+        'valores': [float(valor) for _, valor in itens]
+    }
+
+
+def dados_ranking_ofertas(resultados):
+    """Dados do ranking de ofertas (na ordem do ranking, melhor primeiro)"""
+    return {
+        'ofertas': [str(resultado['nome']) for resultado in resultados],
+        'pontuacoes': [round(float(resultado['pontuacao']), 2) for resultado in resultados],
+        'atende_minimo': [bool(resultado['atende_minimo']) for resultado in resultados]
+    }
+
+
+def dados_graficos_dashboard(faixa, salario_total_atual, fatores, comparacao_clt_pj, compatibilidade):
+    """Dados dos quatro gráficos da aba Gráficos"""
+    return {
+        'propostas': {
+            'categorias': ['Atual', 'Mínimo', 'Ideal', 'Máximo'],
+            'valores': [float(salario_total_atual), float(faixa['minimo']),
+                        float(faixa['ideal']), float(faixa['maximo_negociacao'])]
+        },
+        'qualitativos': {
+            'fatores': ['Crescimento', 'Estabilidade', 'Benefícios', 'Cultura', 'Inovação'],
+            'valores': [
+                float(fatores.get('crescimento_carreira', 5)),
+                float(fatores.get('estabilidade', 5)),
+                float(fatores.get('beneficios_qualidade', 5)),
+                float(fatores.get('cultura_empresa_nova', 5)),
+                float(fatores.get('inovacao_tecnologia_nova', 5))
+            ]
+        },
+        'liquidos': {
+            'modalidades': ['CLT Líquido', 'PJ Líquido'],
+            'valores': [float(comparacao_clt_pj['CLT'].get('salario_liquido', 0)),
+                        float(comparacao_clt_pj['PJ'].get('renda_liquida', 0))]
+        },
+        'compatibilidade': {
+            'fatores': ['Estabilidade', 'Crescimento', 'Flexibilidade', 'Equilíbrio', 'Cultura'],
+            'valores': [
+                float(compatibilidade['detalhado'].get('estabilidade_financeira', 0)),
+                float(compatibilidade['detalhado'].get('crescimento_carreira', 0)),
+                float(compatibilidade['detalhado'].get('flexibilidade_tempo', 0)),
+                float(compatibilidade['detalhado'].get('equilibrio_vida_pessoal', 0)),
+                float(compatibilidade['detalhado'].get('cultura_empresa', 0))
+            ]
+        }
+    }
+
+
+# --------------------------------------------------------- renderização
+
+def renderizar_perfil_valores(dados):
+    """Gráfico de barras horizontais do perfil de valores (12x8)"""
+    plt = _pyplot()
+    importancias = dados['importancias']
+
+    fig, ax = plt.subplots(figsize=(12, 8))
+    bars = ax.barh(dados['valores'], importancias,
+                   color=plt.cm.viridis([i / 10 for i in importancias]))
+
+    ax.set_xlabel('Importância (1-10)')
+    ax.set_title('Seu Perfil de Valores Pessoais')
+    ax.set_xlim(0, 10)
+
+    # Adicionar valores nas barras
+    for bar in bars:
+        width = bar.get_width()
+        ax.text(width + 0.1, bar.get_y() + bar.get_height()/2,
+                f'{width:.1f}', va='center')
+
+    return _figura_para_png(fig)
+
+
+def renderizar_compatibilidade(dados):
+    """Gráfico de compatibilidade por fator (10x6)"""
+    plt = _pyplot()
+    valores = dados['valores']
+
+    fig, ax = plt.subplots(figsize=(10, 6))
+    bars = ax.barh(dados['fatores'], valores,
+                   color=['red' if v < 50 else 'orange' if v < 70 else 'green' for v in valores])
+
+    ax.set_xlabel('Compatibilidade (%)')
+    ax.set_title('Compatibilidade com Seus Valores Pessoais')
+    ax.set_xlim(0, 100)
+
+    for bar, valor in zip(bars, valores):
+        ax.text(valor + 1, bar.get_y() + bar.get_height()/2,
+                f'{valor:.1f}%', va='center')
+
+    return _figura_para_png(fig)
+
+
+def renderizar_ranking_ofertas(dados):
+    """Pontuação de cada oferta; em vermelho as que não cobrem o mínimo (10x5)"""
+    plt = _pyplot()
+    pontuacoes = dados['pontuacoes']
+
+    fig, ax = plt.subplots(figsize=(10, 5))
+    bars = ax.barh(dados['ofertas'], pontuacoes,
+                   color=['green' if atende else 'red' for atende in dados['atende_minimo']])
+
+    ax.set_xlabel('Pontuação (0-100)')
+    ax.set_title('Ranking das Ofertas')
+    ax.set_xlim(0, 100)
+    ax.invert_yaxis()  # Melhor oferta no topo
+
+    for bar, valor in zip(bars, pontuacoes):
+        ax.text(valor + 1, bar.get_y() + bar.get_height()/2,
+                f'{valor:.1f}', va='center')
+
+    return _figura_para_png(fig)
+
+
+def renderizar_graficos_dashboard(dados):
+    """Painel 2x2 da aba Gráficos (15x12)"""
+    plt = _pyplot()
+    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(15, 12))
+
+    # Gráfico 1: Comparação de valores
+    propostas = dados['propostas']
+    bars1 = ax1.bar(propostas['categorias'], propostas['valores'],
+                    color=['lightgray', 'orange', 'green', 'lightblue'])
+    ax1.set_ylabel('Valor Mensal (R$)')
+    ax1.set_title('Comparação de Propostas (Bruto)')
+    for bar, valor in zip(bars1, propostas['valores']):
+        ax1.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 500,
+                 f'R$ {valor:,.0f}', ha='center', va='bottom')
+
+    # Gráfico 2: Fatores qualitativos
+    qualitativos = dados['qualitativos']
+    ax2.bar(qualitativos['fatores'], qualitativos['valores'], color=['purple', 'red', 'blue', 'green', 'orange'])
+    ax2.set_ylim(0, 10)
+    ax2.set_ylabel('Avaliação (1-10)')
+    ax2.set_title('Fatores Qualitativos da Empresa')
+
+    # Gráfico 3: CLT vs PJ
+    liquidos = dados['liquidos']
+    bars3 = ax3.bar(liquidos['modalidades'], liquidos['valores'], color=['#1f77b4', '#ff7f0e'])
+    ax3.set_ylabel('Valor Mensal (R$)')
+    ax3.set_title('Comparação CLT vs PJ (Líquido)')
+    for bar, valor in zip(bars3, liquidos['valores']):
+        ax3.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 300,
+                 f'R$ {valor:,.0f}', ha='center', va='bottom')
+
+    # Gráfico 4: Compatibilidade com valores pessoais
+    compatibilidade = dados['compatibilidade']
+    ax4.bar(compatibilidade['fatores'], compatibilidade['valores'],
+            color=['blue', 'green', 'orange', 'purple', 'red'])
+    ax4.set_ylim(0, 100)
+    ax4.set_ylabel('Compatibilidade (%)')
+    ax4.set_title('Compatibilidade com Valores Pessoais')
+
+    plt.tight_layout()
+    return _figura_para_png(fig)
+
+
+RENDERIZADORES = {
+    'perfil_valores': renderizar_perfil_valores,
+    'compatibilidade': renderizar_compatibilidade,
+    'dashboard': renderizar_graficos_dashboard,
+    'ranking_ofertas': renderizar_ranking_ofertas,
+}
+
+
+# ------------------------------------------------ renderização no navegador
+# Especificações Vega-Lite com os mesmos dados, rótulos e cores dos gráficos
+# matplotlib: o servidor envia só as séries e o navegador desenha.
+
+def _barras(valores, campo_categoria, campo_valor, titulo, titulo_eixo, cores, horizontal=False,
+            dominio=None, formato_rotulo=None, ordenar=None):
+    eixo_valor = {'field': campo_valor, 'type': 'quantitative', 'title': titulo_eixo}
+    if dominio is not None:
+        eixo_valor['scale'] = {'domain': dominio}
+    eixo_categoria = {'field': campo_categoria, 'type': 'nominal', 'title': None, 'sort': ordenar}
+    codificacao = {
+        'x': eixo_valor if horizontal else eixo_categoria,
+        'y': eixo_categoria if horizontal else eixo_valor,
+        'tooltip': [{'field': campo_categoria}, {'field': campo_valor, 'format': ',.2f'}],
+    }
+    barras = {
+        'mark': 'bar',
+        'encoding': dict(codificacao, color={'field': 'cor', 'type': 'nominal', 'scale': None, 'legend': None}),
+    }
+    camadas = [barras]
+    if formato_rotulo is not None:
+        camadas.append({
+            'transform': [{'calculate': formato_rotulo, 'as': 'rotulo'}],
+            'mark': {'type': 'text', 'align': 'left', 'dx': 3} if horizontal else {'type': 'text', 'baseline': 'bottom', 'dy': -3},
+            'encoding': dict(codificacao, text={'field': 'rotulo'}),
+        })
+    return {
+        'title': titulo,
+        'data': {'values': [
+            {campo_categoria: categoria, campo_valor: valor, 'cor': cor}
+            for categoria, valor, cor in zip(valores[0], valores[1], cores)
+        ]},
+        'layer': camadas,
+    }
+
+
+def _cor_viridis(fracao):
+    """Aproxima plt.cm.viridis sem importar matplotlib"""
+    paleta = ['#440154', '#482878', '#3e4989', '#31688e', '#26828e', '#1f9e89', '#35b779', '#6ece58', '#b5de2b', '#fde725']
+    return paleta[min(int(fracao * len(paleta)), len(paleta) - 1)]
+
+
+def especificacao_perfil_valores(dados):
+    return _barras(
+        (dados['valores'], dados['importancias']), 'Valor', 'Importância',
+        'Seu Perfil de Valores Pessoais', 'Importância (1-10)',
+        [_cor_viridis(i / 10) for i in dados['importancias']],
+        horizontal=True, dominio=[0, 10], formato_rotulo="format(datum['Importância'], '.1f')",
+        ordenar=list(reversed(dados['valores']))  # barh do matplotlib desenha o primeiro item embaixo
+    )
+
+
+def especificacao_compatibilidade(dados):
+    return _barras(
+        (dados['fatores'], dados['valores']), 'Fator', 'Compatibilidade',
+        'Compatibilidade com Seus Valores Pessoais', 'Compatibilidade (%)',
+        ['red' if v < 50 else 'orange' if v < 70 else 'green' for v in dados['valores']],
+        horizontal=True, dominio=[0, 100], formato_rotulo="format(datum.Compatibilidade, '.1f') + '%'",
+        ordenar=list(reversed(dados['fatores']))
+    )
+
+
+def especificacao_graficos_dashboard(dados):
+    reais = "'R$ ' + format(datum.Valor, ',.0f')"
+    propostas = _barras(
+        (dados['propostas']['categorias'], dados['propostas']['valores']), 'Categoria', 'Valor',
+        'Comparação de Propostas (Bruto)', 'Valor Mensal (R$)',
+        ['lightgray', 'orange', 'green', 'lightblue'], formato_rotulo=reais
+    )
+    qualitativos = _barras(
+        (dados['qualitativos']['fatores'], dados['qualitativos']['valores']), 'Fator', 'Avaliação',
+        'Fatores Qualitativos da Empresa', 'Avaliação (1-10)',
+        ['purple', 'red', 'blue', 'green', 'orange'], dominio=[0, 10]
+    )
+    liquidos = _barras(
+        (dados['liquidos']['modalidades'], dados['liquidos']['valores']), 'Modalidade', 'Valor',
+        'Comparação CLT vs PJ (Líquido)', 'Valor Mensal (R$)',
+        ['#1f77b4', '#ff7f0e'], formato_rotulo=reais
+    )
+    compatibilidade = _barras(
+        (dados['compatibilidade']['fatores'], dados['compatibilidade']['valores']), 'Fator', 'Compatibilidade',
+        'Compatibilidade com Valores Pessoais', 'Compatibilidade (%)',
+        ['blue', 'green', 'orange', 'purple', 'red'], dominio=[0, 100]
+    )
+    return {
+        'vconcat': [
+            {'hconcat': [propostas, qualitativos]},
+            {'hconcat': [liquidos, compatibilidade]},
+        ]
+    }
+
+
+def especificacao_ranking_ofertas(dados):
+    return _barras(
+        (dados['ofertas'], dados['pontuacoes']), 'Oferta', 'Pontuação',
+        'Ranking das Ofertas', 'Pontuação (0-100)',
+        ['green' if atende else 'red' for atende in dados['atende_minimo']],
+        horizontal=True, dominio=[0, 100], formato_rotulo="format(datum['Pontuação'], '.1f')",
+        ordenar=dados['ofertas']
+    )
+
+
+def dados_mapa_calor(grade, metrica, titulo_x, titulo_y, titulo_metrica):
+    """Fatia 2D da grade de sensibilidade (motor_vetorizado.calcular_grade_sensibilidade)
+
+    Só tuplas (imutáveis): o resultado fica no cache de seções e é compartilhado entre sessões.
+    """
+    eixo_x, eixo_y = (tuple(eixo.round(2).tolist()) for eixo in grade['valores_eixos'])
+    return {
+        'titulo_x': titulo_x,
+        'titulo_y': titulo_y,
+        'titulo_metrica': titulo_metrica,
+        'eixo_x': eixo_x,
+        'eixo_y': eixo_y,
+        'valores': tuple(map(tuple, grade[metrica].round(1).tolist()))
+    }
+
+
+def especificacao_mapa_calor(dados):
+    """Mapa de calor: cada célula é uma combinação dos dois eixos (tooltip com os valores)"""
+    def eixo(campo, titulo):
+        return {
+            'field': campo, 'type': 'ordinal', 'title': titulo, 'sort': 'ascending',
+            'axis': {'labelOverlap': True, 'format': ',.2~f', 'formatType': 'number'}
+        }
+
+    return {
+        'title': f"{dados['titulo_metrica']} por {dados['titulo_x']} e {dados['titulo_y']}",
+        # Pontos montados a cada desenho: o cache guarda só os eixos e a matriz
+        'data': {'values': [
+            {'x': x, 'y': y, 'valor': linha[j]}
+            for x, linha in zip(dados['eixo_x'], dados['valores']) for j, y in enumerate(dados['eixo_y'])
+        ]},
+        'mark': 'rect',
+        'encoding': {
+            'x': eixo('x', dados['titulo_x']),
+            'y': dict(eixo('y', dados['titulo_y']), sort='descending'),
+            'color': {'field': 'valor', 'type': 'quantitative', 'title': dados['titulo_metrica'],
+                      'scale': {'scheme': 'viridis'}},
+            'tooltip': [
+                {'field': 'x', 'title': dados['titulo_x'], 'format': ',.2f'},
+                {'field': 'y', 'title': dados['titulo_y'], 'format': ',.2f'},
+                {'field': 'valor', 'title': dados['titulo_metrica'], 'format': ',.1f'},
+            ],
+        },
+    }
+
+
+ESPECIFICACOES = {
+    'perfil_valores': especificacao_perfil_valores,
+    'compatibilidade': especificacao_compatibilidade,
+    'dashboard': especificacao_graficos_dashboard,
+    'ranking_ofertas': especificacao_ranking_ofertas,
+    'mapa_calor': especificacao_mapa_calor,
+}
+
+
+def especificacao_vega(nome, dados):
+    """Especificação Vega-Lite do gráfico `nome` (renderizada pelo navegador)"""
+    especificacao = ESPECIFICACOES[nome](dados)
+    especificacao['$schema'] = 'https://vega.github.io/schema/vega-lite/v5.json'
+    return especificacao
+
+
+# ---------------------------------------------------------------- cache
+
+class CacheGraficos:
+    """Cache LRU de PNGs limitado pelo total de bytes guardados"""
+
+    def __init__(self, limite_bytes=LIMITE_BYTES_PADRAO):
+        self.limite_bytes = limite_bytes
+        self._imagens = OrderedDict()
+        self._bytes = 0
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.falhas = 0
+
+    @staticmethod
+    def chave(nome, dados):
+        conteudo = json.dumps([nome, dados], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(conteudo.encode('utf-8')).hexdigest()
+
+    def obter(self, chave):
+        with self._trava:
+            imagem = self._imagens.get(chave)
+            if imagem is None:
+                self.falhas += 1
+                return None
+            self._imagens.move_to_end(chave)
+            self.acertos += 1
+            return imagem
+
+    def guardar(self, chave, imagem):
+        with self._trava:
+            if len(imagem) > self.limite_bytes:
+                return  # Maior que o cache inteiro: não guarda
+            anterior = self._imagens.pop(chave, None)
+            if anterior is not None:
+                self._bytes -= len(anterior)
+            self._imagens[chave] = imagem
+            self._bytes += len(imagem)
+            while self._bytes > self.limite_bytes:
+                _, removida = self._imagens.popitem(last=False)
+                self._bytes -= len(removida)
+
+    def estatisticas(self):
+        with self._trava:
+            return {
+                'acertos': self.acertos,
+                'falhas': self.falhas,
+                'itens': len(self._imagens),
+                'bytes': self._bytes,
+                'limite_bytes': self.limite_bytes
+            }
+
+    def limpar(self):
+        with self._trava:
+            self._imagens.clear()
+            self._bytes = 0
+            self.acertos = 0
+            self.falhas = 0
+
+
+cache_graficos = CacheGraficos()
+
+
+def obter_png(nome, dados):
+    """Retorna o PNG do gráfico `nome` para os dados, renderizando só se não estiver em cache"""
+    chave = CacheGraficos.chave(nome, dados)
+    imagem = cache_graficos.obter(chave)
+    if imagem is None:
+        imagem = RENDERIZADORES[nome](dados)
+        cache_graficos.guardar(chave, imagem)
+    return imagem
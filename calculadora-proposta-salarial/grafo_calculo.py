@@ -0,0 +1,158 @@
+"""Grafo de dependências para os valores derivados do dashboard.
+
+Cada nó declara os campos de `fatores`/`valores_pessoais` que lê e os nós
+dos quais depende. A função do nó recebe apenas esses campos, então a
+assinatura (valores dos campos + assinaturas das dependências) identifica
+o resultado por completo: se nada mudou desde o último rerun, o valor
+anterior é reutilizado; e dentro de um rerun cada nó executa no máximo uma vez.
+Nós que dependem da tabela de impostos declaram `usa_tabela` e incluem o
+identificador da tabela na assinatura, então uma recarga das tabelas os invalida.
+"""
+import nucleo_calculo as nucleo
+from tabelas_impostos import registro_tabelas
+
+
+class No:
+    """Nó do grafo: função pura sobre campos declarados e resultados de outros nós"""
+
+    def __init__(self, nome, funcao, fatores=(), valores_pessoais=(), dependencias=(), usa_tabela=False):
+        self.nome = nome
+        self.funcao = funcao
+        self.fatores = tuple(fatores)
+        self.valores_pessoais = tuple(valores_pessoais)
+        self.dependencias = tuple(dependencias)
+        self.usa_tabela = usa_tabela
+
+
+class GrafoCalculo:
+    """Avalia nós sob demanda, recalculando só o que depende de entradas alteradas"""
+
+    def __init__(self):
+        self._nos = {}
+        self._resultados = {}  # nome -> (assinatura, valor), mantido entre reruns
+        self._execucao = {}  # nome -> (assinatura, valor), só do rerun atual
+        self._fatores = {}
+        self._valores_pessoais = {}
+        self._tabela = None
+        self.execucoes = {}  # nome -> quantas vezes a função do nó rodou
+
+    def registrar(self, nome, funcao, fatores=(), valores_pessoais=(), dependencias=(), usa_tabela=False):
+        for dependencia in dependencias:
+            if dependencia not in self._nos:
+                raise ValueError(f"Dependência desconhecida para '{nome}': {dependencia}")
+        self._nos[nome] = No(nome, funcao, fatores, valores_pessoais, dependencias, usa_tabela)
+        self.execucoes[nome] = 0
+
+    def iniciar_execucao(self, fatores, valores_pessoais, tabela=None):
+        """Define as entradas do rerun atual"""
+        self._fatores = fatores
+        self._valores_pessoais = valores_pessoais
+        self._tabela = tabela or registro_tabelas.obter()
+        self._execucao = {}
+
+    def _campos(self, origem, chaves):
+        return {chave: origem[chave] for chave in chaves if chave in origem}
+
+    def _avaliar(self, nome):
+        if nome in self._execucao:
+            return self._execucao[nome]
+
+        no = self._nos[nome]
+        fatores = self._campos(self._fatores, no.fatores)
+        valores_pessoais = self._campos(self._valores_pessoais, no.valores_pessoais)
+        dependencias = {dep: self._avaliar(dep) for dep in no.dependencias}
+
+        assinatura = (
+            tuple(sorted(fatores.items())),
+            tuple(sorted(valores_pessoais.items())),
+            tuple(dependencias[dep][0] for dep in no.dependencias),
+            self._tabela.identificador if no.usa_tabela else None
+        )
+
+        anterior = self._resultados.get(nome)
+        if anterior is not None and anterior[0] == assinatura:
+            resultado = anterior
+        else:
+            argumentos = {dep: r[1] for dep, r in dependencias.items()}
+            if no.usa_tabela:
+                argumentos['tabela'] = self._tabela
+            valor = no.funcao(fatores, valores_pessoais, **argumentos)
+            self.execucoes[nome] += 1
+            resultado = (assinatura, valor)
+            self._resultados[nome] = resultado
+
+        self._execucao[nome] = resultado
+        return resultado
+
+    def obter(self, nome):
+        """Retorna o valor do nó para as entradas do rerun atual"""
+        return self._avaliar(nome)[1]
+
+
+CAMPOS_COMPENSACAO = (
+    'salario_atual', 'beneficios_atual', 'bonus_atual', 'custo_vida_nova',
+    'tempo_viagem_atual', 'tempo_viagem_novo', 'dias_presencial_novo'
+)
+CAMPOS_COMPATIBILIDADE = (
+    'estabilidade', 'crescimento_carreira', 'dias_presencial_novo', 'tempo_viagem_novo',
+    'inovacao_tecnologia_nova', 'cultura_empresa_nova'
+)
+VALORES_COMPATIBILIDADE = (
+    'estabilidade_financeira', 'crescimento_carreira', 'flexibilidade_tempo', 'equilibrio_vida_pessoal',
+    'inovacao_tecnologia', 'cultura_empresa', 'prioridade_1', 'prioridade_2', 'prioridade_3'
+)
+
+
+def criar_grafo_dashboard():
+    """Monta o grafo com os valores derivados usados por gerar_dashboard"""
+    grafo = GrafoCalculo()
+
+    grafo.registrar(
+        'compensacao_minima',
+        lambda f, v: nucleo.calcular_compensacao_minima(f),
+        fatores=CAMPOS_COMPENSACAO
+    )
+    grafo.registrar(
+        'compatibilidade',
+        lambda f, v: nucleo.calcular_compatibilidade_valores(f, v),
+        fatores=CAMPOS_COMPATIBILIDADE, valores_pessoais=VALORES_COMPATIBILIDADE
+    )
+    grafo.registrar(
+        'valor_ideal',
+        lambda f, v, compensacao_minima, compatibilidade: nucleo.calcular_valor_ideal(
+            f, v, compensacao_minima, compatibilidade
+        ),
+        fatores=('crescimento_carreira', 'estabilidade', 'beneficios_qualidade'),
+        dependencias=('compensacao_minima', 'compatibilidade')
+    )
+    grafo.registrar(
+        'faixa',
+        lambda f, v, compensacao_minima, valor_ideal: nucleo.calcular_faixa_recomendada(
+            f, v, compensacao_minima, valor_ideal
+        ),
+        dependencias=('compensacao_minima', 'valor_ideal')
+    )
+    grafo.registrar(
+        'comparacao_clt_pj',
+        lambda f, v, faixa, tabela: nucleo.calcular_comparacao_modalidade(f, faixa, tabela),
+        fatores=('modalidade',),
+        dependencias=('faixa',),
+        usa_tabela=True
+    )
+    grafo.registrar(
+        'salario_total_atual',
+        lambda f, v: f.get('salario_atual', 0) + f.get('beneficios_atual', 0),
+        fatores=('salario_atual', 'beneficios_atual')
+    )
+    grafo.registrar(
+        'valor_hora_atual',
+        lambda f, v: nucleo.calcular_valor_hora_atual(f),
+        fatores=('salario_atual', 'beneficios_atual', 'tempo_viagem_atual')
+    )
+    grafo.registrar(
+        'horas_economizadas',
+        lambda f, v: nucleo.calcular_horas_economizadas(f),
+        fatores=('tempo_viagem_atual', 'tempo_viagem_novo', 'dias_presencial_novo')
+    )
+
+    return grafo
@@ -0,0 +1,239 @@
+"""Medição de tempo dos caminhos quentes do app, exportada no formato texto do Prometheus.
+
+Os spans são instalados trocando os métodos por versões cronometradas
+(`ativar`/`instrumentar`) e removidos devolvendo os originais (`desativar`):
+desligada, a instrumentação não deixa nenhum wrapper no caminho e custa zero.
+Cada método instrumentado alimenta um histograma de duração; o texto pode ser
+gravado num arquivo (coletor textfile do node_exporter) ou servido por HTTP.
+
+Os tempos são inclusivos: um método que chama outro instrumentado conta o
+tempo dos dois.
+"""
+import functools
+import os
+import threading
+import time
+from bisect import bisect_left
+
+VARIAVEL_ATIVAR = 'CALCULADORA_METRICAS'
+VARIAVEL_ARQUIVO = 'CALCULADORA_METRICAS_ARQUIVO'
+VARIAVEL_PORTA = 'CALCULADORA_METRICAS_PORTA'
+# Caminho de um arquivo: existir liga a medição, apagar desliga (sem reiniciar o processo)
+VARIAVEL_INTERRUPTOR = 'CALCULADORA_METRICAS_INTERRUPTOR'
+
+NOME_METRICA = 'calculadora_duracao_segundos'
+# Limites dos buckets em segundos: os do cliente oficial do Prometheus mais
+# alguns abaixo de 5 ms, onde ficam os cálculos escalares
+LIMITES_PADRAO = (
+    0.0001, 0.0005, 0.001, 0.0025,
+    0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 7.5, 10.0
+)
+
+# Funções do Streamlit e dos gráficos que também recebem spans
+FUNCOES_STREAMLIT = ('pyplot', 'image', 'vega_lite_chart', 'line_chart', 'dataframe')
+FUNCOES_GRAFICOS = ('obter_png', 'especificacao_vega')
+
+
+def _nome_alvo(alvo):
+    """Nome estável do alvo: a classe recriada a cada rerun mantém o mesmo nome"""
+    if isinstance(alvo, type):
+        return f'{alvo.__module__}.{alvo.__qualname__}'
+    return getattr(alvo, '__name__', None) or repr(alvo)
+
+
+def _ligada_no_ambiente():
+    """CALCULADORA_METRICAS=1, ou o arquivo de CALCULADORA_METRICAS_INTERRUPTOR existe"""
+    if os.environ.get(VARIAVEL_ATIVAR, '').lower() in ('1', 'true', 'sim'):
+        return True
+    interruptor = os.environ.get(VARIAVEL_INTERRUPTOR)
+    return bool(interruptor) and os.path.exists(interruptor)
+
+
+def _metodos_da_calculadora(classe):
+    """Cálculos públicos e renderizadores de abas do dashboard"""
+    return [
+        nome for nome, valor in vars(classe).items()
+        if callable(valor) and (
+            nome.startswith('calcular_') or nome.startswith('_mostrar_aba_')
+            or nome in ('comparar_clt_pj', 'gerar_dashboard', 'obter_payload_dashboard')
+        )
+    ]
+
+
+class Histograma:
+    """Histograma cumulativo de durações, seguro para várias threads"""
+
+    def __init__(self, limites=LIMITES_PADRAO):
+        self.limites = tuple(limites)
+        self.contagens = [0] * (len(self.limites) + 1)  # Último = acima do maior limite
+        self.soma = 0.0
+        self.total = 0
+        self._trava = threading.Lock()
+
+    def observar(self, segundos):
+        indice = bisect_left(self.limites, segundos)
+        with self._trava:
+            self.contagens[indice] += 1
+            self.soma += segundos
+            self.total += 1
+
+    def instantaneo(self):
+        with self._trava:
+            return list(self.contagens), self.soma, self.total
+
+
+class Instrumentacao:
+    """Spans por método, histogramas e exportação Prometheus"""
+
+    def __init__(self, limites=LIMITES_PADRAO):
+        self.limites = limites
+        self.ativa = False
+        self.histogramas = {}
+        self._originais = {}  # (nome do alvo, atributo) -> (alvo, atributo, original)
+        self._trava = threading.Lock()
+        self._servidor = None
+
+    def observar(self, nome, segundos):
+        histograma = self.histogramas.get(nome)
+        if histograma is None:
+            with self._trava:
+                histograma = self.histogramas.setdefault(nome, Histograma(self.limites))
+        histograma.observar(segundos)
+
+    def _span(self, nome, funcao):
+        observar = self.observar
+        relogio = time.perf_counter
+
+        @functools.wraps(funcao)
+        def cronometrada(*args, **kwargs):
+            inicio = relogio()
+            try:
+                return funcao(*args, **kwargs)
+            finally:
+                observar(nome, relogio() - inicio)
+
+        cronometrada.__span__ = nome
+        return cronometrada
+
+    def instrumentar(self, alvo, atributos, prefixo):
+        """Troca `alvo.<atributo>` por versões cronometradas (só se a instrumentação estiver ativa)
+
+        Os originais ficam guardados pelo nome do alvo: uma classe recriada
+        (o Streamlit reexecuta o script a cada rerun) substitui a anterior,
+        que não fica presa aqui.
+        """
+        if not self.ativa:
+            return
+        nome_alvo = _nome_alvo(alvo)
+        with self._trava:
+            for atributo in atributos:
+                original = vars(alvo).get(atributo) if isinstance(alvo, type) else getattr(alvo, atributo, None)
+                if original is None or hasattr(original, '__span__'):
+                    continue  # Inexistente ou já instrumentado
+                self._originais[(nome_alvo, atributo)] = (alvo, atributo, original)
+                setattr(alvo, atributo, self._span(f'{prefixo}.{atributo}', original))
+
+    def instrumentar_app(self, classe_calculadora, modulo_streamlit, modulo_graficos):
+        """Instala os spans da calculadora, das funções de exibição do Streamlit e dos gráficos
+
+        Chamado a cada rerun: o Streamlit reexecuta o script e recria a
+        classe, mas os módulos importados (streamlit, graficos) persistem.
+        """
+        self.instrumentar(classe_calculadora, _metodos_da_calculadora(classe_calculadora), classe_calculadora.__name__)
+        self.instrumentar(modulo_streamlit, FUNCOES_STREAMLIT, 'st')
+        self.instrumentar(modulo_graficos, FUNCOES_GRAFICOS, 'graficos')
+
+    def ativar(self):
+        self.ativa = True
+
+    def desativar(self):
+        """Desliga e devolve os métodos originais; os histogramas acumulados são mantidos"""
+        with self._trava:
+            self.ativa = False
+            for alvo, atributo, original in self._originais.values():
+                setattr(alvo, atributo, original)
+            self._originais.clear()
+
+    def sincronizar(self):
+        """Liga ou desliga conforme o ambiente; o app chama a cada rerun
+
+        Assim a medição do processo inteiro pode ser ligada e desligada sem
+        reiniciar o servidor (ver VARIAVEL_INTERRUPTOR).
+        """
+        ligada = _ligada_no_ambiente()
+        if ligada and not self.ativa:
+            self.ativar()
+        elif self.ativa and not ligada:
+            self.desativar()
+        return self.ativa
+
+    def limpar(self):
+        with self._trava:
+            self.histogramas = {}
+
+    def texto_prometheus(self):
+        """Histogramas no formato de exposição texto do Prometheus"""
+        linhas = [
+            f'# HELP {NOME_METRICA} Duração das chamadas instrumentadas da calculadora',
+            f'# TYPE {NOME_METRICA} histogram'
+        ]
+        for nome in sorted(self.histogramas):
+            contagens, soma, total = self.histogramas[nome].instantaneo()
+            rotulo = nome.replace('\\', '\\\\').replace('"', '\\"')
+            acumulado = 0
+            for limite, contagem in zip(self.limites, contagens):
+                acumulado += contagem
+                linhas.append(f'{NOME_METRICA}_bucket{{metodo="{rotulo}",le="{limite}"}} {acumulado}')
+            linhas.append(f'{NOME_METRICA}_bucket{{metodo="{rotulo}",le="+Inf"}} {total}')
+            linhas.append(f'{NOME_METRICA}_sum{{metodo="{rotulo}"}} {soma}')
+            linhas.append(f'{NOME_METRICA}_count{{metodo="{rotulo}"}} {total}')
+        return '\n'.join(linhas) + '\n'
+
+    def exportar_arquivo(self, caminho):
+        """Grava o texto de forma atômica (o coletor nunca lê um arquivo pela metade)"""
+        diretorio = os.path.dirname(os.path.abspath(caminho))
+        os.makedirs(diretorio, exist_ok=True)
+        temporario = f'{caminho}.{os.getpid()}.tmp'
+        with open(temporario, 'w', encoding='utf-8') as arquivo:
+            arquivo.write(self.texto_prometheus())
+        os.replace(temporario, caminho)
+
+    def publicar(self):
+        """Exporta conforme as variáveis de ambiente: endpoint HTTP e/ou arquivo"""
+        porta = os.environ.get(VARIAVEL_PORTA)
+        if porta:
+            self.servir(porta)
+        caminho = os.environ.get(VARIAVEL_ARQUIVO)
+        if caminho:
+            self.exportar_arquivo(caminho)
+
+    def servir(self, porta, host='127.0.0.1'):
+        """Expõe GET /metrics numa thread em segundo plano (uma vez por processo)"""
+        if self._servidor is not None:
+            return self._servidor
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+        instrumentacao = self
+
+        class Manipulador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] != '/metrics':
+                    self.send_error(404)
+                    return
+                corpo = instrumentacao.texto_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(corpo)))
+                self.end_headers()
+                self.wfile.write(corpo)
+
+            def log_message(self, *args):
+                pass
+
+        self._servidor = ThreadingHTTPServer((host, int(porta)), Manipulador)
+        threading.Thread(target=self._servidor.serve_forever, daemon=True).start()
+        return self._servidor
+
+
+# Instância única por processo, como os caches
+instrumentacao = Instrumentacao()
+instrumentacao.sincronizar()
@@ -0,0 +1,175 @@
+"""Inversão exata líquido → bruto (CLT), líquido → valor PJ e equilíbrio CLT ↔ PJ.
+
+Com as faixas de INSS, IRRF e Simples, o líquido é uma função linear por
+partes e crescente do bruto. Os pontos de quebra vêm direto da tabela
+(limites do INSS, limites do IRRF levados para o bruto, ponto em que o
+IRRF deixa de ser zero, limites do Simples); em cada trecho o líquido é
+`inicio_liquido + inclinacao * (bruto - inicio)`, então a inversão é uma
+busca binária do trecho + uma divisão, sem busca numérica.
+"""
+import bisect
+
+import nucleo_calculo as nucleo
+from tabelas_impostos import registro_tabelas
+
+
+class FuncaoPorPartes:
+    """Função linear por partes e crescente, definida pelos trechos entre pontos de quebra
+
+    Cada trecho k começa em `inicios[k]` e é avaliado pela `funcao` original
+    em dois pontos internos, o que dá inclinação e valor inicial exatos do
+    trecho (mesmo onde a tabela tem pequenos saltos de arredondamento).
+    """
+
+    def __init__(self, pontos_quebra, funcao):
+        self.inicios = tuple(sorted({float(p) for p in pontos_quebra if p >= 0} | {0.0}))
+        inclinacoes = []
+        valores_inicio = []
+        valores_fim = []
+        for k, inicio in enumerate(self.inicios):
+            fim = self.inicios[k + 1] if k + 1 < len(self.inicios) else None
+            largura = (fim - inicio) if fim is not None else 1000.0
+            x1, x2 = inicio + largura / 3, inicio + 2 * largura / 3
+            y1, y2 = funcao(x1), funcao(x2)
+            inclinacao = (y2 - y1) / (x2 - x1)
+            valor_inicio = y1 - inclinacao * (x1 - inicio)
+            if inclinacao <= 0:
+                raise ValueError("Função não é crescente; não é possível inverter")
+            inclinacoes.append(inclinacao)
+            valores_inicio.append(valor_inicio)
+            valores_fim.append(valor_inicio + inclinacao * largura if fim is not None else float('inf'))
+        self.inclinacoes = tuple(inclinacoes)
+        self.valores_inicio = tuple(valores_inicio)
+        # Maior valor alcançado até o fim de cada trecho (acumulado, para a busca ser monótona)
+        maximos = []
+        for valor in valores_fim:
+            maximos.append(max(valor, maximos[-1]) if maximos else valor)
+        self.valores_fim = tuple(maximos)
+        self._arrays = None
+
+    def avaliar(self, x):
+        k = max(bisect.bisect_right(self.inicios, x) - 1, 0)
+        return self.valores_inicio[k] + self.inclinacoes[k] * (x - self.inicios[k])
+
+    def inverter(self, y):
+        """Menor x >= 0 com f(x) >= y (igualdade exata, exceto nos saltos de centavos da tabela)"""
+        k = min(bisect.bisect_left(self.valores_fim, y), len(self.inicios) - 1)
+        return self.inicios[k] + max(0.0, y - self.valores_inicio[k]) / self.inclinacoes[k]
+
+    def arrays(self):
+        """Trechos como arrays numpy, para o motor vetorizado (criados uma vez)"""
+        if self._arrays is None:
+            import numpy as np
+            self._arrays = {
+                nome: np.array(getattr(self, nome))
+                for nome in ('inicios', 'inclinacoes', 'valores_inicio', 'valores_fim')
+            }
+        return self._arrays
+
+
+def _base_para_bruto(tabela, base):
+    """Bruto cujo (bruto - INSS) é `base`, trecho a trecho da tabela do INSS"""
+    funcao = FuncaoPorPartes(tabela.inss_limites, lambda bruto: bruto - tabela.calcular_inss(bruto))
+    return funcao.inverter(base)
+
+
+def _pontos_quebra_clt(tabela):
+    pontos = list(tabela.inss_limites)
+    # Limites do IRRF e início da cobrança em cada faixa (alíquota * base = dedução), levados para o bruto
+    bases = list(tabela.irrf_limites)
+    bases += [deducao / aliquota for aliquota, deducao in zip(tabela.irrf_aliquotas, tabela.irrf_deducoes) if aliquota > 0]
+    pontos += [_base_para_bruto(tabela, base) for base in bases]
+    return pontos
+
+
+# Trechos compilados por identificador da tabela (versão + hash do arquivo)
+_funcoes = {}
+
+
+def _funcao(tipo, tabela, construir):
+    chave = (tipo, tabela.identificador)
+    if chave not in _funcoes:
+        _funcoes[chave] = construir()
+    return _funcoes[chave]
+
+
+def funcao_liquido_clt(tabela=None):
+    """Salário líquido CLT em função do bruto, como FuncaoPorPartes"""
+    tabela = tabela or registro_tabelas.obter()
+    return _funcao('liquido_clt', tabela, lambda: FuncaoPorPartes(
+        _pontos_quebra_clt(tabela),
+        lambda bruto: nucleo.calcular_impostos_clt(bruto, tabela)['salario_liquido']
+    ))
+
+
+def funcao_liquido_pj(tabela=None):
+    """Renda líquida PJ em função do valor mensal, como FuncaoPorPartes"""
+    tabela = tabela or registro_tabelas.obter()
+
+    def construir():
+        # Pro-labore = 40% do valor; faturamento anual da empresa = 60% * 12
+        pontos = [ponto / 0.4 for ponto in _pontos_quebra_clt(tabela)]
+        pontos += [limite / (0.6 * 12) for limite in tabela.simples_limites]
+        return FuncaoPorPartes(
+            pontos, lambda valor: nucleo.calcular_impostos_pj(valor, tabela)['renda_liquida']
+        )
+
+    return _funcao('liquido_pj', tabela, construir)
+
+
+def calcular_bruto_para_liquido_clt(liquido_desejado, tabela=None):
+    """Salário bruto CLT que resulta no líquido mensal desejado"""
+    return funcao_liquido_clt(tabela).inverter(liquido_desejado)
+
+
+def calcular_valor_pj_para_liquido(liquido_desejado, tabela=None):
+    """Valor mensal PJ (nota fiscal) que resulta na renda líquida desejada"""
+    return funcao_liquido_pj(tabela).inverter(liquido_desejado)
+
+
+def funcao_total_anual_clt(tabela=None):
+    """Total anual CLT (líquido x13 + férias + FGTS) em função do bruto mensal"""
+    tabela = tabela or registro_tabelas.obter()
+    return _funcao('total_anual_clt', tabela, lambda: FuncaoPorPartes(
+        _pontos_quebra_clt(tabela),
+        lambda bruto: nucleo.comparar_clt_pj(bruto, 0.0, tabela)['CLT']['total_anual']
+    ))
+
+
+def calcular_equivalencia_pj_clt(valor_clt, tabela=None):
+    """Valor PJ mensal cujo total anual líquido iguala o do pacote CLT
+
+    O fator PJ/CLT resultante não é constante: com a tabela 2024 vai de ~1,60
+    em R$ 1.000 (os custos fixos do PJ pesam mais nos salários baixos) e ~1,43
+    em R$ 2.000 até o mínimo de ~1,14 perto de R$ 10.000, subindo de leve
+    (~1,20 em R$ 40.000) quando o Simples muda de faixa.
+    """
+    total_anual_clt = funcao_total_anual_clt(tabela).avaliar(valor_clt)
+    return funcao_liquido_pj(tabela).inverter(total_anual_clt / 12)
+
+
+def calcular_equivalencia_clt_pj(valor_pj, tabela=None):
+    """Salário CLT cujo total anual iguala o total anual líquido do valor PJ"""
+    total_anual_pj = funcao_liquido_pj(tabela).avaliar(valor_pj) * 12
+    return funcao_total_anual_clt(tabela).inverter(total_anual_pj)
+
+
+def curva_equivalencia(tabela=None, salario_maximo=40000.0, passo=500.0):
+    """Curva de equilíbrio CLT → PJ pré-calculada (uma vez por tabela) para o dashboard
+
+    Retorna listas paralelas com o salário CLT, o valor PJ equivalente e o
+    fator PJ/CLT em cada ponto.
+    """
+    tabela = tabela or registro_tabelas.obter()
+
+    def construir():
+        salarios = [passo * i for i in range(1, int(salario_maximo / passo) + 1)]
+        valores_pj = [calcular_equivalencia_pj_clt(salario, tabela) for salario in salarios]
+        return {
+            'salario_clt': salarios,
+            'valor_pj': valores_pj,
+            'fator': [valor_pj / salario for salario, valor_pj in zip(salarios, valores_pj)]
+        }
+
+    curva = _funcao(('curva_equivalencia', salario_maximo, passo), tabela, construir)
+    return {chave: list(valores) for chave, valores in curva.items()}
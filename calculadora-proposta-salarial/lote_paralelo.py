@@ -0,0 +1,145 @@
+"""Avaliação em lote distribuída num pool de processos.
+
+As colunas de entrada de um bloco são empacotadas numa única matriz float64
+em memória compartilhada; cada worker recebe só o nome do segmento e o
+intervalo de linhas (fatia) a avaliar, lê suas linhas sem cópia e escreve os
+resultados direto na matriz de saída, também compartilhada, na posição das
+linhas. Pelo pickle passam só nomes, índices e a tabela de impostos (pequena),
+e a ordem da saída é sempre a da entrada, independente da ordem em que os
+workers terminam.
+
+Colunas de texto (modalidade e prioridades) viram códigos numéricos antes de
+entrar na matriz.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import processamento_lote as lote
+
+# Fatias por processo: mais fatias que processos equilibra a carga entre workers
+FATIAS_POR_PROCESSO = 4
+
+
+def processos_disponiveis():
+    return os.cpu_count() or 1
+
+
+def _codificar(fatores, valores_pessoais):
+    """Colunas prontas para a matriz compartilhada (textos viram códigos) e o esquema para decodificar
+
+    As colunas não são empilhadas aqui: cada uma é copiada uma única vez,
+    direto para a sua linha no segmento compartilhado.
+    """
+    colunas = []
+    esquema = []
+    categorias = {}
+    for origem, dicionario in (('fatores', fatores), ('valores_pessoais', valores_pessoais)):
+        for chave, valores in dicionario.items():
+            valores = np.asarray(valores)
+            if valores.dtype == object:
+                nomes, codigos = np.unique(valores.astype(str), return_inverse=True)
+                categorias[(origem, chave)] = nomes.tolist()
+                valores = codigos
+            esquema.append((origem, chave))
+            colunas.append(valores)
+    return colunas, esquema, categorias
+
+
+def _fechar(segmento, remover=False):
+    """Fecha o segmento sem esconder a exceção em andamento
+
+    Uma exceção levantada com views do segmento ainda vivas (presas no
+    traceback) faz `close()` falhar com BufferError em algumas versões; o
+    mapeamento é liberado quando as views forem coletadas e o nome é removido
+    do mesmo jeito.
+    """
+    try:
+        segmento.close()
+    except BufferError:
+        pass
+    if remover:
+        segmento.unlink()
+
+
+def _decodificar(matriz, esquema, categorias):
+    fatores = {}
+    valores_pessoais = {}
+    for linha, (origem, chave) in zip(matriz, esquema):
+        destino = fatores if origem == 'fatores' else valores_pessoais
+        if (origem, chave) in categorias:
+            destino[chave] = np.array(categorias[(origem, chave)], dtype=object)[linha.astype(int)]
+        else:
+            destino[chave] = linha
+    return fatores, valores_pessoais
+
+
+def _avaliar_fatia(nome_entrada, nome_saida, forma_entrada, forma_saida, esquema, categorias, inicio, fim, tabela):
+    """Executada no worker: avalia as linhas [inicio, fim) e grava na saída compartilhada"""
+    entrada = shared_memory.SharedMemory(name=nome_entrada)
+    saida = shared_memory.SharedMemory(name=nome_saida)
+    try:
+        matriz_entrada = np.ndarray(forma_entrada, dtype=np.float64, buffer=entrada.buf)
+        matriz_saida = np.ndarray(forma_saida, dtype=np.float64, buffer=saida.buf)
+
+        fatores, valores_pessoais = _decodificar(matriz_entrada[:, inicio:fim], esquema, categorias)
+        resultados = lote.avaliar_colunas(fatores, valores_pessoais, tabela)
+        for i, coluna in enumerate(lote.COLUNAS_RESULTADO):
+            matriz_saida[i, inicio:fim] = resultados[coluna]
+
+        # As views precisam ser liberadas antes de fechar os segmentos
+        del matriz_entrada, matriz_saida, fatores, valores_pessoais
+    finally:
+        _fechar(entrada)
+        _fechar(saida)
+    return fim - inicio
+
+
+class AvaliadorParalelo:
+    """Pool de processos reaproveitado entre os blocos de um arquivo"""
+
+    def __init__(self, processos=None):
+        self.processos = processos or processos_disponiveis()
+        self._executor = ProcessPoolExecutor(max_workers=self.processos)
+
+    def avaliar_colunas(self, fatores, valores_pessoais, tabela):
+        """Mesmo resultado de processamento_lote.avaliar_colunas, distribuído entre os processos"""
+        colunas, esquema, categorias = _codificar(fatores, valores_pessoais)
+        n = len(colunas[0])
+        forma_entrada = (len(colunas), n)
+        forma_saida = (len(lote.COLUNAS_RESULTADO), n)
+
+        entrada = shared_memory.SharedMemory(create=True, size=max(8 * forma_entrada[0] * n, 1))
+        saida = shared_memory.SharedMemory(create=True, size=max(8 * forma_saida[0] * n, 1))
+        try:
+            matriz = np.ndarray(forma_entrada, dtype=np.float64, buffer=entrada.buf)
+            for i, coluna in enumerate(colunas):
+                matriz[i] = coluna
+            # Só os workers usam a entrada a partir daqui
+            del matriz, colunas
+
+            limites = np.linspace(0, n, min(self.processos * FATIAS_POR_PROCESSO, n) + 1).astype(int)
+            tarefas = [
+                self._executor.submit(
+                    _avaliar_fatia, entrada.name, saida.name, forma_entrada, forma_saida,
+                    # A própria tabela, não a versão: o worker não relê o arquivo do disco, que
+                    # pode ter sido recarregado, e calcula com a tabela que o pai informa
+                    esquema, categorias, int(inicio), int(fim), tabela
+                )
+                for inicio, fim in zip(limites[:-1], limites[1:]) if fim > inicio
+            ]
+            for tarefa in tarefas:
+                tarefa.result()  # Propaga exceções dos workers
+
+            matriz_saida = np.ndarray(forma_saida, dtype=np.float64, buffer=saida.buf)
+            resultados = {coluna: matriz_saida[i].copy() for i, coluna in enumerate(lote.COLUNAS_RESULTADO)}
+            del matriz_saida
+            return resultados
+        finally:
+            _fechar(entrada, remover=True)
+            _fechar(saida, remover=True)
+
+    def fechar(self):
+        self._executor.shutdown()
@@ -0,0 +1,307 @@
+import numpy as np
+
+from tabelas_impostos import registro_tabelas
+
+
+def calcular_impostos_clt_vetorizado(salarios_brutos, tabela=None):
+    """Calcula INSS e IRRF para um array de salários brutos de uma só vez"""
+    tabela = tabela or registro_tabelas.obter()
+    t = tabela.arrays()
+    salarios = np.asarray(salarios_brutos, dtype=float)
+
+    # Faixa de cada salário: searchsorted 'left' reproduz o bisect_left do cálculo escalar
+    faixa_inss = np.searchsorted(t['inss_limites'], salarios, side='left')
+    inss = t['inss_acumulado'][faixa_inss] + (salarios - t['inss_inicio_faixa'][faixa_inss]) * t['inss_aliquotas'][faixa_inss]
+
+    base_irrf = salarios - inss
+    faixa_irrf = np.searchsorted(t['irrf_limites'], base_irrf, side='left')
+    irrf = np.maximum(base_irrf * t['irrf_aliquotas'][faixa_irrf] - t['irrf_deducoes'][faixa_irrf], 0.0)
+
+    descontos_totais = inss + irrf
+    aliquota_efetiva = np.zeros_like(salarios)
+    positivos = salarios > 0
+    aliquota_efetiva[positivos] = descontos_totais[positivos] / salarios[positivos] * 100
+
+    return {
+        'salario_bruto': salarios,
+        'inss': inss,
+        'irrf': irrf,
+        'salario_liquido': salarios - descontos_totais,
+        'descontos_totais': descontos_totais,
+        'aliquota_efetiva': aliquota_efetiva,
+        'versao_tabela': tabela.versao
+    }
+
+
+def _coluna(colunas, chave, padrao, n):
+    """Equivalente vetorizado de fatores.get(chave, padrao)"""
+    if chave in colunas:
+        return np.asarray(colunas[chave], dtype=float)
+    return np.full(n, float(padrao))
+
+
+def _tamanho(colunas):
+    return len(next(iter(colunas.values()))) if colunas else 0
+
+
+def calcular_impostos_pj_vetorizado(valores_pj_total, tabela=None):
+    """Calcula impostos PJ (Simples Nacional) para um array de valores mensais"""
+    tabela = tabela or registro_tabelas.obter()
+    t = tabela.arrays()
+    valores = np.asarray(valores_pj_total, dtype=float)
+
+    # 40% pro-labore e 60% faturamento da empresa, como no cálculo escalar
+    pro_labore = valores * 0.4
+    faturamento_empresa = valores * 0.6
+    impostos_pro_labore = calcular_impostos_clt_vetorizado(pro_labore, tabela)['descontos_totais']
+
+    faixa_simples = np.searchsorted(t['simples_limites'], faturamento_empresa * 12, side='left')
+    imposto_simples = faturamento_empresa * t['simples_aliquotas'][faixa_simples]
+
+    custo_contabilidade = np.full_like(valores, 200.0)
+    custo_administrativo = np.full_like(valores, 100.0)
+    total_impostos = impostos_pro_labore + imposto_simples + custo_contabilidade + custo_administrativo
+
+    aliquota_efetiva = np.zeros_like(valores)
+    positivos = valores > 0
+    aliquota_efetiva[positivos] = total_impostos[positivos] / valores[positivos] * 100
+
+    return {
+        'valor_total': valores,
+        'pro_labore': pro_labore,
+        'faturamento_empresa': faturamento_empresa,
+        'imposto_pro_labore': impostos_pro_labore,
+        'imposto_simples': imposto_simples,
+        'custo_contabilidade': custo_contabilidade,
+        'custo_administrativo': custo_administrativo,
+        'total_impostos': total_impostos,
+        'renda_liquida': valores - total_impostos,
+        'aliquota_efetiva': aliquota_efetiva,
+        'versao_tabela': tabela.versao
+    }
+
+
+def comparar_clt_pj_vetorizado(valores_clt_bruto, valores_pj_total, tabela=None):
+    """Compara CLT vs PJ (totais anuais incluídos) para arrays de valores"""
+    tabela = tabela or registro_tabelas.obter()
+    valores_clt = np.asarray(valores_clt_bruto, dtype=float)
+
+    clt = calcular_impostos_clt_vetorizado(valores_clt, tabela)
+    ferias = valores_clt + (valores_clt / 3)  # Férias + 1/3
+    fgts_anual = valores_clt * 0.08 * 12
+    clt['total_anual'] = (clt['salario_liquido'] * 13) + ferias + fgts_anual
+    clt['decimo_terceiro'] = valores_clt
+    clt['ferias'] = ferias
+    clt['fgts_anual'] = fgts_anual
+
+    pj = calcular_impostos_pj_vetorizado(valores_pj_total, tabela)
+    pj['total_anual'] = pj['renda_liquida'] * 12
+
+    return {'CLT': clt, 'PJ': pj}
+
+
+def calcular_compensacao_minima_vetorizado(fatores):
+    """Versão vetorizada de nucleo_calculo.calcular_compensacao_minima (colunas de arrays)"""
+    n = _tamanho(fatores)
+    salario_atual = _coluna(fatores, 'salario_atual', 0, n)
+    beneficios_atual = _coluna(fatores, 'beneficios_atual', 0, n)
+    bonus_atual = _coluna(fatores, 'bonus_atual', 0, n)
+    custo_vida = _coluna(fatores, 'custo_vida_nova', 0, n)
+    tempo_viagem_atual = _coluna(fatores, 'tempo_viagem_atual', 0, n)
+    tempo_viagem_novo = _coluna(fatores, 'tempo_viagem_novo', 0, n)
+    dias_presencial = _coluna(fatores, 'dias_presencial_novo', 0, n)
+
+    remuneracao_atual_mensal = salario_atual + beneficios_atual
+    remuneracao_ajustada = remuneracao_atual_mensal * (1 + custo_vida)
+    horas_economizadas_mes = (tempo_viagem_atual - tempo_viagem_novo) * 2 * dias_presencial * 4.33
+    compensacao_minima_mensal = remuneracao_ajustada + horas_economizadas_mes * 30 + bonus_atual / 12
+
+    return np.maximum(compensacao_minima_mensal, remuneracao_atual_mensal)
+
+
+def calcular_compatibilidade_valores_vetorizado(fatores, valores_pessoais):
+    """Versão vetorizada de nucleo_calculo.calcular_compatibilidade_valores
+
+    `valores_pessoais` também é um dicionário de colunas; as prioridades
+    ('prioridade_1'..'prioridade_3') são arrays de texto opcionais.
+    """
+    n = _tamanho(fatores)
+    dias_presencial = _coluna(fatores, 'dias_presencial_novo', 3, n)
+    tempo_deslocamento = _coluna(fatores, 'tempo_viagem_novo', 0.5, n)
+
+    flexibilidade = np.select(
+        [dias_presencial <= 1, dias_presencial == 2, dias_presencial == 3, dias_presencial == 4],
+        [100.0, 80.0, 60.0, 40.0], 20.0
+    )
+    equilibrio = np.select(
+        [tempo_deslocamento <= 0.5, tempo_deslocamento <= 1.0, tempo_deslocamento <= 1.5, tempo_deslocamento <= 2.0],
+        [100.0, 80.0, 60.0, 40.0], 20.0
+    )
+
+    def pessoal(chave):
+        return np.asarray(valores_pessoais[chave], dtype=float)
+
+    compatibilidade = {
+        'estabilidade_financeira': np.minimum(pessoal('estabilidade_financeira'), _coluna(fatores, 'estabilidade', 5, n)) / 10 * 100,
+        'crescimento_carreira': np.minimum(pessoal('crescimento_carreira'), _coluna(fatores, 'crescimento_carreira', 5, n)) / 10 * 100,
+        'flexibilidade_tempo': np.minimum(pessoal('flexibilidade_tempo') * 10, flexibilidade),
+        'equilibrio_vida_pessoal': np.minimum(pessoal('equilibrio_vida_pessoal') * 10, equilibrio),
+        'inovacao_tecnologia': np.minimum(pessoal('inovacao_tecnologia'), _coluna(fatores, 'inovacao_tecnologia_nova', 5, n)) / 10 * 100,
+        'cultura_empresa': np.minimum(pessoal('cultura_empresa'), _coluna(fatores, 'cultura_empresa_nova', 5, n)) / 10 * 100
+    }
+
+    # Peso 1.5 quando o valor está entre as 3 prioridades
+    prioridades = [np.asarray(valores_pessoais.get(f'prioridade_{i}', np.full(n, '')), dtype=object) for i in (1, 2, 3)]
+
+    def peso(nome_prioridade):
+        escolhido = (prioridades[0] == nome_prioridade) | (prioridades[1] == nome_prioridade) | (prioridades[2] == nome_prioridade)
+        return np.where(escolhido, 1.5, 1.0)
+
+    pesos = {
+        'estabilidade_financeira': peso('Estabilidade Financeira'),
+        'crescimento_carreira': peso('Crescimento na Carreira')
+    }
+
+    total_compatibilidade = np.zeros(n)
+    total_pesos = np.zeros(n)
+    for chave, valor in compatibilidade.items():
+        p = pesos.get(chave, 1.0)
+        total_compatibilidade = total_compatibilidade + valor * p
+        total_pesos = total_pesos + p
+
+    return {
+        'compatibilidade_geral': total_compatibilidade / total_pesos,
+        'detalhado': compatibilidade
+    }
+
+
+def calcular_valor_ideal_vetorizado(fatores, valores_pessoais, compensacao_minima=None, compatibilidade=None):
+    """Versão vetorizada de nucleo_calculo.calcular_valor_ideal"""
+    n = _tamanho(fatores)
+    if compensacao_minima is None:
+        compensacao_minima = calcular_compensacao_minima_vetorizado(fatores)
+    if compatibilidade is None:
+        compatibilidade = calcular_compatibilidade_valores_vetorizado(fatores, valores_pessoais)
+
+    fator_total = (1.3 +
+                   _coluna(fatores, 'crescimento_carreira', 5, n) * 0.02 +
+                   _coluna(fatores, 'estabilidade', 5, n) * 0.015 +
+                   _coluna(fatores, 'beneficios_qualidade', 5, n) * 0.015)
+    valor_ideal = compensacao_minima * fator_total
+
+    fator_valores_pessoais = compatibilidade['compatibilidade_geral'] / 100
+    return np.select(
+        [fator_valores_pessoais > 0.8, fator_valores_pessoais < 0.5],
+        [valor_ideal * 0.95, valor_ideal * 1.10], valor_ideal
+    )
+
+
+def calcular_faixa_recomendada_vetorizado(fatores, valores_pessoais, compatibilidade=None):
+    """Versão vetorizada de nucleo_calculo.calcular_faixa_recomendada"""
+    minimo = calcular_compensacao_minima_vetorizado(fatores)
+    ideal = calcular_valor_ideal_vetorizado(fatores, valores_pessoais, minimo, compatibilidade)
+    return {
+        'minimo': minimo,
+        'ideal': ideal,
+        'maximo_negociacao': ideal * 1.25
+    }
+
+
+def calcular_comparacao_modalidade_vetorizado(modalidades, valores_ideais, tabela=None):
+    """Compara CLT vs PJ no valor ideal de cada linha, partindo da modalidade de cada uma"""
+    ideais = np.asarray(valores_ideais, dtype=float)
+    eh_clt = np.asarray(modalidades, dtype=object) == 'CLT'
+    valores_clt = np.where(eh_clt, ideais, calcular_equivalencia_clt_pj_vetorizado(ideais, tabela))
+    valores_pj = np.where(eh_clt, calcular_equivalencia_pj_clt_vetorizado(ideais, tabela), ideais)
+    return comparar_clt_pj_vetorizado(valores_clt, valores_pj, tabela)
+
+
+def _avaliar_vetorizado(funcao, valores):
+    """Versão vetorizada de FuncaoPorPartes.avaliar"""
+    t = funcao.arrays()
+    x = np.asarray(valores, dtype=float)
+    trecho = np.maximum(np.searchsorted(t['inicios'], x, side='right') - 1, 0)
+    return t['valores_inicio'][trecho] + t['inclinacoes'][trecho] * (x - t['inicios'][trecho])
+
+
+def _inverter_vetorizado(funcao, valores):
+    """Versão vetorizada de FuncaoPorPartes.inverter"""
+    t = funcao.arrays()
+    alvos = np.asarray(valores, dtype=float)
+    trecho = np.minimum(np.searchsorted(t['valores_fim'], alvos, side='left'), len(t['inicios']) - 1)
+    return t['inicios'][trecho] + np.maximum(alvos - t['valores_inicio'][trecho], 0.0) / t['inclinacoes'][trecho]
+
+
+def calcular_bruto_para_liquido_clt_vetorizado(liquidos_desejados, tabela=None):
+    """Salários brutos CLT que resultam em cada líquido desejado (inversão exata por trechos)"""
+    from inversao_impostos import funcao_liquido_clt
+    return _inverter_vetorizado(funcao_liquido_clt(tabela), liquidos_desejados)
+
+
+def calcular_valor_pj_para_liquido_vetorizado(liquidos_desejados, tabela=None):
+    """Valores mensais PJ que resultam em cada renda líquida desejada"""
+    from inversao_impostos import funcao_liquido_pj
+    return _inverter_vetorizado(funcao_liquido_pj(tabela), liquidos_desejados)
+
+
+def calcular_equivalencia_pj_clt_vetorizado(valores_clt, tabela=None):
+    """Valores PJ cujo total anual líquido iguala o de cada salário CLT"""
+    from inversao_impostos import funcao_liquido_pj, funcao_total_anual_clt
+    total_anual_clt = _avaliar_vetorizado(funcao_total_anual_clt(tabela), valores_clt)
+    return _inverter_vetorizado(funcao_liquido_pj(tabela), total_anual_clt / 12)
+
+
+def calcular_equivalencia_clt_pj_vetorizado(valores_pj, tabela=None):
+    """Salários CLT cujo total anual iguala o total anual líquido de cada valor PJ"""
+    from inversao_impostos import funcao_liquido_pj, funcao_total_anual_clt
+    total_anual_pj = _avaliar_vetorizado(funcao_liquido_pj(tabela), valores_pj) * 12
+    return _inverter_vetorizado(funcao_total_anual_clt(tabela), total_anual_pj)
+
+
+# Eixo especial da grade: salário oferecido, comparado à faixa em vez de entrar nos fatores
+EIXO_SALARIO_OFERECIDO = 'salario_oferecido'
+
+
+def calcular_grade_sensibilidade(fatores, valores_pessoais, eixos):
+    """Avalia a faixa recomendada sobre todas as combinações dos eixos de uma vez
+
+    `fatores` e `valores_pessoais` são os dicionários escalares do app; `eixos`
+    mapeia campos de `fatores` (ex.: 'dias_presencial_novo', 'tempo_viagem_novo',
+    'custo_vida_nova') ou 'salario_oferecido' para os valores a percorrer.
+    Retorna tensores com uma dimensão por eixo, na ordem de `eixos`:
+    'minimo', 'ideal', 'maximo_negociacao' e, se houver eixo de salário
+    oferecido, 'cobertura' (% do mínimo coberta pela oferta).
+    """
+    nomes = list(eixos)
+    valores_eixos = [np.asarray(eixos[nome], dtype=float) for nome in nomes]
+    forma = tuple(len(valores) for valores in valores_eixos)
+
+    # O salário oferecido não altera a faixa: avalia só os demais eixos e faz broadcast nele
+    forma_faixa = tuple(1 if nome == EIXO_SALARIO_OFERECIDO else tamanho for nome, tamanho in zip(nomes, forma))
+    eixos_faixa = [valores[:1] if nome == EIXO_SALARIO_OFERECIDO else valores for nome, valores in zip(nomes, valores_eixos)]
+    grade = dict(zip(nomes, (eixo.ravel() for eixo in np.meshgrid(*eixos_faixa, indexing='ij'))))
+    n = int(np.prod(forma_faixa))
+
+    colunas_fatores = {
+        chave: np.full(n, float(valor)) for chave, valor in fatores.items()
+        if isinstance(valor, (int, float)) and not isinstance(valor, bool)
+    }
+    colunas_fatores.update({chave: valores for chave, valores in grade.items() if chave != EIXO_SALARIO_OFERECIDO})
+    colunas_pessoais = {
+        chave: np.full(n, valor, dtype=object if isinstance(valor, str) else float)
+        for chave, valor in valores_pessoais.items()
+    }
+
+    faixa = calcular_faixa_recomendada_vetorizado(colunas_fatores, colunas_pessoais)
+    resultado = {'eixos': nomes, 'valores_eixos': valores_eixos}
+    for chave in ('minimo', 'ideal', 'maximo_negociacao'):
+        resultado[chave] = np.broadcast_to(faixa[chave].reshape(forma_faixa), forma)
+
+    if EIXO_SALARIO_OFERECIDO in nomes:
+        posicao = nomes.index(EIXO_SALARIO_OFERECIDO)
+        salarios = valores_eixos[posicao].reshape([-1 if i == posicao else 1 for i in range(len(nomes))])
+        minimo = faixa['minimo'].reshape(forma_faixa)
+        resultado['cobertura'] = np.divide(
+            salarios * 100, minimo, out=np.zeros(forma), where=np.broadcast_to(minimo > 0, forma)
+        )
+    return resultado
@@ -0,0 +1,360 @@
+"""Núcleo de cálculo da calculadora, independente do Streamlit.
+
+Todas as funções recebem entradas simples (dicionários `fatores` e
+`valores_pessoais` com as mesmas chaves usadas no app) e podem ser usadas
+em jobs em lote, workers e benchmarks sem iniciar o runtime do Streamlit.
+Erros são propagados como exceções; quem chama decide como exibi-los.
+"""
+from tabelas_impostos import registro_tabelas
+
+VALORES_PESSOAIS_PADRAO = {
+    'estabilidade_financeira': 5,
+    'flexibilidade_tempo': 5,
+    'crescimento_carreira': 5,
+    'equilibrio_vida_pessoal': 5,
+    'impacto_social': 3,
+    'inovacao_tecnologia': 5,
+    'cultura_empresa': 5,
+    'aprendizado_continuo': 5,
+    'reconhecimento': 5,
+    'autonomia': 5,
+    'seguranca_juridica': 5,
+    'beneficios_nao_monetarios': 5
+}
+
+
+def _prioridades(valores_pessoais):
+    return [
+        valores_pessoais.get('prioridade_1', ''),
+        valores_pessoais.get('prioridade_2', ''),
+        valores_pessoais.get('prioridade_3', '')
+    ]
+
+
+def calcular_compatibilidade_flexibilidade(dias_presencial, valor_pessoal):
+    """Calcula compatibilidade para flexibilidade de tempo"""
+    # Quanto mais presencial, menor a compatibilidade para quem valoriza flexibilidade
+    if dias_presencial <= 1:
+        compatibilidade = 100
+    elif dias_presencial == 2:
+        compatibilidade = 80
+    elif dias_presencial == 3:
+        compatibilidade = 60
+    elif dias_presencial == 4:
+        compatibilidade = 40
+    else:
+        compatibilidade = 20
+
+    # Ajustar pelo valor pessoal
+    return min(valor_pessoal * 10, compatibilidade)
+
+
+def calcular_compatibilidade_equilibrio(tempo_deslocamento, valor_pessoal):
+    """Calcula compatibilidade para equilíbrio vida-trabalho"""
+    if tempo_deslocamento <= 0.5:
+        compatibilidade = 100
+    elif tempo_deslocamento <= 1.0:
+        compatibilidade = 80
+    elif tempo_deslocamento <= 1.5:
+        compatibilidade = 60
+    elif tempo_deslocamento <= 2.0:
+        compatibilidade = 40
+    else:
+        compatibilidade = 20
+
+    return min(valor_pessoal * 10, compatibilidade)
+
+
+def calcular_compatibilidade_valores(fatores, valores_pessoais):
+    """Calcula compatibilidade entre valores pessoais e nova oportunidade"""
+    compatibilidade = {
+        'estabilidade_financeira': min(
+            valores_pessoais['estabilidade_financeira'],
+            fatores.get('estabilidade', 5)
+        ) / 10 * 100,
+        'crescimento_carreira': min(
+            valores_pessoais['crescimento_carreira'],
+            fatores.get('crescimento_carreira', 5)
+        ) / 10 * 100,
+        'flexibilidade_tempo': calcular_compatibilidade_flexibilidade(
+            fatores.get('dias_presencial_novo', 3),
+            valores_pessoais['flexibilidade_tempo']
+        ),
+        'equilibrio_vida_pessoal': calcular_compatibilidade_equilibrio(
+            fatores.get('tempo_viagem_novo', 0.5),
+            valores_pessoais['equilibrio_vida_pessoal']
+        ),
+        'inovacao_tecnologia': min(
+            valores_pessoais['inovacao_tecnologia'],
+            fatores.get('inovacao_tecnologia_nova', 5)
+        ) / 10 * 100,
+        'cultura_empresa': min(
+            valores_pessoais['cultura_empresa'],
+            fatores.get('cultura_empresa_nova', 5)
+        ) / 10 * 100
+    }
+
+    # Média ponderada pelas prioridades
+    prioridades = _prioridades(valores_pessoais)
+    pesos = {
+        'estabilidade_financeira': 1.5 if 'Estabilidade Financeira' in prioridades else 1.0,
+        'crescimento_carreira': 1.5 if 'Crescimento na Carreira' in prioridades else 1.0
+    }
+
+    total_compatibilidade = 0
+    total_pesos = 0
+
+    for chave, valor in compatibilidade.items():
+        peso = pesos.get(chave, 1.0)
+        total_compatibilidade += valor * peso
+        total_pesos += peso
+
+    return {
+        'compatibilidade_geral': total_compatibilidade / total_pesos if total_pesos > 0 else 0,
+        'detalhado': compatibilidade
+    }
+
+
+def verificar_prioridades(fatores, valores_pessoais):
+    """Verifica se a oportunidade atende às prioridades pessoais"""
+    atendidas = 0
+
+    for prioridade in _prioridades(valores_pessoais):
+        if prioridade == 'Estabilidade Financeira':
+            if fatores.get('estabilidade', 0) >= 7:
+                atendidas += 1
+        elif prioridade == 'Flexibilidade de Tempo':
+            if fatores.get('dias_presencial_novo', 0) <= 2:
+                atendidas += 1
+        elif prioridade == 'Crescimento na Carreira':
+            if fatores.get('crescimento_carreira', 0) >= 7:
+                atendidas += 1
+        elif prioridade == 'Equilíbrio Vida Pessoal':
+            if fatores.get('tempo_viagem_novo', 0) <= 1.0:
+                atendidas += 1
+        # Adicionar outras condições conforme necessário
+
+    return atendidas >= 2  # Atende pelo menos 2 das 3 prioridades
+
+
+def calcular_impostos_clt(salario_bruto, tabela=None):
+    """Calcula impostos CLT pela tabela vigente (ou pela `tabela` informada)"""
+    tabela = tabela or registro_tabelas.obter()
+
+    inss = tabela.calcular_inss(salario_bruto)
+    base_irrf = salario_bruto - inss
+    irrf = tabela.calcular_irrf(base_irrf)
+
+    salario_liquido = salario_bruto - inss - irrf
+
+    return {
+        'salario_bruto': salario_bruto,
+        'inss': inss,
+        'irrf': irrf,
+        'salario_liquido': salario_liquido,
+        'descontos_totais': inss + irrf,
+        'aliquota_efetiva': ((inss + irrf) / salario_bruto) * 100 if salario_bruto > 0 else 0,
+        'versao_tabela': tabela.versao
+    }
+
+
+def calcular_impostos_pj(valor_pj_total, tabela=None):
+    """Calcula impostos para PJ (Simples Nacional)"""
+    tabela = tabela or registro_tabelas.obter()
+
+    # Para PJ, consideramos que 40% é pro-labore e 60% é lucro/empresa
+    pro_labore = valor_pj_total * 0.4
+    faturamento_empresa = valor_pj_total * 0.6
+
+    # Impostos sobre pro-labore (como CLT)
+    impostos_pro_labore = calcular_impostos_clt(pro_labore, tabela)
+
+    # Simples Nacional sobre faturamento da empresa
+    # Anexo III - Serviços (aproximação)
+    faturamento_anual = faturamento_empresa * 12
+
+    aliquota_simples = tabela.aliquota_simples(faturamento_anual)
+
+    imposto_simples = faturamento_empresa * aliquota_simples
+
+    # Custo contábil mensal
+    custo_contabilidade = 200.0
+
+    # Outros custos PJ
+    custo_administrativo = 100.0
+
+    total_impostos_pj = (impostos_pro_labore['descontos_totais'] +
+                         imposto_simples +
+                         custo_contabilidade +
+                         custo_administrativo)
+
+    renda_liquida_pj = valor_pj_total - total_impostos_pj
+
+    return {
+        'valor_total': valor_pj_total,
+        'pro_labore': pro_labore,
+        'faturamento_empresa': faturamento_empresa,
+        'imposto_pro_labore': impostos_pro_labore['descontos_totais'],
+        'imposto_simples': imposto_simples,
+        'custo_contabilidade': custo_contabilidade,
+        'custo_administrativo': custo_administrativo,
+        'total_impostos': total_impostos_pj,
+        'renda_liquida': renda_liquida_pj,
+        'aliquota_efetiva': (total_impostos_pj / valor_pj_total) * 100 if valor_pj_total > 0 else 0,
+        'versao_tabela': tabela.versao
+    }
+
+
+def comparar_clt_pj(valor_clt_bruto, valor_pj_total, tabela=None):
+    """Compara CLT vs PJ considerando todos os fatores"""
+    tabela = tabela or registro_tabelas.obter()
+
+    # CLT
+    clt = calcular_impostos_clt(valor_clt_bruto, tabela)
+
+    # Benefícios CLT (13º, férias, FGTS)
+    decimo_terceiro = valor_clt_bruto
+    ferias = valor_clt_bruto + (valor_clt_bruto / 3)  # Férias + 1/3
+    fgts_anual = valor_clt_bruto * 0.08 * 12
+
+    clt['total_anual'] = (clt['salario_liquido'] * 13) + ferias + fgts_anual
+    clt['decimo_terceiro'] = decimo_terceiro
+    clt['ferias'] = ferias
+    clt['fgts_anual'] = fgts_anual
+
+    # PJ
+    pj = calcular_impostos_pj(valor_pj_total, tabela)
+    pj['total_anual'] = pj['renda_liquida'] * 12
+
+    return {'CLT': clt, 'PJ': pj}
+
+
+def calcular_valor_hora_atual(fatores):
+    """Calcula o valor real por hora considerando tempo de deslocamento"""
+    salario_mensal = fatores.get('salario_atual', 0)
+    beneficios = fatores.get('beneficios_atual', 0)
+    tempo_viagem = fatores.get('tempo_viagem_atual', 0)
+
+    # 44 horas semanais = 220 horas mensais (44 * 5)
+    horas_trabalho = 220
+    horas_deslocamento = tempo_viagem * 2 * 22  # Ida e volta, 22 dias úteis
+
+    horas_totais = horas_trabalho + horas_deslocamento
+
+    if horas_totais > 0:
+        return (salario_mensal + beneficios) / horas_totais
+    else:
+        return 0
+
+
+def calcular_horas_economizadas(fatores):
+    """Calcula as horas de deslocamento economizadas por mês"""
+    return (fatores.get('tempo_viagem_atual', 0) - fatores.get('tempo_viagem_novo', 0)) * 2 * fatores.get('dias_presencial_novo', 0) * 4.33
+
+
+def calcular_compensacao_minima(fatores):
+    """Calcula a compensação mínima aceitável"""
+    # Salário atual total MENSAL (não anual)
+    salario_atual = fatores.get('salario_atual', 0)
+    beneficios_atual = fatores.get('beneficios_atual', 0)
+    bonus_atual = fatores.get('bonus_atual', 0)
+    custo_vida = fatores.get('custo_vida_nova', 0)
+    tempo_viagem_atual = fatores.get('tempo_viagem_atual', 0)
+    tempo_viagem_novo = fatores.get('tempo_viagem_novo', 0)
+    dias_presencial = fatores.get('dias_presencial_novo', 0)
+
+    # Remuneração total atual mensal
+    remuneracao_atual_mensal = salario_atual + beneficios_atual
+
+    # Ajuste pelo custo de vida (sobre a remuneração atual)
+    remuneracao_ajustada = remuneracao_atual_mensal * (1 + custo_vida)
+
+    # Ajuste por qualidade de vida (tempo de deslocamento)
+    # Considerando valor de R$ 30/hora para tempo livre
+    horas_economizadas_mes = (tempo_viagem_atual - tempo_viagem_novo) * 2 * dias_presencial * 4.33
+    valor_tempo_economizado = horas_economizadas_mes * 30
+
+    # Bônus convertido para mensal
+    bonus_mensal = bonus_atual / 12
+
+    compensacao_minima_mensal = remuneracao_ajustada + valor_tempo_economizado + bonus_mensal
+
+    return max(compensacao_minima_mensal, remuneracao_atual_mensal)
+
+
+def calcular_valor_ideal(fatores, valores_pessoais, compensacao_minima=None, compatibilidade=None):
+    """Calcula o valor ideal a ser pedido
+
+    `compensacao_minima` e `compatibilidade` podem ser passados quando já
+    foram calculados, evitando recalculá-los.
+    """
+    if compensacao_minima is None:
+        compensacao_minima = calcular_compensacao_minima(fatores)
+    if compatibilidade is None:
+        compatibilidade = calcular_compatibilidade_valores(fatores, valores_pessoais)
+
+    crescimento = fatores.get('crescimento_carreira', 5)
+    estabilidade = fatores.get('estabilidade', 5)
+    beneficios_qualidade = fatores.get('beneficios_qualidade', 5)
+
+    # Fator base de crescimento (20-40% acima do mínimo)
+    fator_base = 1.3
+
+    # Ajustes por fatores qualitativos
+    ajuste_crescimento = crescimento * 0.02  # 2% por ponto
+    ajuste_estabilidade = estabilidade * 0.015  # 1.5% por ponto
+    ajuste_beneficios = beneficios_qualidade * 0.015  # 1.5% por ponto
+
+    fator_total = (fator_base +
+                   ajuste_crescimento +
+                   ajuste_estabilidade +
+                   ajuste_beneficios)
+
+    valor_ideal_mensal = compensacao_minima * fator_total
+
+    # Ajuste por compatibilidade de valores pessoais
+    fator_valores_pessoais = compatibilidade['compatibilidade_geral'] / 100
+
+    # Se compatibilidade alta (>80%), pode aceitar um pouco menos
+    if fator_valores_pessoais > 0.8:
+        valor_ideal_mensal = valor_ideal_mensal * 0.95  # 5% menos
+    # Se compatibilidade baixa (<50%), exige mais compensação
+    elif fator_valores_pessoais < 0.5:
+        valor_ideal_mensal = valor_ideal_mensal * 1.10  # 10% mais
+
+    return valor_ideal_mensal
+
+
+def calcular_faixa_recomendada(fatores, valores_pessoais, compensacao_minima=None, valor_ideal=None):
+    """Calcula uma faixa de valores recomendados"""
+    minimo = compensacao_minima if compensacao_minima is not None else calcular_compensacao_minima(fatores)
+    ideal = valor_ideal if valor_ideal is not None else calcular_valor_ideal(fatores, valores_pessoais, minimo)
+
+    # Faixa: mínimo até 25% acima do ideal para negociação
+    maximo = ideal * 1.25
+
+    return {
+        'minimo': minimo,
+        'ideal': ideal,
+        'maximo_negociacao': maximo
+    }
+
+
+def calcular_equivalencia_pj_clt(valor_clt, tabela=None):
+    """Calcula valor PJ cujo total anual líquido iguala o do CLT (13º, férias, FGTS)"""
+    # Solver por trechos das tabelas; importado aqui porque depende deste módulo
+    from inversao_impostos import calcular_equivalencia_pj_clt as equivalencia
+    return equivalencia(valor_clt, tabela)
+
+
+def calcular_equivalencia_clt_pj(valor_pj, tabela=None):
+    """Calcula valor CLT equivalente a um valor PJ (inverso de calcular_equivalencia_pj_clt)"""
+    from inversao_impostos import calcular_equivalencia_clt_pj as equivalencia
+    return equivalencia(valor_pj, tabela)
+
+
+def calcular_comparacao_modalidade(fatores, faixa, tabela=None):
+    """Compara CLT vs PJ no valor ideal, partindo da modalidade selecionada"""
+    if fatores.get('modalidade', 'CLT') == 'CLT':
+        return comparar_clt_pj(faixa['ideal'], calcular_equivalencia_pj_clt(faixa['ideal'], tabela), tabela)
+    return comparar_clt_pj(calcular_equivalencia_clt_pj(faixa['ideal'], tabela), faixa['ideal'], tabela)
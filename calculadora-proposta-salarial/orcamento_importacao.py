@@ -0,0 +1,66 @@
+"""Mede o tempo de importação do núcleo de cálculo e falha se passar do orçamento.
+
+O núcleo (`nucleo_calculo`) é o que jobs em lote, workers e o primeiro
+script run do app importam antes de qualquer gráfico; ele não pode puxar
+pandas, numpy, matplotlib ou streamlit.
+
+Uso:
+    python orcamento_importacao.py [--modulo nucleo_calculo] [--orcamento-ms 20]
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+ORCAMENTO_MS_PADRAO = 20.0
+MODULOS_PESADOS = ('pandas', 'numpy', 'matplotlib', 'seaborn', 'streamlit')
+REPETICOES = 5
+
+
+def medir_importacao(modulo):
+    """Importa o módulo num processo novo e retorna (tempo_ms, modulos_pesados_carregados)"""
+    codigo = (
+        "import sys\n"
+        f"import {modulo}\n"
+        f"print(','.join(m for m in {MODULOS_PESADOS!r} if m in sys.modules))\n"
+    )
+    processo = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', codigo],
+        capture_output=True, text=True, check=True,
+        cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+
+    # Formato do -X importtime: "import time: self [us] | cumulative | imported package"
+    tempo_us = 0
+    for linha in processo.stderr.splitlines():
+        partes = [parte.strip() for parte in linha.split('|')]
+        if len(partes) == 3 and partes[2] == modulo:
+            tempo_us = int(partes[1])
+
+    pesados = [m for m in processo.stdout.strip().split(',') if m]
+    return tempo_us / 1000, pesados
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Verifica o orçamento de tempo de importação do núcleo de cálculo")
+    parser.add_argument('--modulo', default='nucleo_calculo')
+    parser.add_argument('--orcamento-ms', type=float, default=ORCAMENTO_MS_PADRAO)
+    args = parser.parse_args(argv)
+
+    # Mediana de processos novos para reduzir ruído de disco/cache
+    medicoes = sorted(medir_importacao(args.modulo) for _ in range(REPETICOES))
+    tempo_ms, pesados = medicoes[len(medicoes) // 2]
+
+    print(f"{args.modulo}: {tempo_ms:.2f} ms (orçamento {args.orcamento_ms:.2f} ms)")
+    if pesados:
+        print(f"❌ Módulos pesados importados: {', '.join(pesados)}")
+        return 1
+    if tempo_ms > args.orcamento_ms:
+        print("❌ Acima do orçamento de importação")
+        return 1
+    print("✅ Dentro do orçamento")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,288 @@
+"""Processamento em lote de candidatos a partir de arquivos CSV/Parquet.
+
+Lê o arquivo em blocos (memória limitada independente do tamanho),
+calcula a faixa recomendada, os líquidos CLT/PJ e a compatibilidade de
+cada linha com o motor vetorizado e grava os resultados em streaming.
+Linhas inválidas vão para um relatório de erros em vez de interromper o job.
+
+Colunas de valores pessoais são opcionais e usam o prefixo `valor_`
+(ex.: `valor_crescimento_carreira`), pois alguns nomes coincidem com as
+avaliações da empresa.
+
+Uso:
+    python processamento_lote.py candidatos.csv resultados.csv --erros erros.csv
+"""
+import argparse
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+import motor_vetorizado as motor
+from nucleo_calculo import VALORES_PESSOAIS_PADRAO
+from tabelas_impostos import registro_tabelas
+
+# Colunas obrigatórias e faixa de valores válidos (mínimo, máximo)
+COLUNAS_NUMERICAS = {
+    'salario_atual': (0.0, None),
+    'beneficios_atual': (0.0, None),
+    'bonus_atual': (0.0, None),
+    'tempo_viagem_atual': (0.0, 24.0),
+    'tempo_viagem_novo': (0.0, 24.0),
+    'dias_presencial_novo': (0, 5),
+    'custo_vida_nova': (-1.0, None),  # Fração: 0.10 = +10%
+    'crescimento_carreira': (1, 10),
+    'estabilidade': (1, 10),
+    'beneficios_qualidade': (1, 10),
+    'cultura_empresa_nova': (1, 10),
+    'inovacao_tecnologia_nova': (1, 10),
+}
+MODALIDADES = ('CLT', 'PJ')
+COLUNAS_PRIORIDADES = ('prioridade_1', 'prioridade_2', 'prioridade_3')
+COLUNAS_IDENTIFICACAO = ('candidato_id', 'id', 'nome')
+PREFIXO_VALOR_PESSOAL = 'valor_'
+
+COLUNAS_RESULTADO = [
+    'minimo', 'ideal', 'maximo_negociacao',
+    'liquido_clt', 'liquido_pj', 'total_anual_clt', 'total_anual_pj',
+    'compatibilidade'
+]
+
+TAMANHO_BLOCO_PADRAO = 50_000
+
+
+class ColunasAusentesError(ValueError):
+    """O arquivo não tem alguma das colunas obrigatórias"""
+
+
+def _validar_bloco(bloco):
+    """Converte as colunas do bloco e separa linhas inválidas
+
+    Retorna (fatores, valores_pessoais, mascara_valida, erros): dicionários
+    de colunas só com as linhas válidas e a lista de (linha, motivo). Uma
+    coluna obrigatória ausente invalida o arquivo inteiro (ColunasAusentesError).
+    """
+    ausentes = [coluna for coluna in COLUNAS_NUMERICAS if coluna not in bloco]
+    if ausentes:
+        raise ColunasAusentesError(f"Colunas obrigatórias ausentes: {', '.join(ausentes)}")
+
+    n = len(bloco)
+    motivos = np.full(n, '', dtype=object)
+    colunas = {}
+    valores_pessoais = {}
+
+    for coluna, (minimo, maximo) in COLUNAS_NUMERICAS.items():
+        valores = pd.to_numeric(bloco[coluna], errors='coerce').to_numpy(dtype=float)
+        invalidos = ~np.isfinite(valores)
+        if minimo is not None:
+            invalidos |= valores < minimo
+        if maximo is not None:
+            invalidos |= valores > maximo
+        motivos[invalidos] = motivos[invalidos] + f'{coluna} inválido; '
+        colunas[coluna] = valores
+
+    if 'modalidade' in bloco:
+        modalidade = bloco['modalidade'].astype(str).str.strip().str.upper().to_numpy(dtype=object)
+    else:
+        modalidade = np.full(n, 'CLT', dtype=object)
+    invalidos = ~np.isin(modalidade, MODALIDADES)
+    motivos[invalidos] = motivos[invalidos] + 'modalidade inválida; '
+    colunas['modalidade'] = modalidade
+
+    # Valores pessoais são opcionais: usam o padrão do app quando ausentes
+    for chave, padrao in VALORES_PESSOAIS_PADRAO.items():
+        coluna = PREFIXO_VALOR_PESSOAL + chave
+        if coluna in bloco:
+            valores = pd.to_numeric(bloco[coluna], errors='coerce').to_numpy(dtype=float)
+            invalidos = ~np.isfinite(valores) | (valores < 1) | (valores > 10)
+            motivos[invalidos] = motivos[invalidos] + f'{coluna} inválido; '
+        else:
+            valores = np.full(n, float(padrao))
+        valores_pessoais[chave] = valores
+
+    for chave in COLUNAS_PRIORIDADES:
+        if chave in bloco:
+            valores_pessoais[chave] = bloco[chave].fillna('').astype(str).to_numpy(dtype=object)
+        else:
+            valores_pessoais[chave] = np.full(n, '', dtype=object)
+
+    mascara_valida = motivos == ''
+    linhas_invalidas = bloco.index.to_numpy()[~mascara_valida]
+    erros = [(int(linha), motivo.rstrip('; ')) for linha, motivo in zip(linhas_invalidas, motivos[~mascara_valida])]
+    return (
+        {chave: valores[mascara_valida] for chave, valores in colunas.items()},
+        {chave: valores[mascara_valida] for chave, valores in valores_pessoais.items()},
+        mascara_valida,
+        erros
+    )
+
+
+def avaliar_colunas(fatores, valores_pessoais, tabela=None):
+    """Avalia dicionários de colunas já validadas e devolve as colunas de resultado"""
+    compatibilidade = motor.calcular_compatibilidade_valores_vetorizado(fatores, valores_pessoais)
+    faixa = motor.calcular_faixa_recomendada_vetorizado(fatores, valores_pessoais, compatibilidade)
+    comparacao = motor.calcular_comparacao_modalidade_vetorizado(fatores['modalidade'], faixa['ideal'], tabela)
+
+    return {
+        'minimo': faixa['minimo'],
+        'ideal': faixa['ideal'],
+        'maximo_negociacao': faixa['maximo_negociacao'],
+        'liquido_clt': comparacao['CLT']['salario_liquido'],
+        'liquido_pj': comparacao['PJ']['renda_liquida'],
+        'total_anual_clt': comparacao['CLT']['total_anual'],
+        'total_anual_pj': comparacao['PJ']['total_anual'],
+        'compatibilidade': compatibilidade['compatibilidade_geral'],
+    }
+
+
+def avaliar_bloco(bloco, tabela=None, avaliador=None):
+    """Avalia um DataFrame de candidatos
+
+    Retorna (resultados, erros): um DataFrame com uma linha por candidato
+    válido e a lista de (linha, motivo) das linhas rejeitadas. Com um
+    `avaliador` (lote_paralelo.AvaliadorParalelo) as linhas são divididas
+    entre processos; o resultado é o mesmo.
+    """
+    tabela = tabela or registro_tabelas.obter()
+    fatores, valores_pessoais, mascara_valida, erros = _validar_bloco(bloco)
+
+    resultados = pd.DataFrame({'linha': bloco.index.to_numpy()[mascara_valida]})
+    for coluna in COLUNAS_IDENTIFICACAO:
+        if coluna in bloco:
+            resultados[coluna] = bloco[coluna].to_numpy()[mascara_valida]
+    resultados['modalidade'] = fatores['modalidade']
+
+    if mascara_valida.any():
+        avaliar = avaliador.avaliar_colunas if avaliador is not None else avaliar_colunas
+        for coluna, valores in avaliar(fatores, valores_pessoais, tabela).items():
+            resultados[coluna] = valores
+    else:
+        for coluna in COLUNAS_RESULTADO:
+            resultados[coluna] = np.empty(0)
+    resultados['versao_tabela'] = tabela.versao
+
+    return resultados, erros
+
+
+def ler_blocos(caminho, tamanho_bloco=TAMANHO_BLOCO_PADRAO):
+    """Lê um CSV ou Parquet em blocos de DataFrames com índice = número da linha no arquivo
+
+    No CSV é a linha do texto (o cabeçalho é a linha 1, o primeiro candidato a
+    linha 2); no Parquet, a posição do registro contada a partir de 1.
+    """
+    inicio = 2
+    if caminho.lower().endswith('.parquet'):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Leitura de Parquet requer o pacote 'pyarrow' (pip install pyarrow)")
+        arquivo = pq.ParquetFile(caminho)
+        blocos = (lote.to_pandas() for lote in arquivo.iter_batches(batch_size=tamanho_bloco))
+        inicio = 1
+    else:
+        blocos = pd.read_csv(caminho, chunksize=tamanho_bloco)
+
+    for bloco in blocos:
+        bloco.index = pd.RangeIndex(inicio, inicio + len(bloco))
+        inicio += len(bloco)
+        yield bloco
+
+
+class _EscritorResultados:
+    """Grava blocos de resultados em CSV ou Parquet sem manter tudo em memória"""
+
+    def __init__(self, caminho):
+        self.caminho = caminho
+        self.parquet = caminho.lower().endswith('.parquet')
+        self._escritor_parquet = None
+        self._cabecalho_escrito = False
+
+    def escrever(self, resultados):
+        if self.parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            tabela = pa.Table.from_pandas(resultados, preserve_index=False)
+            if self._escritor_parquet is None:
+                self._escritor_parquet = pq.ParquetWriter(self.caminho, tabela.schema)
+            self._escritor_parquet.write_table(tabela)
+        else:
+            resultados.to_csv(self.caminho, mode='a' if self._cabecalho_escrito else 'w',
+                              header=not self._cabecalho_escrito, index=False)
+            self._cabecalho_escrito = True
+
+    def fechar(self):
+        if self._escritor_parquet is not None:
+            self._escritor_parquet.close()
+
+
+def processar_arquivo(entrada, saida, caminho_erros=None, tamanho_bloco=TAMANHO_BLOCO_PADRAO, versao_tabelas=None,
+                      processos=1):
+    """Processa um arquivo de candidatos inteiro em blocos
+
+    Retorna um resumo com o total de linhas processadas e rejeitadas.
+    A tabela de impostos é resolvida uma vez, então todos os blocos usam a mesma versão.
+    Com `processos` > 1 (ou 0 = todos os núcleos) cada bloco é dividido entre
+    um pool de processos; a ordem das linhas na saída não muda.
+    """
+    tabela = registro_tabelas.obter(versao_tabelas)
+    avaliador = None
+    if processos != 1:
+        from lote_paralelo import AvaliadorParalelo
+        avaliador = AvaliadorParalelo(processos or None)
+    escritor = _EscritorResultados(saida)
+    total_validas = 0
+    total_erros = 0
+
+    if caminho_erros:
+        with open(caminho_erros, 'w', encoding='utf-8') as arquivo_erros:
+            arquivo_erros.write('linha,motivo\n')
+
+    try:
+        for bloco in ler_blocos(entrada, tamanho_bloco):
+            resultados, erros = avaliar_bloco(bloco, tabela, avaliador)
+            escritor.escrever(resultados)
+            total_validas += len(resultados)
+            total_erros += len(erros)
+
+            if erros and caminho_erros:
+                pd.DataFrame(erros, columns=['linha', 'motivo']).to_csv(
+                    caminho_erros, mode='a', header=False, index=False
+                )
+    finally:
+        escritor.fechar()
+        if avaliador is not None:
+            avaliador.fechar()
+
+    return {'processadas': total_validas, 'rejeitadas': total_erros, 'versao_tabela': tabela.versao}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Calcula faixas de proposta em lote a partir de CSV/Parquet")
+    parser.add_argument('entrada', help="Arquivo de candidatos (.csv ou .parquet)")
+    parser.add_argument('saida', help="Arquivo de resultados (.csv ou .parquet)")
+    parser.add_argument('--erros', help="Arquivo CSV para o relatório de linhas inválidas")
+    parser.add_argument('--tamanho-bloco', type=int, default=TAMANHO_BLOCO_PADRAO,
+                        help=f"Linhas lidas por bloco (padrão: {TAMANHO_BLOCO_PADRAO})")
+    parser.add_argument('--versao-tabelas', help="Ano da tabela de impostos (padrão: a mais recente)")
+    parser.add_argument('--processos', type=int, default=1,
+                        help="Processos em paralelo (padrão: 1; 0 = todos os núcleos)")
+    args = parser.parse_args(argv)
+
+    if args.erros is None:
+        base, _ = os.path.splitext(args.saida)
+        args.erros = f"{base}_erros.csv"
+
+    try:
+        resumo = processar_arquivo(args.entrada, args.saida, args.erros, args.tamanho_bloco, args.versao_tabelas,
+                                   args.processos)
+    except ColunasAusentesError as erro:
+        print(f"❌ {erro}", file=sys.stderr)
+        return 1
+    print(f"✅ {resumo['processadas']} linhas processadas, {resumo['rejeitadas']} rejeitadas "
+          f"(tabelas {resumo['versao_tabela']}; ver {args.erros})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+"""Projeção de carreira em vários anos: líquido CLT vs PJ em termos reais e VPL.
+
+O salário evolui com o IPCA (reajuste) mais um aumento real que cresce com a
+nota de `crescimento_carreira`. Os impostos são calculados sobre os valores
+nominais de cada ano com a tabela vigente congelada (como costuma acontecer
+com as faixas do IRRF) e o resultado é deflacionado pelo IPCA acumulado, de
+modo que tudo sai em reais de hoje. A projeção é vetorizada em candidatos x
+anos: uma matriz por grandeza, avaliada de uma vez pelo motor vetorizado.
+
+A série de IPCA vem de `dados/ipca.csv` (ano, variação % no ano); para os
+anos projetados usa-se a média geométrica dos últimos anos da série.
+"""
+import csv
+import os
+from functools import lru_cache
+
+import numpy as np
+
+import motor_vetorizado as motor
+
+ARQUIVO_IPCA = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dados', 'ipca.csv')
+ANOS_MEDIA_IPCA = 10
+
+# Aumento real anual por ponto de crescimento_carreira (1-10 → 0,5% a 5% ao ano)
+AUMENTO_REAL_POR_PONTO = 0.005
+TAXA_DESCONTO_REAL_PADRAO = 0.04
+
+
+@lru_cache(maxsize=4)
+def carregar_ipca(caminho=ARQUIVO_IPCA):
+    """Lê a série anual de IPCA como {ano: variação (fração)}"""
+    with open(caminho, newline='', encoding='utf-8') as arquivo:
+        return {int(linha['ano']): float(linha['ipca']) / 100 for linha in csv.DictReader(arquivo)}
+
+
+def ipca_projetado(anos_media=ANOS_MEDIA_IPCA, caminho=ARQUIVO_IPCA):
+    """Inflação anual projetada: média geométrica dos últimos `anos_media` anos da série"""
+    serie = carregar_ipca(caminho)
+    ultimos = [serie[ano] for ano in sorted(serie)[-anos_media:]]
+    return float(np.prod([1 + taxa for taxa in ultimos]) ** (1 / len(ultimos)) - 1)
+
+
+def projetar_carreira(salarios_clt, valores_pj, crescimento_carreira, anos=10,
+                      taxa_desconto_real=TAXA_DESCONTO_REAL_PADRAO, ipca=None, tabela=None):
+    """Projeta o líquido anual CLT e PJ de cada candidato ao longo de `anos`
+
+    `salarios_clt`, `valores_pj` e `crescimento_carreira` são arrays (ou
+    escalares) com um valor por candidato; `ipca` é a inflação anual
+    projetada (escalar ou um valor por ano; padrão: `ipca_projetado()`).
+    Retorna matrizes candidatos x anos em reais de hoje ('liquido_anual' e
+    'acumulado') e o VPL por candidato para cada modalidade.
+    """
+    salarios_clt = np.atleast_1d(np.asarray(salarios_clt, dtype=float))
+    valores_pj = np.atleast_1d(np.asarray(valores_pj, dtype=float))
+    crescimento = np.atleast_1d(np.asarray(crescimento_carreira, dtype=float))
+
+    inflacao = np.broadcast_to(np.asarray(ipca_projetado() if ipca is None else ipca, dtype=float), (anos,))
+    # Índice de preços no início de cada ano (ano 1 = hoje)
+    indice_precos = np.concatenate(([1.0], np.cumprod(1 + inflacao[:-1])))
+    periodos = np.arange(anos)
+
+    # Crescimento nominal = IPCA acumulado x aumento real composto; matriz candidatos x anos
+    aumento_real = (1 + crescimento[:, None] * AUMENTO_REAL_POR_PONTO) ** periodos[None, :]
+    fator_nominal = aumento_real * indice_precos[None, :]
+
+    comparacao = motor.comparar_clt_pj_vetorizado(
+        salarios_clt[:, None] * fator_nominal, valores_pj[:, None] * fator_nominal, tabela
+    )
+    desconto = (1 + taxa_desconto_real) ** (periodos + 1)  # Fluxo de cada ano no fim do ano
+
+    resultado = {'anos': periodos + 1, 'ipca': np.asarray(inflacao), 'taxa_desconto_real': taxa_desconto_real}
+    for modalidade in ('CLT', 'PJ'):
+        liquido_real = comparacao[modalidade]['total_anual'] / indice_precos[None, :]
+        resultado[modalidade] = {
+            'liquido_anual': liquido_real,
+            'acumulado': np.cumsum(liquido_real, axis=1),
+            'vpl': (liquido_real / desconto[None, :]).sum(axis=1)
+        }
+    resultado['diferenca_vpl'] = resultado['PJ']['vpl'] - resultado['CLT']['vpl']
+    return resultado
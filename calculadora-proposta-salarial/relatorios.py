@@ -0,0 +1,297 @@
+"""Relatórios de proposta em texto: um por vez (app) ou em massa num ZIP.
+
+O modelo é compilado uma vez (trechos literais + campos com formato já
+separados) e preenchido a partir de um registro plano com os resultados já
+calculados; nenhum cálculo acontece durante o preenchimento.
+
+No modo em massa, o arquivo de candidatos é lido em blocos (como no
+processamento em lote), cada bloco é calculado de uma vez pelo motor
+vetorizado, os textos são preenchidos em paralelo num pool de processos e
+gravados um a um no ZIP: a memória fica limitada ao tamanho do bloco,
+independente do número de candidatos.
+
+Uso:
+    python relatorios.py candidatos.csv relatorios.zip --processos 0
+"""
+import argparse
+import string
+import sys
+from datetime import datetime
+
+MODELO_RELATORIO = """
+RELATÓRIO DE PROPOSTA SALARIAL - {data}
+
+SITUAÇÃO ATUAL:
+- Salário bruto: R$ {salario_atual:,.2f}
+- Benefícios totais: R$ {beneficios_atual:,.2f}
+- VA/VR: R$ {va_vr:,.2f}
+- VT: R$ {vt:,.2f}
+- Plano saúde: {plano_saude}
+- Coparticipação: R$ {coparticipacao:,.2f}
+- Outros: R$ {outros_beneficios:,.2f}
+- Total atual: R$ {total_atual:,.2f}
+- Tempo deslocamento: {tempo_viagem_atual}h/dia
+
+SEU PERFIL DE VALORES:
+- Prioridade 1: {prioridade_1}
+- Prioridade 2: {prioridade_2}
+- Prioridade 3: {prioridade_3}
+- Compatibilidade geral: {compatibilidade_geral:.1f}%
+
+NOVA OPORTUNIDADE:
+- Modalidade: {modalidade}
+- Custo de vida: {custo_vida_percentual:.1f}%
+- Dias presenciais: {dias_presencial_novo}/semana
+- Novo deslocamento: {tempo_viagem_novo}h/dia
+- Avaliação crescimento: {crescimento_carreira}/10
+- Avaliação estabilidade: {estabilidade}/10
+- Avaliação cultura: {cultura_empresa_nova}/10
+
+VALORES RECOMENDADOS - {modalidade}:
+- Mínimo aceitável: R$ {minimo_modalidade:,.2f}
+- Valor ideal: R$ {ideal_modalidade:,.2f}
+- Máximo negociação: R$ {maximo_modalidade:,.2f}
+
+COMPARAÇÃO CLT vs PJ:
+- CLT Líquido: R$ {liquido_clt:,.2f}
+- PJ Líquido: R$ {liquido_pj:,.2f}
+- Diferença: R$ {diferenca_liquido:,.2f}
+
+ANÁLISE DE COMPATIBILIDADE:
+- Compatibilidade geral: {compatibilidade_geral:.1f}%
+- Estabilidade financeira: {compatibilidade_estabilidade_financeira:.1f}%
+- Crescimento carreira: {compatibilidade_crescimento_carreira:.1f}%
+- Flexibilidade tempo: {compatibilidade_flexibilidade_tempo:.1f}%
+- Equilíbrio vida: {compatibilidade_equilibrio_vida_pessoal:.1f}%
+
+RECOMENDAÇÕES:
+- Estratégia de negociação: Buscar R$ {ideal_modalidade:,.2f}
+- Contraproposta mínima: R$ {minimo_modalidade:,.2f}
+- {recomendacao_modalidade}
+- {recomendacao_compatibilidade}
+            """
+
+DETALHES_COMPATIBILIDADE = (
+    'estabilidade_financeira', 'crescimento_carreira', 'flexibilidade_tempo', 'equilibrio_vida_pessoal'
+)
+COLUNAS_BENEFICIOS = ('va_vr', 'vt', 'plano_saude', 'coparticipacao', 'outros_beneficios')
+# Relatórios por tarefa enviada ao pool: poucos envios grandes amortizam o pickle
+RELATORIOS_POR_TAREFA = 2_000
+
+
+class ModeloCompilado:
+    """Modelo `str.format` analisado uma vez: trechos literais e (campo, formato)"""
+
+    def __init__(self, modelo):
+        self.partes = [
+            (literal, campo, formato or '')
+            for literal, campo, formato, _ in string.Formatter().parse(modelo)
+        ]
+
+    def renderizar(self, campos):
+        pedacos = []
+        for literal, campo, formato in self.partes:
+            pedacos.append(literal)
+            if campo is not None:
+                pedacos.append(format(campos[campo], formato))
+        return ''.join(pedacos)
+
+
+MODELO_COMPILADO = ModeloCompilado(MODELO_RELATORIO)
+
+
+def _numero(valor):
+    """3.0 → 3 (valores vindos de CSV chegam como float; o app usa int)"""
+    return int(valor) if isinstance(valor, float) and valor.is_integer() else valor
+
+
+def campos_relatorio(registro):
+    """Campos do modelo a partir de um registro plano com entradas e resultados já calculados
+
+    O registro traz os fatores, benefícios detalhados e prioridades, mais
+    'compatibilidade_geral', 'compatibilidade_<detalhe>', a faixa
+    ('minimo', 'ideal', 'maximo_negociacao'), os equivalentes PJ da faixa
+    ('pj_minimo', 'pj_ideal', 'pj_maximo_negociacao'), 'liquido_clt' e 'liquido_pj'.
+    """
+    modalidade = registro.get('modalidade') or 'CLT'
+    sufixo = '' if modalidade == 'CLT' else 'pj_'
+    compatibilidade_geral = registro['compatibilidade_geral']
+    campos = {
+        'data': registro['data'],
+        'salario_atual': registro.get('salario_atual', 0),
+        'beneficios_atual': registro.get('beneficios_atual', 0),
+        'va_vr': registro.get('va_vr', 0),
+        'vt': registro.get('vt', 0),
+        'plano_saude': 'Sim' if registro.get('plano_saude', False) else 'Não',
+        'coparticipacao': registro.get('coparticipacao', 0),
+        'outros_beneficios': registro.get('outros_beneficios', 0),
+        'total_atual': registro.get('salario_atual', 0) + registro.get('beneficios_atual', 0),
+        'tempo_viagem_atual': _numero(registro.get('tempo_viagem_atual', 0)),
+        'prioridade_1': registro.get('prioridade_1') or 'Não definida',
+        'prioridade_2': registro.get('prioridade_2') or 'Não definida',
+        'prioridade_3': registro.get('prioridade_3') or 'Não definida',
+        'compatibilidade_geral': compatibilidade_geral,
+        'modalidade': modalidade,
+        'custo_vida_percentual': registro.get('custo_vida_nova', 0) * 100,
+        'dias_presencial_novo': _numero(registro.get('dias_presencial_novo', 0)),
+        'tempo_viagem_novo': _numero(registro.get('tempo_viagem_novo', 0)),
+        'crescimento_carreira': _numero(registro.get('crescimento_carreira', 0)),
+        'estabilidade': _numero(registro.get('estabilidade', 0)),
+        'cultura_empresa_nova': _numero(registro.get('cultura_empresa_nova', 0)),
+        'minimo_modalidade': registro[sufixo + 'minimo'],
+        'ideal_modalidade': registro[sufixo + 'ideal'],
+        'maximo_modalidade': registro[sufixo + 'maximo_negociacao'],
+        'liquido_clt': registro['liquido_clt'],
+        'liquido_pj': registro['liquido_pj'],
+        'diferenca_liquido': registro['liquido_pj'] - registro['liquido_clt'],
+        'recomendacao_modalidade': (
+            'Considerar CLT se oferecerem benefícios equivalentes' if modalidade == 'PJ'
+            else 'Considerar PJ se oferecerem valor equivalente'
+        ),
+        'recomendacao_compatibilidade': (
+            'Aceitar com menor salário se compatibilidade for alta' if compatibilidade_geral > 80
+            else 'Exigir compensação maior se compatibilidade for baixa'
+        )
+    }
+    for detalhe in DETALHES_COMPATIBILIDADE:
+        campos[f'compatibilidade_{detalhe}'] = registro.get(f'compatibilidade_{detalhe}', 0)
+    return campos
+
+
+def renderizar_relatorio(registro):
+    return MODELO_COMPILADO.renderizar(campos_relatorio(registro))
+
+
+def _renderizar_fatia(colunas):
+    """Executada no worker: colunas → lista de textos, na ordem das linhas"""
+    nomes = list(colunas)
+    return [renderizar_relatorio(dict(zip(nomes, valores))) for valores in zip(*colunas.values())]
+
+
+def calcular_registros(fatores, valores_pessoais, tabela):
+    """Resultados de um bloco de colunas já validadas, cada valor calculado uma única vez"""
+    import motor_vetorizado as motor
+
+    compatibilidade = motor.calcular_compatibilidade_valores_vetorizado(fatores, valores_pessoais)
+    faixa = motor.calcular_faixa_recomendada_vetorizado(fatores, valores_pessoais, compatibilidade)
+    registros = dict(fatores)
+    # Dos valores pessoais só as prioridades (alguns nomes coincidem com os fatores)
+    for chave in ('prioridade_1', 'prioridade_2', 'prioridade_3'):
+        registros[chave] = valores_pessoais[chave]
+    registros.update(faixa)
+    registros['compatibilidade_geral'] = compatibilidade['compatibilidade_geral']
+    for detalhe in DETALHES_COMPATIBILIDADE:
+        registros[f'compatibilidade_{detalhe}'] = compatibilidade['detalhado'][detalhe]
+    for chave in ('minimo', 'ideal', 'maximo_negociacao'):
+        registros[f'pj_{chave}'] = motor.calcular_equivalencia_pj_clt_vetorizado(faixa[chave], tabela)
+    comparacao = motor.comparar_clt_pj_vetorizado(faixa['ideal'], registros['pj_ideal'], tabela)
+    registros['liquido_clt'] = comparacao['CLT']['salario_liquido']
+    registros['liquido_pj'] = comparacao['PJ']['renda_liquida']
+    return registros
+
+
+def _nome_arquivo(identificador, linha):
+    """Nome único pela linha do arquivo: IDs repetidos não sobrescrevem relatórios e nada precisa ser lembrado"""
+    import re
+    if identificador is None:
+        return f'relatorio_linha{linha}.txt'
+    base = re.sub(r'[^\w.-]+', '_', str(identificador)).strip('._') or 'candidato'
+    return f'relatorio_{base}_linha{linha}.txt'
+
+
+def gerar_relatorios_zip(entrada, destino, versao_tabelas=None, processos=1, tamanho_bloco=None):
+    """Gera um relatório por candidato válido do arquivo e grava todos em `destino` (.zip)
+
+    Linhas inválidas vão para `erros.csv` dentro do ZIP, gravadas à medida que
+    aparecem num arquivo temporário e copiadas no fim (o ZIP só aceita uma
+    entrada aberta por vez). Com `processos` > 1 (ou 0 = todos os núcleos) os
+    textos de cada bloco são preenchidos em paralelo; a ordem dos arquivos no
+    ZIP é a das linhas de entrada. Só o índice do ZIP (alguns bytes por
+    relatório, gravado no fechamento) cresce com o número de candidatos.
+    """
+    import csv
+    import shutil
+    import tempfile
+    import zipfile
+    from concurrent.futures import ProcessPoolExecutor
+
+    import numpy as np
+    import processamento_lote as lote
+
+    tabela = lote.registro_tabelas.obter(versao_tabelas)
+    data = datetime.now().strftime('%d/%m/%Y %H:%M')
+    executor = ProcessPoolExecutor(max_workers=processos or None) if processos != 1 else None
+    total = 0
+    rejeitadas = 0
+
+    try:
+        with zipfile.ZipFile(destino, 'w', compression=zipfile.ZIP_DEFLATED) as arquivo_zip, \
+                tempfile.TemporaryFile('w+', encoding='utf-8', newline='') as arquivo_erros:
+            escritor_erros = csv.writer(arquivo_erros)
+            escritor_erros.writerow(('linha', 'motivo'))
+            for bloco in lote.ler_blocos(entrada, tamanho_bloco or lote.TAMANHO_BLOCO_PADRAO):
+                fatores, valores_pessoais, mascara_valida, erros_bloco = lote._validar_bloco(bloco)
+                escritor_erros.writerows(erros_bloco)
+                rejeitadas += len(erros_bloco)
+                n = int(mascara_valida.sum())
+                if n == 0:
+                    continue
+
+                colunas = calcular_registros(fatores, valores_pessoais, tabela)
+                for coluna in COLUNAS_BENEFICIOS:
+                    if coluna in bloco:
+                        colunas[coluna] = bloco[coluna].fillna(0).to_numpy()[mascara_valida]
+                # Listas Python: o worker só formata, sem tocar em numpy
+                colunas = {chave: np.asarray(valores).tolist() for chave, valores in colunas.items()}
+                colunas['data'] = [data] * n
+
+                fatias = [
+                    {chave: valores[inicio:inicio + RELATORIOS_POR_TAREFA] for chave, valores in colunas.items()}
+                    for inicio in range(0, n, RELATORIOS_POR_TAREFA)
+                ]
+                textos = executor.map(_renderizar_fatia, fatias) if executor else map(_renderizar_fatia, fatias)
+
+                identificadores = next(
+                    (bloco[coluna].to_numpy()[mascara_valida] for coluna in lote.COLUNAS_IDENTIFICACAO if coluna in bloco),
+                    np.full(n, None, dtype=object)
+                )
+                linhas = zip(identificadores, bloco.index.to_numpy()[mascara_valida])
+                for textos_fatia in textos:
+                    for texto in textos_fatia:
+                        arquivo_zip.writestr(_nome_arquivo(*next(linhas)), texto)
+                total += n
+
+            if rejeitadas:
+                arquivo_erros.seek(0)
+                with arquivo_zip.open('erros.csv', 'w') as entrada_erros:
+                    shutil.copyfileobj(arquivo_erros.buffer, entrada_erros)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return {'relatorios': total, 'rejeitadas': rejeitadas, 'versao_tabela': tabela.versao}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera um relatório de proposta por candidato num arquivo ZIP")
+    parser.add_argument('entrada', help="Arquivo de candidatos (.csv ou .parquet)")
+    parser.add_argument('saida', help="Arquivo ZIP de relatórios")
+    parser.add_argument('--versao-tabelas', help="Ano da tabela de impostos (padrão: a mais recente)")
+    parser.add_argument('--processos', type=int, default=1,
+                        help="Processos em paralelo (padrão: 1; 0 = todos os núcleos)")
+    parser.add_argument('--tamanho-bloco', type=int, help="Linhas lidas por bloco")
+    args = parser.parse_args(argv)
+
+    import processamento_lote as lote
+    try:
+        resumo = gerar_relatorios_zip(args.entrada, args.saida, args.versao_tabelas, args.processos, args.tamanho_bloco)
+    except lote.ColunasAusentesError as erro:
+        print(f"❌ {erro}", file=sys.stderr)
+        return 1
+    print(f"✅ {resumo['relatorios']} relatórios gerados, {resumo['rejeitadas']} linhas rejeitadas "
+          f"(tabelas {resumo['versao_tabela']}; ver erros.csv no ZIP)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,340 @@
+"""Serviço HTTP local (asyncio, só biblioteca padrão) para os cálculos da calculadora.
+
+Endpoints (POST com corpo JSON; respostas JSON):
+    /faixa           {"fatores": {...}, "valores_pessoais": {...}} → minimo, ideal, maximo_negociacao
+    /compatibilidade {"fatores": {...}, "valores_pessoais": {...}} → compatibilidade_geral, detalhado
+    /comparacao      {"valor_clt": 10000, "valor_pj": 14000}      → CLT e PJ (como comparar_clt_pj)
+    /liquido         {"liquido": 7000, "modalidade": "CLT"|"PJ"}   → valor bruto/nota necessário
+    GET /saude                                                     → status e versão das tabelas
+
+Requisições que chegam dentro de uma janela curta (JANELA_LOTE_MS) são
+agrupadas e avaliadas numa única chamada do motor vetorizado; cada cliente
+recebe a sua linha do resultado.
+
+Uso:
+    python servico_http.py --porta 8765
+"""
+import argparse
+import asyncio
+import json
+import math
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+import motor_vetorizado as motor
+from nucleo_calculo import VALORES_PESSOAIS_PADRAO
+from tabelas_impostos import registro_tabelas
+
+JANELA_LOTE_MS = 2.0
+TAMANHO_MAXIMO_LOTE = 4096
+TAMANHO_MAXIMO_CORPO = 1024 * 1024
+
+MENSAGENS_STATUS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 413: 'Payload Too Large',
+                    500: 'Internal Server Error'}
+
+
+class RequisicaoInvalida(ValueError):
+    """Corpo da requisição sem os campos esperados"""
+
+
+# ------------------------------------------------------ cálculo em lote
+# Cada função recebe a lista de corpos de um lote e devolve uma resposta por corpo.
+
+def _colunas(dicionarios):
+    """Lista de dicionários → dicionário de colunas (todos com as mesmas chaves)"""
+    colunas = {}
+    for chave in dicionarios[0]:
+        valores = [d[chave] for d in dicionarios]
+        if all(isinstance(v, str) for v in valores):
+            colunas[chave] = np.array(valores, dtype=object)
+        else:
+            colunas[chave] = np.array(valores, dtype=float)
+    return colunas
+
+
+def _valores_pessoais(corpo):
+    valores = dict(VALORES_PESSOAIS_PADRAO)
+    valores.update({f'prioridade_{i}': '' for i in (1, 2, 3)})
+    valores.update(corpo.get('valores_pessoais') or {})
+    return valores
+
+
+def _eh_numero(valor):
+    return isinstance(valor, (int, float)) and not isinstance(valor, bool) and math.isfinite(valor)
+
+
+def _validar_perfil(corpo):
+    """Rejeita (400) fatores vazios ou não numéricos antes de virarem colunas do motor"""
+    fatores = corpo.get('fatores')
+    if not isinstance(fatores, dict) or not any(chave != 'modalidade' for chave in fatores):
+        raise RequisicaoInvalida("campo 'fatores' (objeto com ao menos um campo numérico) é obrigatório")
+    for chave, valor in fatores.items():
+        if chave != 'modalidade' and not _eh_numero(valor):
+            raise RequisicaoInvalida(f"'fatores.{chave}' deve ser numérico")
+    valores_pessoais = corpo.get('valores_pessoais') or {}
+    if not isinstance(valores_pessoais, dict):
+        raise RequisicaoInvalida("campo 'valores_pessoais' deve ser um objeto")
+    for chave, valor in valores_pessoais.items():
+        valido = isinstance(valor, str) if chave.startswith('prioridade_') else _eh_numero(valor)
+        if not valido:
+            raise RequisicaoInvalida(f"'valores_pessoais.{chave}' tem tipo inválido")
+
+
+def _entradas_perfil(corpos):
+    for corpo in corpos:
+        _validar_perfil(corpo)
+    fatores = _colunas([{k: v for k, v in corpo['fatores'].items() if k != 'modalidade'} for corpo in corpos])
+    return fatores, _colunas([_valores_pessoais(corpo) for corpo in corpos])
+
+
+def calcular_faixas(corpos):
+    fatores, valores_pessoais = _entradas_perfil(corpos)
+    faixa = motor.calcular_faixa_recomendada_vetorizado(fatores, valores_pessoais)
+    return [
+        {chave: float(faixa[chave][i]) for chave in ('minimo', 'ideal', 'maximo_negociacao')}
+        for i in range(len(corpos))
+    ]
+
+
+def calcular_compatibilidades(corpos):
+    fatores, valores_pessoais = _entradas_perfil(corpos)
+    compatibilidade = motor.calcular_compatibilidade_valores_vetorizado(fatores, valores_pessoais)
+    return [
+        {
+            'compatibilidade_geral': float(compatibilidade['compatibilidade_geral'][i]),
+            'detalhado': {chave: float(valores[i]) for chave, valores in compatibilidade['detalhado'].items()}
+        }
+        for i in range(len(corpos))
+    ]
+
+
+def calcular_comparacoes(corpos):
+    try:
+        valores_clt = [float(corpo['valor_clt']) for corpo in corpos]
+        valores_pj = [float(corpo['valor_pj']) for corpo in corpos]
+    except (KeyError, TypeError, ValueError):
+        raise RequisicaoInvalida("campos numéricos 'valor_clt' e 'valor_pj' são obrigatórios")
+    comparacao = motor.comparar_clt_pj_vetorizado(valores_clt, valores_pj)
+    return [
+        {
+            modalidade: {
+                chave: valores if isinstance(valores, str) else float(valores[i])
+                for chave, valores in comparacao[modalidade].items()
+            }
+            for modalidade in ('CLT', 'PJ')
+        }
+        for i in range(len(corpos))
+    ]
+
+
+def calcular_metas_liquido(corpos):
+    try:
+        liquidos = np.array([float(corpo['liquido']) for corpo in corpos])
+    except (KeyError, TypeError, ValueError):
+        raise RequisicaoInvalida("campo numérico 'liquido' é obrigatório")
+    eh_clt = np.array([str(corpo.get('modalidade', 'CLT')).upper() == 'CLT' for corpo in corpos])
+    valores = np.where(
+        eh_clt,
+        motor.calcular_bruto_para_liquido_clt_vetorizado(liquidos),
+        motor.calcular_valor_pj_para_liquido_vetorizado(liquidos)
+    )
+    return [
+        {'liquido': float(liquidos[i]), 'modalidade': 'CLT' if eh_clt[i] else 'PJ', 'valor_necessario': float(valores[i])}
+        for i in range(len(corpos))
+    ]
+
+
+def _chave_perfil(corpo):
+    # Só corpos com o mesmo conjunto de campos viram colunas juntas (campos ausentes usam os padrões do motor)
+    fatores = corpo.get('fatores') if isinstance(corpo.get('fatores'), dict) else {}
+    return tuple(sorted(fatores)), tuple(sorted(corpo.get('valores_pessoais') or {}))
+
+
+ENDPOINTS = {
+    '/faixa': (calcular_faixas, _chave_perfil),
+    '/compatibilidade': (calcular_compatibilidades, _chave_perfil),
+    '/comparacao': (calcular_comparacoes, lambda corpo: None),
+    '/liquido': (calcular_metas_liquido, lambda corpo: None),
+}
+
+
+# ------------------------------------------------------ micro-lotes
+
+class Loteador:
+    """Agrupa requisições de um endpoint que chegam dentro da janela e avalia de uma vez"""
+
+    def __init__(self, calcular, chave_grupo, executor, janela_ms=JANELA_LOTE_MS, tamanho_maximo=TAMANHO_MAXIMO_LOTE):
+        self.calcular = calcular
+        self.chave_grupo = chave_grupo
+        self.executor = executor
+        self.janela = janela_ms / 1000
+        self.tamanho_maximo = tamanho_maximo
+        self._pendentes = []
+        self._disparo = None
+        self.lotes = 0
+        self.requisicoes = 0
+
+    async def avaliar(self, corpo):
+        futuro = asyncio.get_running_loop().create_future()
+        self._pendentes.append((corpo, futuro))
+        if len(self._pendentes) >= self.tamanho_maximo:
+            self._despachar()
+        elif self._disparo is None:
+            self._disparo = asyncio.get_running_loop().call_later(self.janela, self._despachar)
+        return await futuro
+
+    def _despachar(self):
+        if self._disparo is not None:
+            self._disparo.cancel()
+            self._disparo = None
+        pendentes, self._pendentes = self._pendentes, []
+        if not pendentes:
+            return
+
+        grupos = {}
+        for corpo, futuro in pendentes:
+            grupos.setdefault(self.chave_grupo(corpo), []).append((corpo, futuro))
+        for grupo in grupos.values():
+            asyncio.ensure_future(self._avaliar_grupo(grupo))
+
+    async def _avaliar_grupo(self, grupo):
+        corpos = [corpo for corpo, _ in grupo]
+        self.lotes += 1
+        self.requisicoes += len(corpos)
+        try:
+            # O cálculo roda numa thread para o loop continuar aceitando conexões
+            respostas = await asyncio.get_running_loop().run_in_executor(self.executor, self.calcular, corpos)
+        except Exception:
+            # Um corpo inválido não pode derrubar o lote inteiro: reavalia um a um
+            for corpo, futuro in grupo:
+                futuro.set_result(await self._avaliar_isolado(corpo))
+            return
+        for (_, futuro), resposta in zip(grupo, respostas):
+            futuro.set_result((200, resposta))
+
+    async def _avaliar_isolado(self, corpo):
+        try:
+            resposta = await asyncio.get_running_loop().run_in_executor(self.executor, self.calcular, [corpo])
+            return 200, resposta[0]
+        except (RequisicaoInvalida, KeyError, TypeError, ValueError) as e:
+            return 400, {'erro': f'requisição inválida: {e}'}
+        except Exception as e:
+            return 500, {'erro': str(e)}
+
+
+# ------------------------------------------------------ HTTP
+
+class ServicoCalculadora:
+    """Servidor HTTP/1.1 mínimo com keep-alive sobre asyncio.start_server"""
+
+    def __init__(self, janela_ms=JANELA_LOTE_MS):
+        # Uma thread: os lotes são vetorizados, então paralelismo aqui só disputaria o GIL
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self.loteadores = {
+            caminho: Loteador(calcular, chave_grupo, self._executor, janela_ms)
+            for caminho, (calcular, chave_grupo) in ENDPOINTS.items()
+        }
+
+    async def _responder(self, escritor, status, conteudo, manter_conexao):
+        corpo = json.dumps(conteudo, ensure_ascii=False).encode('utf-8')
+        cabecalho = (
+            f"HTTP/1.1 {status} {MENSAGENS_STATUS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(corpo)}\r\n"
+            f"Connection: {'keep-alive' if manter_conexao else 'close'}\r\n\r\n"
+        )
+        escritor.write(cabecalho.encode('latin-1') + corpo)
+        await escritor.drain()
+
+    async def _tratar_requisicao(self, metodo, caminho, corpo_bruto):
+        if caminho == '/saude':
+            estatisticas = {
+                caminho: {'lotes': l.lotes, 'requisicoes': l.requisicoes} for caminho, l in self.loteadores.items()
+            }
+            return 200, {'status': 'ok', 'versao_tabela': registro_tabelas.obter().versao, 'lotes': estatisticas}
+        if caminho not in self.loteadores:
+            return 404, {'erro': f'endpoint desconhecido: {caminho}'}
+        if metodo != 'POST':
+            return 405, {'erro': 'use POST'}
+        try:
+            corpo = json.loads(corpo_bruto or b'{}')
+        except ValueError:
+            return 400, {'erro': 'JSON inválido'}
+        if not isinstance(corpo, dict):
+            return 400, {'erro': 'o corpo deve ser um objeto JSON'}
+        return await self.loteadores[caminho].avaliar(corpo)
+
+    async def atender(self, leitor, escritor):
+        try:
+            while True:
+                linha = await leitor.readline()
+                if not linha:
+                    break
+                try:
+                    metodo, caminho, versao = linha.decode('latin-1').split()
+                except ValueError:
+                    await self._responder(escritor, 400, {'erro': 'linha de requisição inválida'}, False)
+                    break
+
+                cabecalhos = {}
+                while True:
+                    linha = await leitor.readline()
+                    if linha in (b'\r\n', b'\n', b''):
+                        break
+                    nome, _, valor = linha.decode('latin-1').partition(':')
+                    cabecalhos[nome.strip().lower()] = valor.strip()
+
+                # Só dígitos ASCII: int() aceitaria '-5', ' 5' e '٥' e um valor negativo chegaria ao readexactly
+                tamanho_texto = cabecalhos.get('content-length', '') or '0'
+                if not (tamanho_texto.isascii() and tamanho_texto.isdigit()):
+                    await self._responder(escritor, 400, {'erro': 'Content-Length inválido'}, False)
+                    break
+                tamanho = int(tamanho_texto)
+                if tamanho > TAMANHO_MAXIMO_CORPO:
+                    await self._responder(escritor, 413, {'erro': 'corpo muito grande'}, False)
+                    break
+                corpo_bruto = await leitor.readexactly(tamanho) if tamanho else b''
+
+                manter_conexao = (
+                    cabecalhos.get('connection', '').lower() != 'close'
+                    and versao.upper() == 'HTTP/1.1'
+                )
+                status, conteudo = await self._tratar_requisicao(metodo.upper(), caminho.split('?')[0], corpo_bruto)
+                await self._responder(escritor, status, conteudo, manter_conexao)
+                if not manter_conexao:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            escritor.close()
+
+    async def iniciar(self, host='127.0.0.1', porta=8765):
+        return await asyncio.start_server(self.atender, host, porta)
+
+
+async def _executar(host, porta, janela_ms):
+    servico = ServicoCalculadora(janela_ms)
+    servidor = await servico.iniciar(host, porta)
+    print(f"🌐 Serviço em http://{host}:{porta} (janela de lote {janela_ms} ms)")
+    async with servidor:
+        await servidor.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço HTTP local dos cálculos da calculadora")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--porta', type=int, default=8765)
+    parser.add_argument('--janela-ms', type=float, default=JANELA_LOTE_MS,
+                        help=f"Janela para agrupar requisições (padrão: {JANELA_LOTE_MS} ms)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(_executar(args.host, args.porta, args.janela_ms))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
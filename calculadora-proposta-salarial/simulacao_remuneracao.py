@@ -0,0 +1,92 @@
+"""Simulação Monte Carlo da remuneração variável (aumento, bônus e PLR).
+
+Cada cenário sorteia um aumento sobre o salário, o atingimento da meta de
+bônus e o valor da PLR a partir de distribuições informadas pelo usuário,
+e calcula o líquido anual CLT e PJ com o motor vetorizado (mesma lógica de
+`comparar_clt_pj`). Todos os cenários são avaliados de uma vez, com um
+gerador NumPy semeado: a mesma semente reproduz o mesmo resultado.
+
+Modelo do variável:
+- CLT: bônus + PLR pagos num único mês, tributados junto com o salário
+  (o líquido extra é a diferença de líquido desse mês);
+- PJ: bônus + PLR faturados ao longo do ano, somados à nota mensal.
+"""
+import numpy as np
+
+import motor_vetorizado as motor
+
+CENARIOS_PADRAO = 200_000
+PERCENTIS = (5, 25, 50, 75, 95)
+
+# Distribuições: {'tipo': 'fixo' | 'uniforme' | 'triangular' | 'normal', ...parâmetros}
+DISTRIBUICOES_PADRAO = {
+    'aumento': {'tipo': 'normal', 'media': 0.05, 'desvio': 0.03, 'minimo': 0.0},
+    'atingimento_bonus': {'tipo': 'triangular', 'minimo': 0.0, 'moda': 1.0, 'maximo': 1.5},
+    'plr': {'tipo': 'fixo', 'valor': 0.0},
+}
+
+
+def _sortear(gerador, distribuicao, n):
+    """Sorteia n valores de uma distribuição descrita por dicionário"""
+    tipo = distribuicao.get('tipo', 'fixo')
+    if tipo == 'fixo':
+        valores = np.full(n, float(distribuicao.get('valor', 0.0)))
+    elif tipo == 'uniforme':
+        valores = gerador.uniform(distribuicao['minimo'], distribuicao['maximo'], n)
+    elif tipo == 'triangular':
+        if distribuicao['minimo'] == distribuicao['maximo']:
+            valores = np.full(n, float(distribuicao['minimo']))
+        else:
+            valores = gerador.triangular(distribuicao['minimo'], distribuicao['moda'], distribuicao['maximo'], n)
+    elif tipo == 'normal':
+        valores = gerador.normal(distribuicao['media'], distribuicao['desvio'], n)
+    else:
+        raise ValueError(f"Distribuição desconhecida: {tipo}")
+
+    # Limites opcionais (ex.: aumento nunca negativo)
+    if distribuicao.get('minimo') is not None or distribuicao.get('maximo') is not None:
+        valores = np.clip(valores, distribuicao.get('minimo'), distribuicao.get('maximo'))
+    return valores
+
+
+def _resumo(valores):
+    percentis = np.percentile(valores, PERCENTIS)
+    resumo = {f'p{p}': float(v) for p, v in zip(PERCENTIS, percentis)}
+    resumo['media'] = float(valores.mean())
+    return resumo
+
+
+def simular_remuneracao(salario_clt, valor_pj, bonus_alvo=0.0, distribuicoes=None,
+                        cenarios=CENARIOS_PADRAO, semente=None, tabela=None):
+    """Simula o líquido anual CLT e PJ de uma oferta
+
+    `salario_clt` e `valor_pj` são os valores mensais da oferta; `bonus_alvo`
+    é o bônus anual com 100% de atingimento. `distribuicoes` substitui as
+    chaves de DISTRIBUICOES_PADRAO. Retorna as faixas de percentis do
+    líquido anual de cada modalidade e a probabilidade de o PJ render mais.
+    """
+    distribuicoes = dict(DISTRIBUICOES_PADRAO, **(distribuicoes or {}))
+    gerador = np.random.default_rng(semente)
+
+    aumento = _sortear(gerador, distribuicoes['aumento'], cenarios)
+    bonus = bonus_alvo * _sortear(gerador, distribuicoes['atingimento_bonus'], cenarios)
+    plr = _sortear(gerador, distribuicoes['plr'], cenarios)
+    variavel = bonus + plr
+
+    salarios = salario_clt * (1 + aumento)
+    valores_pj = valor_pj * (1 + aumento)
+
+    # CLT: pacote anual do salário + líquido adicional do mês em que o variável é pago
+    comparacao = motor.comparar_clt_pj_vetorizado(salarios, valores_pj + variavel / 12, tabela)
+    liquido_mes_variavel = motor.calcular_impostos_clt_vetorizado(salarios + variavel, tabela)['salario_liquido']
+    anual_clt = comparacao['CLT']['total_anual'] + liquido_mes_variavel - comparacao['CLT']['salario_liquido']
+    anual_pj = comparacao['PJ']['total_anual']
+
+    return {
+        'cenarios': cenarios,
+        'semente': semente,
+        'CLT': _resumo(anual_clt),
+        'PJ': _resumo(anual_pj),
+        'probabilidade_pj_melhor': float((anual_pj > anual_clt).mean()),
+        'versao_tabela': comparacao['CLT']['versao_tabela']
+    }
@@ -0,0 +1,181 @@
+"""Registro versionado das tabelas de INSS, IRRF e Simples Nacional.
+
+As tabelas ficam em arquivos `tabelas/<ano>.json` e são compiladas uma vez
+em limites de faixa + parcelas acumuladas, de modo que cada consulta é uma
+busca binária (O(log n)). Um novo ano pode ser adicionado ou corrigido com
+o servidor no ar: `recarregar_se_alterado()` relê os arquivos e troca o
+conjunto de tabelas de uma só vez, mantendo o anterior se algum for inválido.
+"""
+import bisect
+import os
+import threading
+
+DIRETORIO_TABELAS = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tabelas')
+
+# Permite fixar um ano em vez de usar sempre a tabela mais recente
+VARIAVEL_VERSAO = 'CALCULADORA_VERSAO_TABELAS'
+
+
+class TabelaInvalidaError(ValueError):
+    """Arquivo de tabela com formato ou valores inválidos"""
+
+
+def _limites(faixas, nome):
+    """Limites superiores das faixas; só a última pode ser aberta (limite null)"""
+    limites = [faixa['limite'] for faixa in faixas]
+    if any(limite is None for limite in limites[:-1]):
+        raise TabelaInvalidaError(f"{nome}: só a última faixa pode ter limite nulo")
+    limites = [float(limite) for limite in limites if limite is not None]
+    if limites != sorted(limites):
+        raise TabelaInvalidaError(f"{nome}: limites das faixas devem ser crescentes")
+    return tuple(limites)
+
+
+class TabelaImpostos:
+    """Tabela de um ano compilada em limites, alíquotas e parcelas acumuladas"""
+
+    def __init__(self, dados, assinatura=''):
+        try:
+            self.versao = str(dados['versao'])
+            faixas_inss = dados['inss']['faixas']
+            faixas_irrf = dados['irrf']['faixas']
+            faixas_simples = dados['simples']['faixas']
+
+            # INSS progressivo: parcela acumulada de cada faixa arredondada em centavos,
+            # como na tabela oficial; acima do último limite vale o teto
+            self.inss_limites = _limites(faixas_inss, 'inss')
+            aliquotas = [float(faixa['aliquota']) for faixa in faixas_inss]
+            inicios = (0.0,) + self.inss_limites[:-1]
+            acumulado = [0.0]
+            for inicio, limite, aliquota in zip(inicios, self.inss_limites, aliquotas):
+                acumulado.append(round(acumulado[-1] + round((limite - inicio) * aliquota, 2), 2))
+            self.inss_aliquotas = tuple(aliquotas) + (0.0,)
+            self.inss_inicio_faixa = inicios + (0.0,)
+            self.inss_acumulado = tuple(acumulado[:-1]) + (float(dados['inss']['teto']),)
+
+            # IRRF: alíquota e parcela a deduzir por faixa
+            self.irrf_limites = _limites(faixas_irrf, 'irrf')
+            self.irrf_aliquotas = tuple(float(faixa['aliquota']) for faixa in faixas_irrf)
+            self.irrf_deducoes = tuple(float(faixa.get('deducao', 0.0)) for faixa in faixas_irrf)
+
+            # Simples Nacional: alíquota por faixa de faturamento anual
+            self.simples_limites = _limites(faixas_simples, 'simples')
+            self.simples_aliquotas = tuple(float(faixa['aliquota']) for faixa in faixas_simples)
+        except (KeyError, TypeError) as e:
+            raise TabelaInvalidaError(f"Tabela mal formada: {e}") from e
+
+        for nome, limites, aliquotas in (
+            ('irrf', self.irrf_limites, self.irrf_aliquotas),
+            ('simples', self.simples_limites, self.simples_aliquotas),
+        ):
+            if len(aliquotas) != len(limites) + 1:
+                raise TabelaInvalidaError(f"{nome}: a última faixa deve ter limite nulo")
+
+        self.assinatura = assinatura
+        self._arrays = None
+
+    @property
+    def identificador(self):
+        """Versão + assinatura do conteúdo (muda se o arquivo do mesmo ano for corrigido)"""
+        return f"{self.versao}:{self.assinatura[:12]}" if self.assinatura else self.versao
+
+    def calcular_inss(self, salario_bruto):
+        faixa = bisect.bisect_left(self.inss_limites, salario_bruto)
+        return self.inss_acumulado[faixa] + (salario_bruto - self.inss_inicio_faixa[faixa]) * self.inss_aliquotas[faixa]
+
+    def calcular_irrf(self, base_irrf):
+        faixa = bisect.bisect_left(self.irrf_limites, base_irrf)
+        return max(0, base_irrf * self.irrf_aliquotas[faixa] - self.irrf_deducoes[faixa])
+
+    def aliquota_simples(self, faturamento_anual):
+        return self.simples_aliquotas[bisect.bisect_left(self.simples_limites, faturamento_anual)]
+
+    def arrays(self):
+        """Mesmas faixas como arrays numpy, para o motor vetorizado (criados uma vez)"""
+        if self._arrays is None:
+            import numpy as np
+            self._arrays = {
+                nome: np.array(getattr(self, nome))
+                for nome in (
+                    'inss_limites', 'inss_aliquotas', 'inss_inicio_faixa', 'inss_acumulado',
+                    'irrf_limites', 'irrf_aliquotas', 'irrf_deducoes',
+                    'simples_limites', 'simples_aliquotas'
+                )
+            }
+        return self._arrays
+
+
+class RegistroTabelas:
+    """Tabelas disponíveis por versão, com recarga atômica a partir do diretório"""
+
+    def __init__(self, diretorio=DIRETORIO_TABELAS):
+        self.diretorio = diretorio
+        self._estado = None  # (tabelas por versão, assinatura dos arquivos); trocado de uma vez
+        self._trava = threading.Lock()
+
+    def _assinatura_arquivos(self):
+        arquivos = sorted(
+            os.path.join(self.diretorio, nome) for nome in os.listdir(self.diretorio) if nome.endswith('.json')
+        )
+        return tuple((arquivo, os.path.getmtime(arquivo), os.path.getsize(arquivo)) for arquivo in arquivos)
+
+    def _compilar(self, assinatura_arquivos):
+        # json/hashlib só são necessários na primeira consulta, não no import do núcleo
+        import hashlib
+        import json
+
+        tabelas = {}
+        for arquivo, _, _ in assinatura_arquivos:
+            with open(arquivo, 'rb') as f:
+                conteudo = f.read()
+            try:
+                dados = json.loads(conteudo)
+            except ValueError as e:
+                raise TabelaInvalidaError(f"{os.path.basename(arquivo)}: JSON inválido ({e})") from e
+            tabela = TabelaImpostos(dados, hashlib.sha256(conteudo).hexdigest())
+            tabelas[tabela.versao] = tabela
+        if not tabelas:
+            raise TabelaInvalidaError(f"Nenhuma tabela encontrada em {self.diretorio}")
+        return tabelas
+
+    def recarregar(self):
+        """Relê e compila todos os arquivos; só troca as tabelas se todos forem válidos"""
+        with self._trava:
+            assinatura = self._assinatura_arquivos()
+            self._estado = (self._compilar(assinatura), assinatura)
+
+    def recarregar_se_alterado(self):
+        """Recarrega se algum arquivo mudou; retorna True se houve troca
+
+        Em caso de arquivo inválido a exceção é propagada e as tabelas atuais
+        continuam valendo.
+        """
+        if self._estado is not None and self._estado[1] == self._assinatura_arquivos():
+            return False
+        self.recarregar()
+        return True
+
+    def _tabelas(self):
+        if self._estado is None:
+            self.recarregar()
+        return self._estado[0]
+
+    def versoes(self):
+        return sorted(self._tabelas())
+
+    def obter(self, versao=None):
+        """Tabela da versão pedida; sem versão, a fixada no ambiente ou a mais recente"""
+        tabelas = self._tabelas()
+        versao = versao or os.environ.get(VARIAVEL_VERSAO) or max(tabelas)
+        try:
+            return tabelas[str(versao)]
+        except KeyError:
+            raise KeyError(f"Tabela de impostos '{versao}' não encontrada (disponíveis: {', '.join(sorted(tabelas))})")
+
+
+registro_tabelas = RegistroTabelas()
+
+
+def tabela_vigente():
+    """Tabela usada por padrão nos cálculos"""
+    return registro_tabelas.obter()
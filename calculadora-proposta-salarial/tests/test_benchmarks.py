@@ -0,0 +1,22 @@
+"""Comparação das medições com a baseline"""
+from benchmarks import comparar_com_baseline
+
+BASELINE = {'lote.faixa_1k': 1.0, 'graficos.render_dashboard': 1.0}
+
+
+def _regredidas(metricas, **kwargs):
+    return [nome for nome, *_ in comparar_com_baseline(metricas, BASELINE, **kwargs)]
+
+
+def test_metricas_ruidosas_toleram_mais_que_o_limite():
+    metricas = {'lote.faixa_1k': 1.25, 'graficos.render_dashboard': 1.25}
+    assert _regredidas(metricas) == ['lote.faixa_1k']
+
+
+def test_limite_vale_tambem_para_as_metricas_ruidosas():
+    assert _regredidas({'graficos.render_dashboard': 1.12}, limite=0.05) == ['graficos.render_dashboard']
+    assert _regredidas({'graficos.render_dashboard': 1.5}, limite=0.5) == []
+
+
+def test_metrica_sem_baseline_e_ignorada():
+    assert _regredidas({'nova.metrica': 10.0}) == []
@@ -0,0 +1,37 @@
+"""Cache LRU: cópias, valores congelados e dados do mapa de calor"""
+import numpy as np
+import pytest
+
+import graficos
+from cache_resultados import CacheLRU
+
+
+def test_sem_copia_compartilha_valor_somente_leitura():
+    cache = CacheLRU(tamanho_maximo=2, copiar=False)
+    calculado = cache.obter_ou_calcular('a', lambda: {'serie': np.arange(3.0), 'rotulos': ['x', 'y']})
+    lido = cache.obter('a')
+    assert lido is calculado
+    assert lido['rotulos'] == ('x', 'y')
+    with pytest.raises(TypeError):
+        lido['novo'] = 1
+    with pytest.raises(ValueError):
+        lido['serie'][0] = 10.0
+
+
+def test_com_copia_sessoes_nao_se_afetam():
+    cache = CacheLRU(tamanho_maximo=2)
+    cache.guardar('a', {'pontos': [1, 2]})
+    cache.obter('a')['pontos'].append(3)
+    assert cache.obter('a') == {'pontos': [1, 2]}
+
+
+def test_mapa_calor_guarda_matriz_e_monta_pontos():
+    grade = {
+        'valores_eixos': (np.array([1.0, 2.0]), np.array([10.0, 20.0, 30.0])),
+        'minimo': np.arange(6.0).reshape(2, 3)
+    }
+    dados = graficos.dados_mapa_calor(grade, 'minimo', 'X', 'Y', 'Mínimo')
+    assert dados['valores'] == ((0.0, 1.0, 2.0), (3.0, 4.0, 5.0))
+    pontos = graficos.especificacao_mapa_calor(dados)['data']['values']
+    assert len(pontos) == 6
+    assert pontos[4] == {'x': 2.0, 'y': 20.0, 'valor': 4.0}
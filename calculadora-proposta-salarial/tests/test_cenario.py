@@ -0,0 +1,38 @@
+"""Cenario/LoteCenarios: chaves canônicas e campos inteiros"""
+import numpy as np
+import pytest
+
+from cenario import Cenario, LoteCenarios
+
+
+def test_extras_numericos_equivalentes_geram_a_mesma_chave():
+    cenario = Cenario()
+    chave = cenario.chave('2024', 'sensibilidade', ['salario_oferecido', 5, {'media': 1}])
+    assert cenario.chave('2024', 'sensibilidade', ['salario_oferecido', 5.0, {'media': 1.0}]) == chave
+    assert cenario.chave('2024', 'sensibilidade', ('salario_oferecido', np.float64(5), {'media': np.int64(1)})) == chave
+    assert cenario.chave('2024', 'sensibilidade', ['salario_oferecido', 5.5, {'media': 1}]) != chave
+    assert cenario.chave('2024', 'sensibilidade', ['salario_oferecido', '5', {'media': 1}]) != chave
+
+
+def test_chaves_do_lote_iguais_as_do_cenario():
+    cenarios = [Cenario(), Cenario(salario_atual=9000.0, modalidade='PJ', prioridade_1='autonomia')]
+    lote = LoteCenarios.de_cenarios(cenarios)
+    assert lote.chaves('2024', [5]) == [c.chave('2024', [5.0]) for c in cenarios]
+
+
+def test_campos_inteiros_nao_sao_truncados():
+    assert Cenario.de_dicionarios({'dias_presencial_novo': 3.0}, {'autonomia': np.float64(8)}) == \
+        Cenario(dias_presencial_novo=3, valor_autonomia=8)
+    with pytest.raises(ValueError, match='dias_presencial_novo'):
+        Cenario.de_dicionarios({'dias_presencial_novo': 2.5}, {})
+    with pytest.raises(ValueError, match='valor_autonomia'):
+        LoteCenarios.de_colunas({'salario_atual': [5000.0, 6000.0]}, {'autonomia': [7, 7.9]})
+
+
+def test_lote_recusa_inteiros_fora_da_faixa_do_int8():
+    with pytest.raises(ValueError, match='ferias_atual'):
+        LoteCenarios.de_colunas({'salario_atual': [5000.0], 'ferias_atual': [200]}, {})
+    with pytest.raises(ValueError, match='dias_presencial_novo'):
+        LoteCenarios.de_colunas({'salario_atual': [5000.0], 'dias_presencial_novo': [300]}, {})
+    lote = LoteCenarios.de_colunas({'salario_atual': [5000.0], 'ferias_atual': [127]}, {})
+    assert lote[0].ferias_atual == 127
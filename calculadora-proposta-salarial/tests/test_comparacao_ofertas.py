@@ -0,0 +1,35 @@
+"""Ofertas editadas na tabela do app e ranking"""
+import pytest
+
+from comparacao_ofertas import OFERTA_PADRAO, avaliar_ofertas, linhas_editor, ofertas_de_linhas
+from nucleo_calculo import VALORES_PESSOAIS_PADRAO
+
+
+def test_linha_padrao_do_editor_volta_como_oferta():
+    # A linha inicial do editor tem todas as colunas preenchidas, inclusive o custo de vida
+    linhas = linhas_editor([dict(OFERTA_PADRAO, nome='Oferta 1', custo_vida_nova=0.1)])
+    assert linhas[0]['custo_vida_nova'] == pytest.approx(10.0)
+    ofertas = ofertas_de_linhas(linhas)
+    assert ofertas == [dict(OFERTA_PADRAO, nome='Oferta 1', custo_vida_nova=pytest.approx(0.1))]
+
+
+def test_celulas_em_branco_assumem_o_padrao():
+    ofertas = ofertas_de_linhas([
+        {'nome': 'A', 'modalidade': 'PJ', 'valor_proposto': 15000.0, 'dias_presencial_novo': None,
+         'custo_vida_nova': None, 'estabilidade': 4},
+        {'nome': 'B', 'custo_vida_nova': -20.0},
+    ])
+    assert ofertas[0]['dias_presencial_novo'] == OFERTA_PADRAO['dias_presencial_novo']
+    assert ofertas[0]['custo_vida_nova'] == 0.0
+    assert ofertas[0]['estabilidade'] == 4
+    assert ofertas[1]['modalidade'] == 'CLT' and ofertas[1]['custo_vida_nova'] == pytest.approx(-0.2)
+
+
+def test_linhas_do_editor_chegam_ao_ranking():
+    linhas = [
+        dict(OFERTA_PADRAO, nome='Baixa', valor_proposto=6000.0),
+        dict(OFERTA_PADRAO, nome='Alta', valor_proposto=14000.0, modalidade='PJ', custo_vida_nova=5.0),
+    ]
+    fatores = {'salario_atual': 8000.0, 'beneficios_atual': 1000.0, 'bonus_atual': 0.0, 'modalidade': 'CLT'}
+    ranking = avaliar_ofertas(fatores, dict(VALORES_PESSOAIS_PADRAO), ofertas_de_linhas(linhas))
+    assert [resultado['nome'] for resultado in ranking] == ['Alta', 'Baixa']
@@ -0,0 +1,60 @@
+"""Spans de tempo: instalação, remoção e exportação"""
+import types
+
+from instrumentacao import Instrumentacao
+
+
+def _nova_classe():
+    # Como a classe que o Streamlit recria a cada rerun do script
+    class Calculadora:
+        def calcular_valor(self, x):
+            return x * 2
+    return Calculadora
+
+
+def test_reruns_nao_acumulam_originais():
+    instrumentacao = Instrumentacao()
+    instrumentacao.ativar()
+    modulo = types.ModuleType('graficos_falso')
+    modulo.obter_png = lambda: b''
+    for _ in range(50):
+        classe = _nova_classe()
+        instrumentacao.instrumentar(classe, ['calcular_valor'], 'Calculadora')
+        instrumentacao.instrumentar(modulo, ['obter_png'], 'graficos')
+        assert classe().calcular_valor(2) == 4
+    assert len(instrumentacao._originais) == 2
+    assert instrumentacao.histogramas['Calculadora.calcular_valor'].total == 50
+
+
+def test_desativar_devolve_os_originais():
+    instrumentacao = Instrumentacao()
+    classe = _nova_classe()
+    original = classe.calcular_valor
+    instrumentacao.instrumentar(classe, ['calcular_valor'], 'Calculadora')
+    assert classe.calcular_valor is original  # Inativa: nada é trocado
+
+    instrumentacao.ativar()
+    instrumentacao.instrumentar(classe, ['calcular_valor'], 'Calculadora')
+    assert hasattr(classe.calcular_valor, '__span__')
+    classe().calcular_valor(1)
+    instrumentacao.desativar()
+    assert classe.calcular_valor is original
+    assert 'calculadora_duracao_segundos_count{metodo="Calculadora.calcular_valor"} 1' in instrumentacao.texto_prometheus()
+
+
+def test_interruptor_liga_e_desliga_sem_reiniciar(tmp_path, monkeypatch):
+    interruptor = tmp_path / 'metricas.ligadas'
+    monkeypatch.delenv('CALCULADORA_METRICAS', raising=False)
+    monkeypatch.setenv('CALCULADORA_METRICAS_INTERRUPTOR', str(interruptor))
+    instrumentacao = Instrumentacao()
+    classe = _nova_classe()
+    original = classe.calcular_valor
+
+    assert not instrumentacao.sincronizar()
+    interruptor.touch()
+    assert instrumentacao.sincronizar()
+    instrumentacao.instrumentar(classe, ['calcular_valor'], 'Calculadora')
+    assert hasattr(classe.calcular_valor, '__span__')
+    interruptor.unlink()
+    assert not instrumentacao.sincronizar()
+    assert classe.calcular_valor is original
@@ -0,0 +1,66 @@
+"""Ida e volta das inversões líquido → bruto e do equilíbrio CLT ↔ PJ"""
+import numpy as np
+import pytest
+
+import inversao_impostos as inversao
+import motor_vetorizado as motor
+import nucleo_calculo as nucleo
+from tabelas_impostos import registro_tabelas
+
+# Os saltos de arredondamento das tabelas são de centavos
+TOLERANCIA_REAIS = 0.02
+
+
+@pytest.fixture(scope='module')
+def tabela():
+    return registro_tabelas.obter()
+
+
+@pytest.fixture(scope='module')
+def liquidos():
+    return np.concatenate([np.random.default_rng(3).uniform(1500, 50_000, 300), [1500.0, 2500.0, 5000.0, 10_000.0]])
+
+
+def test_bruto_clt_devolve_o_liquido_desejado(tabela, liquidos):
+    for liquido in liquidos:
+        bruto = inversao.calcular_bruto_para_liquido_clt(liquido, tabela)
+        assert nucleo.calcular_impostos_clt(bruto, tabela)['salario_liquido'] == pytest.approx(liquido, abs=TOLERANCIA_REAIS)
+
+
+def test_valor_pj_devolve_o_liquido_desejado(tabela, liquidos):
+    for liquido in liquidos:
+        valor = inversao.calcular_valor_pj_para_liquido(liquido, tabela)
+        assert nucleo.calcular_impostos_pj(valor, tabela)['renda_liquida'] == pytest.approx(liquido, abs=TOLERANCIA_REAIS)
+
+
+def test_equivalencia_clt_pj_ida_e_volta(tabela):
+    for salario in np.linspace(2000, 40_000, 77):
+        valor_pj = inversao.calcular_equivalencia_pj_clt(salario, tabela)
+        comparacao = nucleo.comparar_clt_pj(salario, valor_pj, tabela)
+        assert comparacao['PJ']['total_anual'] == pytest.approx(comparacao['CLT']['total_anual'], abs=12 * TOLERANCIA_REAIS)
+        assert inversao.calcular_equivalencia_clt_pj(valor_pj, tabela) == pytest.approx(salario, abs=TOLERANCIA_REAIS)
+
+
+def test_inversao_vetorizada_igual_a_escalar(tabela, liquidos):
+    np.testing.assert_allclose(
+        motor.calcular_bruto_para_liquido_clt_vetorizado(liquidos, tabela),
+        [inversao.calcular_bruto_para_liquido_clt(liquido, tabela) for liquido in liquidos], atol=1e-6
+    )
+    np.testing.assert_allclose(
+        motor.calcular_valor_pj_para_liquido_vetorizado(liquidos, tabela),
+        [inversao.calcular_valor_pj_para_liquido(liquido, tabela) for liquido in liquidos], atol=1e-6
+    )
+    np.testing.assert_allclose(
+        motor.calcular_equivalencia_pj_clt_vetorizado(liquidos, tabela),
+        [inversao.calcular_equivalencia_pj_clt(liquido, tabela) for liquido in liquidos], atol=1e-6
+    )
+
+
+def test_fator_de_equilibrio_maior_nos_salarios_baixos():
+    tabela = registro_tabelas.obter('2024')
+    fator = {salario: inversao.calcular_equivalencia_pj_clt(salario, tabela) / salario
+             for salario in (1000.0, 2000.0, 10_000.0, 40_000.0)}
+    assert fator[1000.0] == pytest.approx(1.60, abs=0.01)
+    assert fator[2000.0] == pytest.approx(1.43, abs=0.01)
+    assert min(inversao.curva_equivalencia(tabela)['fator'][1:]) == pytest.approx(1.14, abs=0.01)
+    assert fator[1000.0] > fator[2000.0] > fator[10_000.0] < fator[40_000.0]
@@ -0,0 +1,94 @@
+"""Paridade entre o motor vetorizado e o cálculo escalar de nucleo_calculo"""
+import numpy as np
+import pytest
+
+import motor_vetorizado as motor
+import nucleo_calculo as nucleo
+from tabelas_impostos import registro_tabelas
+
+TOLERANCIA = 1e-6
+
+
+@pytest.fixture(scope='module')
+def tabela():
+    return registro_tabelas.obter()
+
+
+@pytest.fixture(scope='module')
+def salarios(tabela):
+    gerador = np.random.default_rng(42)
+    aleatorios = gerador.uniform(0, 60_000, 20_000)
+    # Os limites das faixas e seus vizinhos são onde um erro de bisect/searchsorted apareceria
+    limites = np.array([limite for limite in tabela.inss_limites + tabela.irrf_limites if np.isfinite(limite)])
+    bordas = np.concatenate([limites, limites - 0.01, limites + 0.01, [0.0, 0.01]])
+    return np.concatenate([aleatorios, bordas])
+
+
+def _fatores_aleatorios(gerador, n):
+    fatores = {
+        'salario_atual': gerador.uniform(1500, 40_000, n),
+        'beneficios_atual': gerador.uniform(0, 3000, n),
+        'bonus_atual': gerador.uniform(0, 50_000, n),
+        'tempo_viagem_atual': gerador.uniform(0, 4, n).round(1),
+        'tempo_viagem_novo': gerador.uniform(0, 4, n).round(1),
+        'dias_presencial_novo': gerador.integers(0, 6, n).astype(float),
+        'custo_vida_nova': gerador.uniform(-0.2, 0.5, n),
+        'modalidade': gerador.choice(['CLT', 'PJ'], n).astype(object),
+    }
+    for chave in ('crescimento_carreira', 'estabilidade', 'beneficios_qualidade',
+                  'cultura_empresa_nova', 'inovacao_tecnologia_nova'):
+        fatores[chave] = gerador.integers(1, 11, n).astype(float)
+    valores_pessoais = {chave: gerador.integers(1, 11, n).astype(float) for chave in nucleo.VALORES_PESSOAIS_PADRAO}
+    opcoes = np.array(['', 'Estabilidade Financeira', 'Crescimento na Carreira', 'Flexibilidade de Tempo'], dtype=object)
+    for i in (1, 2, 3):
+        valores_pessoais[f'prioridade_{i}'] = gerador.choice(opcoes, n)
+    return fatores, valores_pessoais
+
+
+def _linha(colunas, i):
+    return {chave: (valores[i] if valores.dtype == object else float(valores[i])) for chave, valores in colunas.items()}
+
+
+def test_impostos_clt_iguais_ao_escalar(salarios, tabela):
+    vetorizado = motor.calcular_impostos_clt_vetorizado(salarios, tabela)
+    for chave in ('inss', 'irrf', 'salario_liquido', 'aliquota_efetiva'):
+        escalar = np.array([nucleo.calcular_impostos_clt(s, tabela)[chave] for s in salarios])
+        np.testing.assert_allclose(vetorizado[chave], escalar, atol=TOLERANCIA, err_msg=chave)
+
+
+def test_impostos_pj_iguais_ao_escalar(salarios, tabela):
+    vetorizado = motor.calcular_impostos_pj_vetorizado(salarios, tabela)
+    for chave in ('imposto_simples', 'total_impostos', 'renda_liquida'):
+        escalar = np.array([nucleo.calcular_impostos_pj(s, tabela)[chave] for s in salarios])
+        np.testing.assert_allclose(vetorizado[chave], escalar, atol=TOLERANCIA, err_msg=chave)
+
+
+def test_comparacao_clt_pj_igual_ao_escalar(salarios, tabela):
+    valores_pj = salarios[::-1]
+    vetorizado = motor.comparar_clt_pj_vetorizado(salarios, valores_pj, tabela)
+    for i in range(0, len(salarios), 97):
+        escalar = nucleo.comparar_clt_pj(float(salarios[i]), float(valores_pj[i]), tabela)
+        for modalidade in ('CLT', 'PJ'):
+            assert vetorizado[modalidade]['total_anual'][i] == pytest.approx(escalar[modalidade]['total_anual'], abs=TOLERANCIA)
+
+
+def test_faixa_e_compatibilidade_iguais_ao_escalar():
+    fatores, valores_pessoais = _fatores_aleatorios(np.random.default_rng(7), 2000)
+    compatibilidade = motor.calcular_compatibilidade_valores_vetorizado(fatores, valores_pessoais)
+    faixa = motor.calcular_faixa_recomendada_vetorizado(fatores, valores_pessoais, compatibilidade)
+    for i in range(2000):
+        fatores_linha, valores_linha = _linha(fatores, i), _linha(valores_pessoais, i)
+        escalar = nucleo.calcular_faixa_recomendada(fatores_linha, valores_linha)
+        assert compatibilidade['compatibilidade_geral'][i] == pytest.approx(
+            nucleo.calcular_compatibilidade_valores(fatores_linha, valores_linha)['compatibilidade_geral'])
+        for chave in ('minimo', 'ideal', 'maximo_negociacao'):
+            assert faixa[chave][i] == pytest.approx(escalar[chave]), chave
+
+
+def test_colunas_ausentes_usam_os_padroes_do_escalar():
+    fatores = {'salario_atual': np.array([5000.0, 12000.0])}
+    valores_pessoais = {chave: np.full(2, float(valor)) for chave, valor in nucleo.VALORES_PESSOAIS_PADRAO.items()}
+    faixa = motor.calcular_faixa_recomendada_vetorizado(fatores, valores_pessoais)
+    for i, salario in enumerate((5000.0, 12000.0)):
+        escalar = nucleo.calcular_faixa_recomendada({'salario_atual': salario}, dict(nucleo.VALORES_PESSOAIS_PADRAO))
+        assert faixa['ideal'][i] == pytest.approx(escalar['ideal'])
@@ -0,0 +1,117 @@
+"""Processamento em lote: saída serial e com vários processos"""
+import numpy as np
+import pandas as pd
+import pytest
+
+import processamento_lote as lote
+
+
+@pytest.fixture
+def candidatos(tmp_path):
+    gerador = np.random.default_rng(11)
+    n = 3000
+    dados = pd.DataFrame({
+        'candidato_id': [f'c{i}' for i in range(n)],
+        'salario_atual': gerador.uniform(2000, 30_000, n).round(2),
+        'beneficios_atual': gerador.uniform(0, 2000, n).round(2),
+        'bonus_atual': gerador.uniform(0, 20_000, n).round(2),
+        'tempo_viagem_atual': gerador.uniform(0, 3, n).round(1),
+        'tempo_viagem_novo': gerador.uniform(0, 3, n).round(1),
+        'dias_presencial_novo': gerador.integers(0, 6, n),
+        'custo_vida_nova': gerador.uniform(-0.1, 0.3, n).round(3),
+        'crescimento_carreira': gerador.integers(1, 11, n),
+        'estabilidade': gerador.integers(1, 11, n),
+        'beneficios_qualidade': gerador.integers(1, 11, n),
+        'cultura_empresa_nova': gerador.integers(1, 11, n),
+        'inovacao_tecnologia_nova': gerador.integers(1, 11, n),
+        'modalidade': gerador.choice(['CLT', 'PJ'], n),
+        'valor_flexibilidade_tempo': gerador.integers(1, 11, n),
+        'prioridade_1': gerador.choice(['Estabilidade Financeira', 'Crescimento na Carreira', ''], n),
+    })
+    # Algumas linhas inválidas para o relatório de erros
+    dados.loc[[5, 1500], 'salario_atual'] = -1
+    dados.loc[2999, 'modalidade'] = 'CNPJ'
+    caminho = tmp_path / 'candidatos.csv'
+    dados.to_csv(caminho, index=False)
+    return caminho
+
+
+def _processar(candidatos, tmp_path, processos):
+    saida = tmp_path / f'resultados_{processos}.csv'
+    erros = tmp_path / f'erros_{processos}.csv'
+    resumo = lote.processar_arquivo(str(candidatos), str(saida), str(erros), tamanho_bloco=700, processos=processos)
+    return resumo, pd.read_csv(saida), pd.read_csv(erros)
+
+
+def test_saida_paralela_igual_a_serial(candidatos, tmp_path):
+    resumo_serial, serial, erros_serial = _processar(candidatos, tmp_path, 1)
+    resumo_paralelo, paralelo, erros_paralelo = _processar(candidatos, tmp_path, 2)
+
+    assert resumo_serial == resumo_paralelo
+    assert resumo_serial['processadas'] == 2997 and resumo_serial['rejeitadas'] == 3
+    pd.testing.assert_frame_equal(serial, paralelo)
+    pd.testing.assert_frame_equal(erros_serial, erros_paralelo)
+
+
+def test_erros_e_resultados_informam_a_linha_do_arquivo(candidatos, tmp_path):
+    _, resultados, erros = _processar(candidatos, tmp_path, 1)
+    # Cabeçalho na linha 1: o candidato de índice 5 está na linha 7
+    assert erros['linha'].tolist() == [7, 1502, 3001]
+    assert resultados['linha'].iloc[0] == 2
+    assert resultados.loc[resultados['candidato_id'] == 'c10', 'linha'].item() == 12
+
+
+def test_coluna_obrigatoria_ausente_interrompe_o_job(candidatos, tmp_path):
+    sem_bonus = tmp_path / 'sem_bonus.csv'
+    pd.read_csv(candidatos).drop(columns=['bonus_atual', 'estabilidade']).to_csv(sem_bonus, index=False)
+    with pytest.raises(lote.ColunasAusentesError, match='bonus_atual, estabilidade'):
+        lote.processar_arquivo(str(sem_bonus), str(tmp_path / 'saida.csv'))
+    assert lote.main([str(sem_bonus), str(tmp_path / 'saida.csv')]) == 1
+
+
+def _colunas(n=50):
+    from nucleo_calculo import VALORES_PESSOAIS_PADRAO
+
+    fatores = {'salario_atual': np.linspace(1000, 30_000, n), 'modalidade': np.array(['CLT', 'PJ'] * (n // 2), dtype=object)}
+    valores_pessoais = {chave: np.full(n, float(valor)) for chave, valor in VALORES_PESSOAIS_PADRAO.items()}
+    valores_pessoais['prioridade_1'] = np.full(n, '', dtype=object)
+    return fatores, valores_pessoais
+
+
+def test_excecao_do_worker_chega_a_quem_chamou():
+    from types import SimpleNamespace
+    from lote_paralelo import AvaliadorParalelo
+
+    avaliador = AvaliadorParalelo(2)
+    try:
+        # Tabela sem as faixas: o worker falha com as views da memória compartilhada abertas
+        with pytest.raises(AttributeError):
+            avaliador.avaliar_colunas(*_colunas(), SimpleNamespace(versao='1900'))
+    finally:
+        avaliador.fechar()
+
+
+def test_workers_usam_a_tabela_de_quem_chamou():
+    import json
+    import os
+    from lote_paralelo import AvaliadorParalelo
+    from tabelas_impostos import DIRETORIO_TABELAS, TabelaImpostos, registro_tabelas
+
+    # Mesma versão do arquivo em disco, conteúdo diferente (ex.: tabela recarregada ou passada pelo chamador)
+    with open(os.path.join(DIRETORIO_TABELAS, '2024.json'), encoding='utf-8') as arquivo:
+        dados = json.load(arquivo)
+    for faixa in dados['irrf']['faixas']:
+        faixa['aliquota'] = min(float(faixa['aliquota']) * 2, 0.9)
+    tabela = TabelaImpostos(dados, assinatura='alterada')
+
+    fatores, valores_pessoais = _colunas()
+    serial = lote.avaliar_colunas(fatores, valores_pessoais, tabela)
+    avaliador = AvaliadorParalelo(2)
+    try:
+        paralelo = avaliador.avaliar_colunas(fatores, valores_pessoais, tabela)
+    finally:
+        avaliador.fechar()
+    for coluna in lote.COLUNAS_RESULTADO:
+        np.testing.assert_array_equal(paralelo[coluna], serial[coluna])
+    em_disco = lote.avaliar_colunas(fatores, valores_pessoais, registro_tabelas.obter('2024'))
+    assert not np.array_equal(paralelo['liquido_clt'], em_disco['liquido_clt'])
@@ -0,0 +1,45 @@
+"""Relatórios em massa no ZIP"""
+import csv
+import io
+import zipfile
+
+import pandas as pd
+import pytest
+
+import relatorios
+
+
+@pytest.fixture
+def candidatos(tmp_path):
+    linha = {
+        'salario_atual': 6000, 'beneficios_atual': 800, 'bonus_atual': 6000, 'tempo_viagem_atual': 1.5,
+        'tempo_viagem_novo': 0.5, 'dias_presencial_novo': 2, 'custo_vida_nova': 0.05, 'crescimento_carreira': 8,
+        'estabilidade': 7, 'beneficios_qualidade': 6, 'cultura_empresa_nova': 7, 'inovacao_tecnologia_nova': 8,
+        'modalidade': 'CLT'
+    }
+    dados = pd.DataFrame([dict(linha, candidato_id=identificador) for identificador in ('a', 'b', 'a', 'c', 'd')])
+    dados.loc[3, 'salario_atual'] = -5
+    dados.loc[4, 'modalidade'] = 'XYZ'
+    caminho = tmp_path / 'candidatos.csv'
+    dados.to_csv(caminho, index=False)
+    return caminho
+
+
+def test_zip_com_ids_repetidos_e_erros(candidatos, tmp_path):
+    destino = tmp_path / 'relatorios.zip'
+    resumo = relatorios.gerar_relatorios_zip(str(candidatos), str(destino), tamanho_bloco=2)
+    assert resumo['relatorios'] == 3 and resumo['rejeitadas'] == 2
+
+    with zipfile.ZipFile(destino) as arquivo_zip:
+        assert arquivo_zip.namelist() == [
+            'relatorio_a_linha2.txt', 'relatorio_b_linha3.txt', 'relatorio_a_linha4.txt', 'erros.csv'
+        ]
+        erros = list(csv.reader(io.StringIO(arquivo_zip.read('erros.csv').decode('utf-8'))))
+        texto = arquivo_zip.read('relatorio_a_linha2.txt').decode('utf-8')
+    assert erros == [['linha', 'motivo'], ['5', 'salario_atual inválido'], ['6', 'modalidade inválida']]
+    assert 'RELATÓRIO DE PROPOSTA SALARIAL' in texto and '- Modalidade: CLT' in texto
+
+
+def test_relatorio_termina_como_o_texto_original_do_app():
+    # O f-string original do app terminava com a indentação antes das aspas de fechamento
+    assert relatorios.MODELO_RELATORIO.endswith('\n            ')
@@ -0,0 +1,69 @@
+"""Validação dos corpos e respostas do serviço HTTP (sem abrir porta)"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import servico_http as servico
+
+
+def _responder(caminho, corpo):
+    async def executar():
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            calcular, chave_grupo = servico.ENDPOINTS[caminho]
+            return await servico.Loteador(calcular, chave_grupo, executor).avaliar(corpo)
+    return asyncio.run(executar())
+
+
+@pytest.mark.parametrize('corpo', [
+    {},
+    {'fatores': {}},
+    {'fatores': {'modalidade': 'PJ'}},
+    {'fatores': {'salario_atual': 'cinco mil'}},
+    {'fatores': {'salario_atual': True}},
+    {'fatores': {'salario_atual': 5000}, 'valores_pessoais': {'autonomia': 'alta'}},
+    {'fatores': {'salario_atual': 5000}, 'valores_pessoais': [1, 2]},
+])
+@pytest.mark.parametrize('caminho', ['/faixa', '/compatibilidade'])
+def test_perfil_invalido_responde_400(caminho, corpo):
+    status, resposta = _responder(caminho, corpo)
+    assert status == 400, resposta
+    assert resposta['erro'].startswith('requisição inválida')
+
+
+def test_faixa_valida():
+    status, resposta = _responder('/faixa', {'fatores': {'salario_atual': 5000, 'modalidade': 'CLT'},
+                                             'valores_pessoais': {'prioridade_1': 'Estabilidade Financeira'}})
+    assert status == 200
+    assert resposta['minimo'] <= resposta['ideal'] < resposta['maximo_negociacao']
+
+
+class _Escritor:
+    def __init__(self):
+        self.dados = b''
+        self.fechado = False
+
+    def write(self, dados):
+        self.dados += dados
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        self.fechado = True
+
+
+@pytest.mark.parametrize('tamanho', ['abc', '-5', ' 5x', '١٠'])
+def test_content_length_invalido_responde_400_e_fecha(tamanho):
+    async def executar():
+        leitor = asyncio.StreamReader()
+        leitor.feed_data(f'POST /faixa HTTP/1.1\r\nContent-Length: {tamanho}\r\n\r\n{{}}'.encode('utf-8'))
+        leitor.feed_eof()
+        escritor = _Escritor()
+        await servico.ServicoCalculadora().atender(leitor, escritor)
+        return escritor
+
+    escritor = asyncio.run(executar())
+    assert escritor.dados.startswith(b'HTTP/1.1 400 ')
+    assert b'Connection: close' in escritor.dados
+    assert escritor.fechado